@@ -17,6 +17,9 @@ from sensor_app.adapters.secondary.persistence_sql.models.base import Base
 # TODO is this necessary?
 # Import your models here
 from sensor_app.adapters.secondary.persistence_sql.models.sensor import Sensor
+from sensor_app.adapters.secondary.persistence_sql.models.sensor_reading import (
+    SensorReading,
+)
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
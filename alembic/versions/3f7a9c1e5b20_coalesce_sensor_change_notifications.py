@@ -0,0 +1,88 @@
+"""Coalesce sensor change notifications
+
+Revision ID: 3f7a9c1e5b20
+Revises: 8c4f0b6d2e17
+Create Date: 2026-10-18 21:42:08.331760
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f7a9c1e5b20'
+down_revision: Union[str, None] = '8c4f0b6d2e17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Sensor ids per notification, integer ids keep the payload well under 8000 bytes
+NOTIFIED_IDS_PER_PAYLOAD = 500
+
+
+def upgrade() -> None:
+    # One trigger run per statement instead of per row, so create_sensors and COPY
+    # imports publish a notification per NOTIFIED_IDS_PER_PAYLOAD rows instead of
+    # one per row. A statement changing a single row still publishes the
+    # SensorChange document, the others publish the operation and the changed ids,
+    # listeners read the sensors back. Postgres only allows transition tables on
+    # single event triggers, hence one trigger per operation sharing the function.
+    op.execute("DROP TRIGGER sensors_notify_change ON sensors")
+    op.execute(f"""
+    CREATE FUNCTION notify_sensor_changes() RETURNS trigger AS $$
+    DECLARE
+        payload text;
+    BEGIN
+        IF TG_OP <> 'DELETE' AND (SELECT count(*) FROM changed_rows) = 1 THEN
+            SELECT json_build_object(
+                'operation', lower(TG_OP),
+                'sensor_id', id,
+                'sensor', json_build_object(
+                    'id', id, 'name', name, 'value', value,
+                    'version', version, 'updated_at', updated_at
+                )
+            )::text INTO payload FROM changed_rows;
+            IF octet_length(payload) < 8000 THEN
+                PERFORM pg_notify('sensor_changes', payload);
+                RETURN NULL;
+            END IF;
+        END IF;
+        FOR payload IN
+            SELECT json_build_object('operation', lower(TG_OP), 'sensor_ids', json_agg(id ORDER BY id))::text
+            FROM (
+                SELECT id, (row_number() OVER (ORDER BY id) - 1) / {NOTIFIED_IDS_PER_PAYLOAD} AS part
+                FROM changed_rows
+            ) AS numbered_rows
+            GROUP BY part
+            ORDER BY part
+        LOOP
+            PERFORM pg_notify('sensor_changes', payload);
+        END LOOP;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """)
+    for operation, transition_table in (
+        ("INSERT", "NEW"),
+        ("UPDATE", "NEW"),
+        ("DELETE", "OLD"),
+    ):
+        op.execute(f"""
+        CREATE TRIGGER sensors_notify_{operation.lower()}
+        AFTER {operation} ON sensors
+        REFERENCING {transition_table} TABLE AS changed_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_sensor_changes()
+        """)
+
+
+def downgrade() -> None:
+    for operation in ("insert", "update", "delete"):
+        op.execute(f"DROP TRIGGER sensors_notify_{operation} ON sensors")
+    op.execute("DROP FUNCTION notify_sensor_changes()")
+    # notify_sensor_change() is left in place by the upgrade
+    op.execute("""
+    CREATE TRIGGER sensors_notify_change
+    AFTER INSERT OR UPDATE OR DELETE ON sensors
+    FOR EACH ROW EXECUTE FUNCTION notify_sensor_change()
+    """)
@@ -0,0 +1,57 @@
+"""Notify sensor changes
+
+Revision ID: 5d1e7c2b9a43
+Revises: 9b838e856567
+Create Date: 2026-10-18 16:20:37.512904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d1e7c2b9a43'
+down_revision: Union[str, None] = '9b838e856567'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Every committed row change is published on the sensor_changes channel as a
+    # SensorChange JSON document. NOTIFY payloads are capped at 8000 bytes, rows
+    # too large for that (long names) are sent without the sensor, listeners read
+    # it back, so a write never fails because of its notification.
+    op.execute("""
+    CREATE FUNCTION notify_sensor_change() RETURNS trigger AS $$
+    DECLARE
+        payload text;
+    BEGIN
+        IF TG_OP = 'DELETE' THEN
+            payload := json_build_object('operation', 'delete', 'sensor_id', OLD.id)::text;
+        ELSE
+            payload := json_build_object(
+                'operation', lower(TG_OP),
+                'sensor_id', NEW.id,
+                'sensor', json_build_object('id', NEW.id, 'name', NEW.name, 'value', NEW.value)
+            )::text;
+            IF octet_length(payload) >= 8000 THEN
+                payload := json_build_object('operation', lower(TG_OP), 'sensor_id', NEW.id)::text;
+            END IF;
+        END IF;
+        PERFORM pg_notify('sensor_changes', payload);
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+    CREATE TRIGGER sensors_notify_change
+    AFTER INSERT OR UPDATE OR DELETE ON sensors
+    FOR EACH ROW EXECUTE FUNCTION notify_sensor_change()
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER sensors_notify_change ON sensors")
+    op.execute("DROP FUNCTION notify_sensor_change()")
@@ -0,0 +1,58 @@
+"""Add sensor version and updated_at
+
+Revision ID: 8c4f0b6d2e17
+Revises: 5d1e7c2b9a43
+Create Date: 2026-10-18 17:05:12.904361
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c4f0b6d2e17'
+down_revision: Union[str, None] = '5d1e7c2b9a43'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same as 5d1e7c2b9a43 with the sensor's version and updated_at in the payload
+NOTIFY_SENSOR_CHANGE = """
+CREATE OR REPLACE FUNCTION notify_sensor_change() RETURNS trigger AS $$
+DECLARE
+    payload text;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        payload := json_build_object('operation', 'delete', 'sensor_id', OLD.id)::text;
+    ELSE
+        payload := json_build_object(
+            'operation', lower(TG_OP),
+            'sensor_id', NEW.id,
+            'sensor', json_build_object(
+                'id', NEW.id, 'name', NEW.name, 'value', NEW.value %s
+            )
+        )::text;
+        IF octet_length(payload) >= 8000 THEN
+            payload := json_build_object('operation', lower(TG_OP), 'sensor_id', NEW.id)::text;
+        END IF;
+    END IF;
+    PERFORM pg_notify('sensor_changes', payload);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    # Existing rows start at version 1, last modified now. Constant defaults, so
+    # Postgres adds the columns without rewriting the table.
+    op.add_column('sensors', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('sensors', sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False))
+    op.execute(NOTIFY_SENSOR_CHANGE % ", 'version', NEW.version, 'updated_at', NEW.updated_at")
+
+
+def downgrade() -> None:
+    op.execute(NOTIFY_SENSOR_CHANGE % "")
+    op.drop_column('sensors', 'updated_at')
+    op.drop_column('sensors', 'version')
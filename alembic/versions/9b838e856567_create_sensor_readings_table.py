@@ -0,0 +1,38 @@
+"""Create SensorReading table
+
+Revision ID: 9b838e856567
+Revises: 0e34ec37f6f5
+Create Date: 2026-10-18 14:02:11.418203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b838e856567'
+down_revision: Union[str, None] = '0e34ec37f6f5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Append only, no primary key so inserts only maintain the two indexes below
+    op.create_table('sensor_readings',
+    sa.Column('sensor_id', sa.Integer(), nullable=False),
+    sa.Column('recorded_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('value', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['sensor_id'], ['sensors.id'], ondelete='CASCADE'),
+    )
+    # Readings arrive roughly in time order, a BRIN index stays tiny and cheap to
+    # maintain while still pruning time range scans
+    op.create_index('ix_sensor_readings_recorded_at_brin', 'sensor_readings', ['recorded_at'], postgresql_using='brin')
+    op.create_index('ix_sensor_readings_sensor_id_recorded_at', 'sensor_readings', ['sensor_id', 'recorded_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_sensor_readings_sensor_id_recorded_at', table_name='sensor_readings')
+    op.drop_index('ix_sensor_readings_recorded_at_brin', table_name='sensor_readings')
+    op.drop_table('sensor_readings')
@@ -0,0 +1,136 @@
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import subprocess
+from datetime import datetime, timezone
+from typing import Any, Dict
+from sensor_app.core.ports.secondary import SensorRepository
+from benchmarks.http_endpoints import run_http_benchmarks
+from benchmarks.repository import run_repository_benchmarks
+from benchmarks.tasks import run_task_benchmarks
+
+ADAPTERS = ("memory", "asyncpg", "mongodb")
+
+
+def create_sensor_repo(args: argparse.Namespace) -> SensorRepository:
+    if args.adapter == "asyncpg":
+        from sensor_app.adapters.secondary.persistence_sql import (
+            AsyncpgSensorRepository,
+        )
+
+        return AsyncpgSensorRepository(
+            args.database_url,
+            use_pool=True,
+            prepare_statements=not args.no_prepare,
+            fast_mode=args.fast_mode,
+        )
+    if args.adapter == "mongodb":
+        from sensor_app.adapters.secondary.persistence_mongodb.sensor_repo import (
+            MongoDBSensorRepository,
+        )
+
+        return MongoDBSensorRepository(args.database_url)
+
+    from sensor_app.adapters.secondary.persistence_memory import (
+        InMemorySensorRepository,
+    )
+
+    return InMemorySensorRepository()
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], text=True
+        ).strip()
+    except Exception:
+        return "unknown"
+
+
+async def run_async_benchmarks(
+    args: argparse.Namespace, sensor_repo: SensorRepository
+) -> Dict[str, Any]:
+    await sensor_repo.connect()
+    try:
+        results = {}
+        results["repository"] = await run_repository_benchmarks(
+            sensor_repo, iterations=args.iterations, bulk_size=args.bulk_size
+        )
+        results["http"] = await run_http_benchmarks(
+            sensor_repo, iterations=args.iterations
+        )
+        return results
+    finally:
+        await sensor_repo.disconnect()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmark the sensor repositories, use cases and endpoints.",
+    )
+    parser.add_argument("--adapter", choices=ADAPTERS, default="memory")
+    parser.add_argument(
+        "--database-url",
+        help="Connection string for the asyncpg or mongodb adapter. Benchmarks write "
+        "rows, point it at a disposable database.",
+    )
+    parser.add_argument(
+        "--no-prepare",
+        action="store_true",
+        help="asyncpg: don't prepare statements when pooled connections open.",
+    )
+    parser.add_argument(
+        "--fast-mode",
+        action="store_true",
+        help="asyncpg: map rows to sensors without validation.",
+    )
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--bulk-size", type=int, default=1000)
+    parser.add_argument("--output", default="benchmark_results.json")
+    args = parser.parse_args()
+
+    if args.adapter != "memory" and not args.database_url:
+        parser.error(f"--database-url is required for the {args.adapter} adapter")
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    sensor_repo = create_sensor_repo(args)
+    results = asyncio.run(run_async_benchmarks(args, sensor_repo))
+    # The Celery benchmark owns its own event loop (the worker AsyncRuntime)
+    results["tasks"] = run_task_benchmarks(
+        create_sensor_repo(args),
+        iterations=max(args.iterations // 10, 10),
+        sensors_per_task=100,
+    )
+
+    report = {
+        "meta": {
+            "adapter": args.adapter,
+            "iterations": args.iterations,
+            "bulk_size": args.bulk_size,
+            "prepare_statements": not args.no_prepare,
+            "fast_mode": args.fast_mode,
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as stream:
+        json.dump(report, stream, indent=2)
+
+    for group, group_results in results.items():
+        for name, stats in group_results.items():
+            print(
+                f"{group:<10} {name:<36} {stats['ops_per_second']:>12} ops/s "
+                f"p50 {stats['p50_ms']:>9} ms  p99 {stats['p99_ms']:>9} ms"
+            )
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
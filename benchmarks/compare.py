@@ -0,0 +1,47 @@
+import argparse
+import json
+from typing import Any, Dict
+
+
+def load(path: str) -> Dict[str, Any]:
+    with open(path, "r") as stream:
+        return json.load(stream)
+
+
+def change(baseline: float, candidate: float) -> str:
+    if not baseline:
+        return "n/a"
+    return f"{(candidate - baseline) / baseline * 100:+.1f}%"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.compare",
+        description="Compare two benchmark result files.",
+    )
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    args = parser.parse_args()
+
+    baseline = load(args.baseline)
+    candidate = load(args.candidate)
+    print(
+        f"baseline {baseline['meta']['git_commit']} ({baseline['meta']['adapter']}) -> "
+        f"candidate {candidate['meta']['git_commit']} ({candidate['meta']['adapter']})"
+    )
+    for group, group_results in candidate["results"].items():
+        for name, stats in group_results.items():
+            baseline_stats = baseline["results"].get(group, {}).get(name)
+            if baseline_stats is None:
+                print(f"{group:<10} {name:<36} new")
+                continue
+            print(
+                f"{group:<10} {name:<36} "
+                f"ops/s {change(baseline_stats['ops_per_second'], stats['ops_per_second']):>8}  "
+                f"p50 {change(baseline_stats['p50_ms'], stats['p50_ms']):>8}  "
+                f"p99 {change(baseline_stats['p99_ms'], stats['p99_ms']):>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import statistics
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+
+
+def summarize(
+    latencies: List[float], operations: int, elapsed: float
+) -> Dict[str, Any]:
+    ordered = sorted(latencies)
+    return {
+        "operations": operations,
+        "elapsed_seconds": round(elapsed, 6),
+        "ops_per_second": round(operations / elapsed, 2) if elapsed else None,
+        "p50_ms": round(_percentile(ordered, 0.50) * 1000, 4),
+        "p99_ms": round(_percentile(ordered, 0.99) * 1000, 4),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 4),
+    }
+
+
+def _percentile(ordered: List[float], percentile: float) -> float:
+    if not ordered:
+        return 0.0
+    index = min(int(round(percentile * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+async def measure(
+    call: Callable[[int], Awaitable[Any]],
+    iterations: int,
+    operations_per_call: int = 1,
+    warmup: int = 5,
+) -> Dict[str, Any]:
+    # call receives the iteration number, latencies are per call while throughput
+    # counts operations (e.g. rows of a bulk insert)
+    for i in range(0, warmup):
+        await call(-i - 1)
+
+    latencies = []
+    started = time.perf_counter()
+    for i in range(0, iterations):
+        call_started = time.perf_counter()
+        await call(i)
+        latencies.append(time.perf_counter() - call_started)
+    elapsed = time.perf_counter() - started
+    return summarize(latencies, iterations * operations_per_call, elapsed)
+
+
+def measure_sync(
+    call: Callable[[int], Any], iterations: int, warmup: int = 5
+) -> Dict[str, Any]:
+    for i in range(0, warmup):
+        call(-i - 1)
+
+    latencies = []
+    started = time.perf_counter()
+    for i in range(0, iterations):
+        call_started = time.perf_counter()
+        call(i)
+        latencies.append(time.perf_counter() - call_started)
+    elapsed = time.perf_counter() - started
+    return summarize(latencies, iterations, elapsed)
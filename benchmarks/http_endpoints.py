@@ -0,0 +1,51 @@
+import random
+from typing import Any, Dict
+import httpx
+from sensor_app.adapters.primary.web_server.fast_api_app import create_fastapi_app
+from sensor_app.core.ports.secondary import SensorRepository
+from sensor_app.settings import WebServerSettings
+from benchmarks.harness import measure
+
+
+async def run_http_benchmarks(
+    sensor_repo: SensorRepository, iterations: int
+) -> Dict[str, Any]:
+    # In process ASGI calls: measures the framework and serialization path without
+    # socket noise. Background job endpoints are not exercised.
+    app = create_fastapi_app(
+        web_server_settings=WebServerSettings(),
+        sensor_repo=sensor_repo,
+        background_jobs_repo=None,
+    )
+    results: Dict[str, Any] = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://benchmark"
+    ) as client:
+
+        async def post_sensor(i: int) -> None:
+            response = await client.post(
+                "/sensor", json={"name": f"Http {i}", "value": i}
+            )
+            response.raise_for_status()
+
+        results["POST /sensor"] = await measure(post_sensor, iterations)
+
+        sensor_ids = [
+            sensor["id"]
+            for sensor in (await client.get("/sensors", params={"limit": 1000})).json()
+        ]
+        rng = random.Random(42)
+
+        async def get_sensor(i: int) -> None:
+            response = await client.get(f"/sensor/{rng.choice(sensor_ids)}")
+            response.raise_for_status()
+
+        results["GET /sensor/{id}"] = await measure(get_sensor, iterations)
+
+        async def list_sensors(i: int) -> None:
+            response = await client.get("/sensors")
+            response.raise_for_status()
+
+        results["GET /sensors"] = await measure(list_sensors, max(iterations // 50, 3))
+    return results
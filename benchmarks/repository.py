@@ -0,0 +1,83 @@
+import asyncio
+import random
+from typing import Any, Dict
+from sensor_app.core.domain.entities import Sensor
+from sensor_app.core.ports.secondary import SensorRepository
+from sensor_app.adapters.secondary.write_behind import AsyncioSensorWriteBuffer
+from benchmarks.harness import measure
+
+# Concurrent POST /sensor style writers for the write-behind comparison
+INGEST_CONCURRENCY = 100
+
+
+async def run_repository_benchmarks(
+    sensor_repo: SensorRepository, iterations: int, bulk_size: int
+) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+
+    results["create_sensor"] = await measure(
+        lambda i: sensor_repo.create_sensor(Sensor(name=f"Bench {i}", value=i)),
+        iterations,
+    )
+
+    results["create_sensors_bulk"] = await measure(
+        lambda i: sensor_repo.create_sensors(
+            Sensor(name=f"Bulk {i}-{j}", value=j) for j in range(0, bulk_size)
+        ),
+        max(iterations // 50, 3),
+        operations_per_call=bulk_size,
+    )
+
+    # Many writers at once, one insert each vs. batched by the write-behind buffer
+    results["create_sensor_concurrent"] = await measure(
+        lambda i: asyncio.gather(
+            *(
+                sensor_repo.create_sensor(Sensor(name=f"Concurrent {i}-{j}", value=j))
+                for j in range(0, INGEST_CONCURRENCY)
+            )
+        ),
+        max(iterations // 20, 3),
+        operations_per_call=INGEST_CONCURRENCY,
+    )
+
+    write_buffer = AsyncioSensorWriteBuffer(sensor_repo)
+    await write_buffer.start()
+    try:
+        results["create_sensor_write_behind"] = await measure(
+            lambda i: asyncio.gather(
+                *(
+                    write_buffer.write(Sensor(name=f"Buffered {i}-{j}", value=j))
+                    for j in range(0, INGEST_CONCURRENCY)
+                )
+            ),
+            max(iterations // 20, 3),
+            operations_per_call=INGEST_CONCURRENCY,
+        )
+    finally:
+        await write_buffer.drain()
+
+    sensor_ids = [sensor.id for sensor in await sensor_repo.list_sensors(limit=1000)]
+    rng = random.Random(42)
+
+    results["get_sensor"] = await measure(
+        lambda i: sensor_repo.get_sensor(rng.choice(sensor_ids)), iterations
+    )
+
+    results["list_sensors_page"] = await measure(
+        lambda i: sensor_repo.list_sensors(after_id=rng.choice(sensor_ids), limit=100),
+        iterations,
+    )
+
+    total = await sensor_repo.count_sensors()
+
+    async def stream_all(i: int) -> None:
+        async for _ in sensor_repo.stream_sensors(batch_size=1000):
+            pass
+
+    results["stream_sensors_full"] = await measure(
+        stream_all,
+        3,
+        operations_per_call=total if isinstance(total, int) else 0,
+        warmup=1,
+    )
+    return results
@@ -0,0 +1,37 @@
+import asyncio
+from typing import Any, Dict
+from sensor_app.adapters.primary.background_job_server.celery_app import (
+    create_celery_app,
+)
+from sensor_app.adapters.secondary.background_jobs_celery.background_jobs_repo import (
+    CeleryBackgroundJobRepo,
+)
+from sensor_app.core.ports.secondary import SensorRepository
+from sensor_app.settings import BackgroundJobsSettings
+from benchmarks.harness import measure_sync
+
+
+def run_task_benchmarks(
+    sensor_repo: SensorRepository, iterations: int, sensors_per_task: int
+) -> Dict[str, Any]:
+    # Eager mode runs the task body in process, so this measures the task wrapper,
+    # the async runtime hand-off and the use case, not the broker
+    background_job_settings = BackgroundJobsSettings(
+        name="sensor_app_benchmarks",
+        broker="memory://",
+        backend="cache+memory://",
+        task_always_eager=True,
+        task_eager_propagates=True,
+    )
+    celery_app = create_celery_app(
+        background_job_settings=background_job_settings, sensor_repo=sensor_repo
+    )
+    background_jobs_repo = CeleryBackgroundJobRepo(background_job_settings, celery_app)
+
+    result = measure_sync(
+        lambda i: background_jobs_repo.send_task(
+            "make_one_thousand_sensors", count=sensors_per_task
+        ),
+        iterations,
+    )
+    return {"make_one_thousand_sensors (eager)": result}
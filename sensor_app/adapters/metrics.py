@@ -0,0 +1,94 @@
+import os
+import logging
+from typing import Optional, Tuple
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    start_http_server,
+)
+from prometheus_client import multiprocess
+from sensor_app.core.ports.primary import add_use_case_observer
+
+logger = logging.getLogger()
+
+# Shared by the web server and the background worker. Set PROMETHEUS_MULTIPROC_DIR
+# when running several processes (uvicorn workers, prefork Celery pools) so the
+# samples of every process are aggregated on scrape.
+
+USE_CASE_DURATION = Histogram(
+    "sensor_app_use_case_duration_seconds",
+    "Time spent in a use case invocation",
+    ["use_case", "outcome"],
+)
+
+REPOSITORY_CALLS = Counter(
+    "sensor_app_repository_calls_total",
+    "Repository method calls",
+    ["port", "method", "outcome"],
+)
+
+REPOSITORY_CALL_DURATION = Histogram(
+    "sensor_app_repository_call_duration_seconds",
+    "Time spent in a repository method call",
+    ["port", "method"],
+)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "sensor_app_http_request_duration_seconds",
+    "Time to serve an HTTP request, including streaming the body",
+    ["method", "route", "status"],
+)
+
+CELERY_TASK_RUNTIME = Histogram(
+    "sensor_app_celery_task_runtime_seconds",
+    "Time a Celery task spent executing",
+    ["task", "state"],
+)
+
+CELERY_TASK_QUEUE_WAIT = Histogram(
+    "sensor_app_celery_task_queue_wait_seconds",
+    "Time between a Celery task being published and starting to execute",
+    ["task"],
+)
+
+
+def _outcome(error: Optional[BaseException]) -> str:
+    return "success" if error is None else "error"
+
+
+def observe_use_case(
+    name: str, duration: float, error: Optional[BaseException]
+) -> None:
+    USE_CASE_DURATION.labels(use_case=name, outcome=_outcome(error)).observe(duration)
+
+
+def observe_repository_call(
+    port: str, method: str, duration: float, error: Optional[BaseException]
+) -> None:
+    REPOSITORY_CALLS.labels(port=port, method=method, outcome=_outcome(error)).inc()
+    REPOSITORY_CALL_DURATION.labels(port=port, method=method).observe(duration)
+
+
+def enable_use_case_metrics() -> None:
+    add_use_case_observer(observe_use_case)
+
+
+def _collector_registry() -> CollectorRegistry:
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def render_latest() -> Tuple[bytes, str]:
+    return generate_latest(_collector_registry()), CONTENT_TYPE_LATEST
+
+
+def start_metrics_server(port: int) -> None:
+    logger.info(f"Serving Prometheus metrics on port {port}")
+    start_http_server(port, registry=_collector_registry())
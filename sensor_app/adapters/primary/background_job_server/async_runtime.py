@@ -0,0 +1,99 @@
+import asyncio
+import logging
+import os
+import threading
+from typing import Awaitable, Callable, Optional, TypeVar
+
+logger = logging.getLogger()
+
+T = TypeVar("T")
+
+
+class AsyncRuntime:
+    # One event loop per worker process running on a daemon thread. Loop bound
+    # resources (e.g. an asyncpg pool) live on it for the life of the worker, and
+    # with a threads pool many tasks can await on it concurrently.
+
+    def __init__(self, use_uvloop: bool = False):
+        self.use_uvloop = use_uvloop
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _new_event_loop(self) -> asyncio.AbstractEventLoop:
+        if self.use_uvloop:
+            try:
+                import uvloop
+
+                return uvloop.new_event_loop()
+            except ImportError:
+                logger.warning("uvloop is not installed, using the asyncio event loop")
+        return asyncio.new_event_loop()
+
+    def _run_forever(
+        self, loop: asyncio.AbstractEventLoop, started: threading.Event
+    ) -> None:
+        asyncio.set_event_loop(loop)
+        loop.call_soon(started.set)
+        try:
+            loop.run_forever()
+        finally:
+            # Closed by its own thread once it stopped, never while still running
+            loop.close()
+
+    def start(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            # A forked child inherits the attributes but not the loop thread
+            if (
+                self._loop is None
+                or self._pid != os.getpid()
+                or self._thread is None
+                or not self._thread.is_alive()
+            ):
+                loop = self._new_event_loop()
+                started = threading.Event()
+                thread = threading.Thread(
+                    target=self._run_forever,
+                    args=(loop, started),
+                    name="async-runtime",
+                    daemon=True,
+                )
+                thread.start()
+                started.wait()
+                self._loop, self._thread, self._pid = loop, thread, os.getpid()
+            return self._loop
+
+    def stop(self, timeout: float = 10.0) -> None:
+        with self._lock:
+            if self._loop is None or self._pid != os.getpid():
+                self._loop = self._thread = self._pid = None
+                return
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = self._pid = None
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(timeout=timeout)
+            if thread.is_alive():
+                # A callback is blocking the loop, the thread closes it once it
+                # returns (or dies with the process, it is a daemon)
+                logger.warning(f"Event loop still running after {timeout}s")
+
+    def run(
+        self,
+        async_func: Callable[..., Awaitable[T]],
+        *args,
+        **kwargs,
+    ) -> T:
+        loop = self.start()
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("AsyncRuntime.run cannot be called from its own loop")
+        future = asyncio.run_coroutine_threadsafe(
+            _awaited(async_func(*args, **kwargs)), loop
+        )
+        return future.result()
+
+
+async def _awaited(awaitable: Awaitable[T]) -> T:
+    # run_coroutine_threadsafe only takes coroutines, not any awaitable
+    return await awaitable
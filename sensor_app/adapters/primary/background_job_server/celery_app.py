@@ -1,50 +1,186 @@
 # adapters.py
-import asyncio
-from typing import Callable, TypeVar, List
+import time
+from typing import Awaitable, Callable, Dict, Optional, TypeVar, List
 from celery import Celery
-from sensor_app.core.ports.secondary import SensorRepository
+from pydantic import BaseModel
+from celery.signals import (
+    before_task_publish,
+    task_postrun,
+    task_prerun,
+    worker_init,
+    worker_process_init,
+    worker_process_shutdown,
+    worker_shutdown,
+)
+from sensor_app.adapters.metrics import (
+    CELERY_TASK_QUEUE_WAIT,
+    CELERY_TASK_RUNTIME,
+    start_metrics_server,
+)
+from sensor_app.core.ports.secondary import SensorFileStore, SensorRepository
 from sensor_app.settings import BackgroundJobsSettings
+from sensor_app.core.use_cases.bulk import ExportSensors, ImportSensors
 from sensor_app.core.use_cases.sensor import MakeOneThousandSensors
+from sensor_app.adapters.primary.background_job_server.async_runtime import (
+    AsyncRuntime,
+)
+
+# Chord callback merging the results of chunked task groups
+COLLECT_CHUNK_RESULTS_TASK = "collect_chunk_results"
+
+IMPORT_SENSORS_TASK = "import_sensors"
+EXPORT_SENSORS_TASK = "export_sensors"
+
+# Custom state of tasks reporting their progress, the meta is the progress so far
+PROGRESS_STATE = "PROGRESS"
 
 # Create a global singleton so this can be referenced in the repo and in sensor_app.main
 _celery_app = None
 
+# Created once per worker process, every task coroutine runs on its loop
+_async_runtime = AsyncRuntime()
 
 T = TypeVar("T")
 
 
-def run_async_task(async_func: Callable[..., T], *args, **kwargs) -> T:
-    loop = asyncio.get_event_loop()
-    result = loop.run_until_complete(async_func(*args, **kwargs))
-    return result
+def run_async_task(async_func: Callable[..., Awaitable[T]], *args, **kwargs) -> T:
+    return _async_runtime.run(async_func, *args, **kwargs)
 
 
 def create_celery_task(
-    celery_app: Celery, task_name: str, async_func: Callable[..., List]
+    celery_app: Celery, task_name: str, async_func: Callable[..., Awaitable[List]]
 ) -> None:
     @celery_app.task(name=task_name)
     def celery_task(*args, **kwargs) -> List:
         return run_async_task(async_func, *args, **kwargs)
 
 
+def create_progress_celery_task(
+    celery_app: Celery,
+    task_name: str,
+    async_func: Callable[..., Awaitable[BaseModel]],
+) -> None:
+    # For use cases taking an on_progress callback: each report is stored as the
+    # task's PROGRESS state, readable from the result backend while it runs. The
+    # backend write blocks the task loop, use cases report once per chunk of work.
+    @celery_app.task(name=task_name, bind=True)
+    def celery_task(self, *args, **kwargs) -> dict:
+        # The request is thread local and progress is reported from the loop thread
+        task_id = self.request.id
+
+        def report_progress(progress: BaseModel) -> None:
+            self.update_state(
+                task_id=task_id,
+                state=PROGRESS_STATE,
+                meta=progress.model_dump(mode="json"),
+            )
+
+        result = run_async_task(
+            async_func, *args, on_progress=report_progress, **kwargs
+        )
+        return result.model_dump(mode="json")
+
+
+def create_collect_chunk_results_task(celery_app: Celery) -> None:
+    @celery_app.task(name=COLLECT_CHUNK_RESULTS_TASK)
+    def collect_chunk_results(chunk_results: List) -> List:
+        results: List = []
+        for chunk_result in chunk_results:
+            if isinstance(chunk_result, list):
+                results.extend(chunk_result)
+            else:
+                results.append(chunk_result)
+        return results
+
+
 def configure_usecases_as_tasks(
-    celery_app: Celery, make_one_thousand_sensors: MakeOneThousandSensors
+    celery_app: Celery,
+    make_one_thousand_sensors: MakeOneThousandSensors,
+    import_sensors: Optional[ImportSensors] = None,
+    export_sensors: Optional[ExportSensors] = None,
 ) -> None:
     create_celery_task(
         celery_app,
         task_name="make_one_thousand_sensors",
         async_func=make_one_thousand_sensors,
     )
+    create_collect_chunk_results_task(celery_app)
+    if import_sensors is not None:
+        create_progress_celery_task(
+            celery_app, task_name=IMPORT_SENSORS_TASK, async_func=import_sensors
+        )
+    if export_sensors is not None:
+        create_progress_celery_task(
+            celery_app, task_name=EXPORT_SENSORS_TASK, async_func=export_sensors
+        )
     return None
 
 
+def configure_worker_lifecycle(sensor_repo: SensorRepository) -> None:
+    # Prefork children get their own pool after the fork, sharing sockets across
+    # processes is not safe. Solo/threads pools open the pool lazily on first use.
+    def open_sensor_repo(**kwargs) -> None:
+        _async_runtime.start()
+        run_async_task(sensor_repo.connect)
+
+    def close_sensor_repo(**kwargs) -> None:
+        run_async_task(sensor_repo.disconnect)
+        _async_runtime.stop()
+
+    worker_process_init.connect(open_sensor_repo, weak=False)
+    worker_process_shutdown.connect(close_sensor_repo, weak=False)
+    worker_shutdown.connect(close_sensor_repo, weak=False)
+
+
+def configure_task_metrics(background_job_settings: BackgroundJobsSettings) -> None:
+    task_started_at: Dict[str, float] = {}
+
+    def stamp_published_at(headers=None, **kwargs) -> None:
+        if headers is not None:
+            headers["published_at"] = time.time()
+
+    def record_task_start(task_id=None, task=None, **kwargs) -> None:
+        task_started_at[task_id] = time.perf_counter()
+        published_at = task.request.get("published_at") or (
+            task.request.headers or {}
+        ).get("published_at")
+        if published_at is not None:
+            CELERY_TASK_QUEUE_WAIT.labels(task=task.name).observe(
+                max(time.time() - published_at, 0.0)
+            )
+
+    def record_task_runtime(task_id=None, task=None, state=None, **kwargs) -> None:
+        started_at = task_started_at.pop(task_id, None)
+        if started_at is not None:
+            CELERY_TASK_RUNTIME.labels(
+                task=task.name, state=state or "UNKNOWN"
+            ).observe(time.perf_counter() - started_at)
+
+    def serve_metrics(**kwargs) -> None:
+        metrics_port = background_job_settings.metrics_port
+        if metrics_port is not None:
+            start_metrics_server(metrics_port)
+
+    before_task_publish.connect(stamp_published_at, weak=False)
+    task_prerun.connect(record_task_start, weak=False)
+    task_postrun.connect(record_task_runtime, weak=False)
+    if background_job_settings.metrics_port:
+        worker_init.connect(serve_metrics, weak=False)
+
+
 def create_celery_app(
-    background_job_settings: BackgroundJobsSettings, sensor_repo: SensorRepository
+    background_job_settings: BackgroundJobsSettings,
+    sensor_repo: SensorRepository,
+    sensor_files: Optional[SensorFileStore] = None,
+    import_chunk_size: int = 10000,
+    export_batch_size: int = 10000,
 ) -> Celery:
     # TODO this poses an issue with tests...
     global _celery_app
 
     if _celery_app is None:
+        _async_runtime.use_uvloop = background_job_settings.use_uvloop
+
         _celery_app = Celery(
             background_job_settings.name,
             broker=background_job_settings.broker,
@@ -59,12 +195,34 @@ def create_celery_app(
             broker_connection_retry_on_startup=background_job_settings.broker_connection_retry_on_startup,
             task_track_started=background_job_settings.task_track_started,
             task_send_sent_event=background_job_settings.task_send_sent_event,
+            worker_send_task_events=background_job_settings.worker_send_task_events,
             result_extended=True,
         )
 
         configure_usecases_as_tasks(
             celery_app=_celery_app,
             make_one_thousand_sensors=MakeOneThousandSensors(sensor_repo=sensor_repo),
+            import_sensors=(
+                ImportSensors(
+                    sensor_repo=sensor_repo,
+                    sensor_files=sensor_files,
+                    chunk_size=import_chunk_size,
+                )
+                if sensor_files is not None
+                else None
+            ),
+            export_sensors=(
+                ExportSensors(
+                    sensor_repo=sensor_repo,
+                    sensor_files=sensor_files,
+                    batch_size=export_batch_size,
+                )
+                if sensor_files is not None
+                else None
+            ),
         )
 
+        configure_worker_lifecycle(sensor_repo)
+        configure_task_metrics(background_job_settings)
+
     return _celery_app
@@ -0,0 +1,91 @@
+import asyncio
+import logging
+from typing import (
+    AsyncGenerator,
+    Callable,
+    Generic,
+    Optional,
+    Set,
+    TypeVar,
+)
+
+logger = logging.getLogger()
+
+T = TypeVar("T")
+
+# Put on a subscriber's queue when it is dropped for falling behind
+_DROPPED = object()
+
+
+class Broadcaster(Generic[T]):
+    # Fans one upstream subscription (e.g. watch_sensors) out to every subscriber in
+    # the process. Upstream is opened with the first subscriber, reopened after
+    # reconnect_seconds when it fails, and closed with the last subscriber. Each
+    # subscriber buffers up to max_queue_size items, one that falls further behind
+    # is dropped (its stream ends) rather than holding the others back.
+    def __init__(
+        self,
+        open_stream: Callable[[], AsyncGenerator[T, None]],
+        max_queue_size: int = 1000,
+        reconnect_seconds: float = 1.0,
+    ):
+        self.open_stream = open_stream
+        self.max_queue_size = max_queue_size
+        self.reconnect_seconds = reconnect_seconds
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._pump: Optional[asyncio.Task] = None
+        self.dropped_subscribers = 0
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    async def subscribe(self) -> AsyncGenerator[T, None]:
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.add(queue)
+        if self._pump is None or self._pump.done():
+            self._pump = asyncio.ensure_future(self._pump_forever())
+        try:
+            while True:
+                item = await queue.get()
+                if item is _DROPPED:
+                    return
+                yield item
+        finally:
+            self._subscribers.discard(queue)
+            if not self._subscribers and self._pump is not None:
+                pump, self._pump = self._pump, None
+                pump.cancel()
+
+    async def close(self) -> None:
+        for queue in self._subscribers:
+            queue.put_nowait(_DROPPED)
+        self._subscribers.clear()
+        if self._pump is not None:
+            pump, self._pump = self._pump, None
+            pump.cancel()
+            try:
+                await pump
+            except asyncio.CancelledError:
+                pass
+
+    def _publish(self, item: T) -> None:
+        for queue in list(self._subscribers):
+            if queue.qsize() >= self.max_queue_size:
+                self._subscribers.discard(queue)
+                queue.put_nowait(_DROPPED)
+                self.dropped_subscribers += 1
+                continue
+            queue.put_nowait(item)
+
+    async def _pump_forever(self) -> None:
+        while True:
+            stream = self.open_stream()
+            try:
+                async for item in stream:
+                    self._publish(item)
+            except Exception as e:
+                logger.warning(f"Broadcast upstream failed, reopening: {e}")
+            finally:
+                await stream.aclose()
+            await asyncio.sleep(self.reconnect_seconds)
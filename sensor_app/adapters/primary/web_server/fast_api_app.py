@@ -1,46 +1,331 @@
-from typing import List
-from fastapi import FastAPI, HTTPException
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import (
+    AsyncGenerator,
+    AsyncIterator,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    Union,
+)
+from fastapi import (
+    FastAPI,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.exceptions import RequestValidationError
+from pydantic import TypeAdapter, ValidationError
+from pydantic_core import from_json
 from uuid import UUID
 from sensor_app.settings import WebServerSettings
-from sensor_app.core.domain.entities import Sensor
+from sensor_app.core.domain.entities import (
+    ReadingAggregate,
+    Sensor,
+    SensorChange,
+    SensorReading,
+)
 from sensor_app.core.domain.results import AsyncResult
-from sensor_app.core.ports.secondary import SensorRepository
-from sensor_app.core.ports.secondary import BackgroundJobsRepository
+from sensor_app.core.domain.errors import InvalidSensorId, SensorNotFound
+from sensor_app.core.ports.secondary import (
+    SensorFileStore,
+    SensorRepository,
+    SensorWriteBuffer,
+)
+from sensor_app.core.ports.secondary import AsyncBackgroundJobsRepository
 from sensor_app.core.use_cases.sensor import (
     CountSensors,
     GetSensor,
     ListSensors,
+    StreamSensors,
+    WatchSensors,
     CreateSensor,
+    CreateSensors,
+)
+from sensor_app.core.use_cases.bulk import (
+    GetSensorExport,
+    SaveSensorFile,
+    StartSensorExport,
+)
+from sensor_app.core.use_cases.sensor_readings import (
+    AggregateSensorReadings,
+    IngestSensorReadings,
 )
 from sensor_app.core.use_cases.background_jobs import (
     GetBackgroundTaskResultsById,
+    GetBackgroundTaskResultsByIds,
+    GetBackgroundTaskGroupResultsById,
     RetryBackgroundTaskById,
     StartBackgroundTask,
+    StartChunkedBackgroundTask,
+    WatchBackgroundTaskResults,
 )
 from fastapi.middleware.cors import CORSMiddleware
 from random import randint
+from sensor_app.adapters.metrics import render_latest
+from sensor_app.adapters.primary.web_server.broadcast import Broadcaster
+from sensor_app.adapters.primary.web_server.formats import (
+    JSON_MEDIA_TYPE,
+    NDJSON_MEDIA_TYPE,
+    SENSOR_ENCODERS,
+    export_media_type,
+    import_file_format,
+    iterate,
+    negotiate,
+    sensor_media_types,
+)
+from sensor_app.adapters.primary.web_server.middleware import (
+    CompressionMiddleware,
+    MetricsMiddleware,
+)
+from sensor_app.adapters.primary.web_server.responses import (
+    DefaultJSONResponse,
+    caching_headers,
+    is_not_modified,
+    not_modified_response,
+    sensor_etag,
+    sensors_etag,
+    trusted_response,
+)
+
+EVENT_STREAM_MEDIA_TYPE = "text/event-stream"
+
+_sensor_adapter = TypeAdapter(Sensor)
+_sensor_batch_adapter = TypeAdapter(List[Sensor])
+_sensor_ids_adapter = TypeAdapter(List[Union[int, str]])
+_reading_aggregates_adapter = TypeAdapter(List[ReadingAggregate])
+_async_result_adapter = TypeAdapter(AsyncResult)
+_async_results_adapter = TypeAdapter(List[AsyncResult])
+
+
+def _json_invalid(
+    error: ValueError, line: Optional[int] = None
+) -> RequestValidationError:
+    # Shaped like FastAPI's own error for unparsable JSON bodies
+    return RequestValidationError(
+        [
+            {
+                "type": "json_invalid",
+                "loc": ("body",) if line is None else ("body", line),
+                "msg": "JSON decode error",
+                "input": {},
+                "ctx": {"error": str(error)},
+            }
+        ]
+    )
+
+
+def _batch_too_large(size: int, max_batch_size: int) -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"Batch of {size} sensors exceeds the maximum of {max_batch_size}",
+    )
+
+
+def parse_sensor_batch(
+    body: bytes, content_type: str, max_batch_size: int
+) -> List[Sensor]:
+    # Parsed to plain JSON values first, so a batch over max_batch_size is refused
+    # before any sensor is validated. Each NDJSON line must hold exactly one
+    # value, a line like {...},{...} is invalid JSON.
+    items: object
+    if content_type.startswith(NDJSON_MEDIA_TYPE):
+        lines = [line for line in body.splitlines() if line.strip()]
+        if len(lines) > max_batch_size:
+            raise _batch_too_large(len(lines), max_batch_size)
+        parsed_lines = []
+        for number, line in enumerate(lines):
+            try:
+                parsed_lines.append(from_json(line))
+            except ValueError as e:
+                raise _json_invalid(e, number)
+        items = parsed_lines
+    else:
+        try:
+            items = from_json(body)
+        except ValueError as e:
+            raise _json_invalid(e)
+        if isinstance(items, list) and len(items) > max_batch_size:
+            raise _batch_too_large(len(items), max_batch_size)
+    try:
+        return _sensor_batch_adapter.validate_python(items)
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+
+
+def _body_too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=413, detail=f"Body exceeds the maximum of {max_bytes} bytes"
+    )
+
+
+async def request_chunks(
+    request: Request, max_bytes: int
+) -> AsyncGenerator[bytes, None]:
+    # The body as it arrives. A Content-Length over max_bytes is refused before
+    # reading anything, a body without one as soon as it goes over.
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > max_bytes:
+        raise _body_too_large(max_bytes)
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > max_bytes:
+            raise _body_too_large(max_bytes)
+        yield chunk
+
+
+async def with_heartbeats(
+    messages: AsyncGenerator[bytes, None], heartbeat_seconds: float = 15.0
+) -> AsyncGenerator[bytes, None]:
+    # Server-sent event messages, plus a comment line every heartbeat_seconds while
+    # nothing happens so proxies keep the stream open. The pending __anext__ is
+    # waited on again, never cancelled, so the iterator stays usable across
+    # heartbeats.
+    next_message = asyncio.ensure_future(messages.__anext__())
+    try:
+        while True:
+            done, _ = await asyncio.wait({next_message}, timeout=heartbeat_seconds)
+            if not done:
+                yield b": heartbeat\n\n"
+                continue
+            try:
+                message = next_message.result()
+            except StopAsyncIteration:
+                return
+            yield message
+            next_message = asyncio.ensure_future(messages.__anext__())
+    finally:
+        if not next_message.done():
+            # The client went away, the iterator has to stop running before aclose
+            next_message.cancel()
+            try:
+                await next_message
+            except (asyncio.CancelledError, Exception):
+                pass
+        await messages.aclose()
+
+
+def sse_message(event: bytes, data: bytes) -> bytes:
+    return b"event: " + event + b"\ndata: " + data + b"\n\n"
+
+
+async def _task_result_messages(
+    results: AsyncGenerator[AsyncResult, None],
+) -> AsyncGenerator[bytes, None]:
+    try:
+        async for result in results:
+            yield sse_message(b"task_result", result.model_dump_json().encode())
+    finally:
+        await results.aclose()
+
+
+def sse_events(
+    results: AsyncGenerator[AsyncResult, None], heartbeat_seconds: float = 15.0
+) -> AsyncGenerator[bytes, None]:
+    # One "task_result" server-sent event per state change
+    return with_heartbeats(_task_result_messages(results), heartbeat_seconds)
+
+
+async def encoded_sensor_changes(
+    changes: AsyncGenerator[SensorChange, None],
+) -> AsyncGenerator[Tuple[SensorChange, bytes], None]:
+    # Serialized once before the fan out instead of once per subscriber
+    try:
+        async for change in changes:
+            yield change, change.model_dump_json().encode()
+    finally:
+        await changes.aclose()
+
+
+async def filter_sensor_changes(
+    changes: AsyncGenerator[Tuple[SensorChange, bytes], None], sensor_ids: List[str]
+) -> AsyncGenerator[bytes, None]:
+    # Ids are compared as strings, they are ints or ObjectId strings by adapter
+    wanted = set(sensor_ids)
+    try:
+        async for change, data in changes:
+            if not wanted or str(change.sensor_id) in wanted:
+                yield data
+    finally:
+        await changes.aclose()
+
+
+async def _sensor_change_messages(
+    data: AsyncGenerator[bytes, None],
+) -> AsyncGenerator[bytes, None]:
+    try:
+        async for chunk in data:
+            yield sse_message(b"sensor_change", chunk)
+    finally:
+        await data.aclose()
 
 
 def create_fastapi_app(
     web_server_settings: WebServerSettings,
     sensor_repo: SensorRepository,
-    background_jobs_repo: BackgroundJobsRepository,
+    background_jobs_repo: AsyncBackgroundJobsRepository,
+    sensor_write_buffer: Optional[SensorWriteBuffer] = None,
+    sensor_files: Optional[SensorFileStore] = None,
 ) -> FastAPI:
     return app_factory(
         web_server_settings,
         count_sensors=CountSensors(sensor_repo=sensor_repo),
         get_sensor=GetSensor(sensor_repo=sensor_repo),
         list_sensors=ListSensors(sensor_repo=sensor_repo),
-        create_sensor=CreateSensor(sensor_repo=sensor_repo),
+        stream_sensors=StreamSensors(sensor_repo=sensor_repo),
+        watch_sensors=WatchSensors(sensor_repo=sensor_repo),
+        create_sensor=CreateSensor(
+            sensor_repo=sensor_repo, write_buffer=sensor_write_buffer
+        ),
+        create_sensors=CreateSensors(sensor_repo=sensor_repo),
+        ingest_sensor_readings=IngestSensorReadings(sensor_repo=sensor_repo),
+        aggregate_sensor_readings=AggregateSensorReadings(sensor_repo=sensor_repo),
         get_background_task_result_by_id=GetBackgroundTaskResultsById(
             background_jobs_repo=background_jobs_repo
         ),
+        get_background_task_results_by_ids=GetBackgroundTaskResultsByIds(
+            background_jobs_repo=background_jobs_repo
+        ),
         retry_background_task_by_id=RetryBackgroundTaskById(
             background_jobs_repo=background_jobs_repo
         ),
         start_background_task=StartBackgroundTask(
             background_jobs_repo=background_jobs_repo
         ),
+        get_background_task_group_result_by_id=GetBackgroundTaskGroupResultsById(
+            background_jobs_repo=background_jobs_repo
+        ),
+        start_chunked_background_task=StartChunkedBackgroundTask(
+            background_jobs_repo=background_jobs_repo
+        ),
+        watch_background_task_results=WatchBackgroundTaskResults(
+            background_jobs_repo=background_jobs_repo
+        ),
+        save_sensor_file=(
+            SaveSensorFile(sensor_files=sensor_files)
+            if sensor_files is not None
+            else None
+        ),
+        get_sensor_export=(
+            GetSensorExport(sensor_files=sensor_files)
+            if sensor_files is not None
+            else None
+        ),
+        start_sensor_export=(
+            StartSensorExport(
+                background_jobs_repo=background_jobs_repo, sensor_files=sensor_files
+            )
+            if sensor_files is not None
+            else None
+        ),
     )
 
 
@@ -49,13 +334,25 @@ def app_factory(
     count_sensors: CountSensors,
     get_sensor: GetSensor,
     list_sensors: ListSensors,
+    stream_sensors: StreamSensors,
+    watch_sensors: WatchSensors,
     create_sensor: CreateSensor,
+    create_sensors: CreateSensors,
+    ingest_sensor_readings: IngestSensorReadings,
+    aggregate_sensor_readings: AggregateSensorReadings,
     get_background_task_result_by_id: GetBackgroundTaskResultsById,
+    get_background_task_results_by_ids: GetBackgroundTaskResultsByIds,
     retry_background_task_by_id: RetryBackgroundTaskById,
     start_background_task: StartBackgroundTask,
+    get_background_task_group_result_by_id: GetBackgroundTaskGroupResultsById,
+    start_chunked_background_task: StartChunkedBackgroundTask,
+    watch_background_task_results: WatchBackgroundTaskResults,
+    save_sensor_file: Optional[SaveSensorFile] = None,
+    get_sensor_export: Optional[GetSensorExport] = None,
+    start_sensor_export: Optional[StartSensorExport] = None,
 ) -> FastAPI:
     # TODO pass configuration from WebServerSettings to FastAPI app
-    app = FastAPI()
+    app = FastAPI(default_response_class=DefaultJSONResponse)
 
     # Define the origins that should be allowed to make requests to this app
     origins = [
@@ -70,6 +367,21 @@ def app_factory(
         allow_methods=["*"],  # Allow all HTTP methods
         allow_headers=["*"],  # Allow all headers
     )
+    if web_server_settings.compression_enabled:
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=web_server_settings.compression_minimum_size,
+            gzip_level=web_server_settings.compression_gzip_level,
+            brotli_quality=web_server_settings.compression_brotli_quality,
+        )
+    app.add_middleware(MetricsMiddleware)
+
+    # One repository subscription per process whatever the number of clients
+    sensor_changes = Broadcaster(
+        lambda: encoded_sensor_changes(watch_sensors()),
+        max_queue_size=web_server_settings.sensor_event_queue_size,
+    )
+    app.add_event_handler("shutdown", sensor_changes.close)
 
     @app.get("/")
     def root() -> str:
@@ -82,41 +394,394 @@ def app_factory(
                 raise HTTPException(status_code=500, detail=f"{e} {number}")
         return "Sensor App"
 
+    @app.get("/metrics", include_in_schema=False)
+    def metrics() -> Response:
+        content, content_type = render_latest()
+        return Response(content=content, media_type=content_type)
+
     @app.post("/retry_background_task", response_model=AsyncResult)
     async def use_retry_background_task_by_id(retry_background_task: AsyncResult):
         results = await retry_background_task_by_id(
             task_id=retry_background_task.task_id
         )
-        return results
+        return trusted_response(_async_result_adapter, results)
 
     # Technically we could hit flower API if so desired
     # https://flower.readthedocs.io/en/latest/api.html#get--api-task-info-(.*)
     # http://localhost:5555/api/task/info/f2b8b54e-fde2-4b78-aa1a-b6076dd5e31a
     @app.get("/background_task_results/{task_id}", response_model=AsyncResult)
     async def use_get_background_task_results(task_id: UUID):
-        return await get_background_task_result_by_id(str(task_id))
+        return trusted_response(
+            _async_result_adapter, await get_background_task_result_by_id(str(task_id))
+        )
+
+    @app.post("/background_task_results:batch", response_model=List[AsyncResult])
+    async def use_get_background_task_results_batch(task_ids: List[UUID]):
+        # Results in request order, looked up with one backend round trip
+        if len(task_ids) > web_server_settings.max_batch_size:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Batch of {len(task_ids)} task ids exceeds the maximum of {web_server_settings.max_batch_size}",
+            )
+        results = await get_background_task_results_by_ids(
+            [str(task_id) for task_id in task_ids]
+        )
+        return trusted_response(_async_results_adapter, results)
+
+    @app.get("/background_task_group_results/{group_id}", response_model=AsyncResult)
+    async def use_get_background_task_group_results(group_id: UUID):
+        try:
+            result = await get_background_task_group_result_by_id(str(group_id))
+        except ValueError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+        return trusted_response(_async_result_adapter, result)
+
+    @app.get("/background_task_events")
+    async def use_watch_background_task_results(task_id: List[UUID] = Query()):
+        # Server-sent events for the given tasks: their current result, then every
+        # state change, the stream ends once all of them are ready
+        if len(task_id) > web_server_settings.max_watched_tasks:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Watching {len(task_id)} tasks exceeds the maximum of {web_server_settings.max_watched_tasks}",
+            )
+        return StreamingResponse(
+            sse_events(
+                watch_background_task_results([str(id) for id in task_id]),
+                heartbeat_seconds=web_server_settings.event_stream_heartbeat_seconds,
+            ),
+            media_type=EVENT_STREAM_MEDIA_TYPE,
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
 
     @app.get("/sensor_count")
     async def use_count_sensors():
         return await count_sensors()
 
-    @app.get("/sensors", response_model=List[Sensor])
-    async def use_list_sensors():
-        return await list_sensors()
+    def negotiate_sensor_format(request: Request, offered: List[str]) -> str:
+        media_type = negotiate(request.headers.get("accept"), offered)
+        if media_type is None:
+            raise HTTPException(
+                status_code=406,
+                detail=f"Sensors are served as {', '.join(offered)}",
+            )
+        return media_type
+
+    def encoded_sensors_response(
+        media_type: str,
+        sensors: AsyncIterator[Sensor],
+        headers: Optional[Dict[str, str]] = None,
+    ) -> StreamingResponse:
+        return StreamingResponse(
+            SENSOR_ENCODERS[media_type](sensors, web_server_settings.stream_batch_size),
+            media_type=media_type,
+            headers=headers,
+        )
+
+    @app.get(
+        "/sensors",
+        response_model=List[Sensor],
+        responses={
+            200: {"content": {media_type: {} for media_type in sensor_media_types()}}
+        },
+    )
+    async def use_list_sensors(
+        request: Request,
+        after_id: Optional[Union[int, str]] = None,
+        limit: Optional[int] = Query(
+            default=None, ge=1, le=web_server_settings.max_page_size
+        ),
+    ):
+        # JSON rows by default, NDJSON, JSON columns, CSV or Arrow by Accept header
+        media_type = negotiate_sensor_format(request, sensor_media_types())
+        if media_type != JSON_MEDIA_TYPE and after_id is None and limit is None:
+            # The whole fleet, encoded straight from the repository cursor
+            return encoded_sensors_response(
+                media_type,
+                stream_sensors(batch_size=web_server_settings.stream_batch_size),
+                headers={"Vary": "Accept"},
+            )
+
+        try:
+            sensors = await list_sensors(after_id=after_id, limit=limit)
+        except InvalidSensorId as e:
+            # A cursor this storage never handed out
+            raise HTTPException(status_code=422, detail=str(e))
+        # No Last-Modified: deleting a sensor leaves the newest updated_at of a page
+        # as it was, only the ETag (ids and versions) tells the page changed
+        headers = caching_headers(
+            sensors_etag(sensors, media_type),
+            None,
+            web_server_settings.sensor_cache_control,
+        )
+        headers["Vary"] = "Accept"
+        if limit is not None and len(sensors) == limit:
+            # Cursor for the next page, absent once the last page is reached
+            headers["X-Next-After-Id"] = str(sensors[-1].id)
+        if is_not_modified(request, headers["ETag"], None):
+            return not_modified_response(headers)
+        if media_type == JSON_MEDIA_TYPE:
+            return trusted_response(_sensor_batch_adapter, sensors, headers=headers)
+        return encoded_sensors_response(media_type, iterate(sensors), headers=headers)
+
+    @app.get(
+        "/sensors/stream",
+        responses={
+            200: {
+                "content": {
+                    media_type: {}
+                    for media_type in sensor_media_types()
+                    if media_type != JSON_MEDIA_TYPE
+                }
+            }
+        },
+    )
+    async def use_stream_sensors(request: Request):
+        # Every sensor from the repository cursor, NDJSON unless Accept asks for
+        # JSON columns, CSV or Arrow
+        media_type = negotiate_sensor_format(
+            request,
+            [
+                media_type
+                for media_type in sensor_media_types()
+                if media_type != JSON_MEDIA_TYPE
+            ],
+        )
+        return encoded_sensors_response(
+            media_type,
+            stream_sensors(batch_size=web_server_settings.stream_batch_size),
+        )
+
+    def too_many_watched_sensors(sensor_id: List[str]) -> Optional[str]:
+        if len(sensor_id) > web_server_settings.max_watched_sensors:
+            return f"Watching {len(sensor_id)} sensors exceeds the maximum of {web_server_settings.max_watched_sensors}"
+        return None
+
+    @app.get("/sensor_events")
+    async def use_watch_sensors(sensor_id: List[str] = Query(default=[])):
+        # Server-sent "sensor_change" events for every sensor, or only the given
+        # ones, instead of polling GET /sensor/{id}. A client too slow to keep up is
+        # disconnected and should reconnect (EventSource does so by itself).
+        detail = too_many_watched_sensors(sensor_id)
+        if detail is not None:
+            raise HTTPException(status_code=413, detail=detail)
+        return StreamingResponse(
+            with_heartbeats(
+                _sensor_change_messages(
+                    filter_sensor_changes(sensor_changes.subscribe(), sensor_id)
+                ),
+                heartbeat_seconds=web_server_settings.event_stream_heartbeat_seconds,
+            ),
+            media_type=EVENT_STREAM_MEDIA_TYPE,
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    @app.websocket("/sensor_events/ws")
+    async def use_watch_sensors_websocket(
+        websocket: WebSocket, sensor_id: List[str] = Query(default=[])
+    ):
+        # Same changes as GET /sensor_events, one JSON text message each
+        detail = too_many_watched_sensors(sensor_id)
+        if detail is not None:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=detail)
+            return
+        await websocket.accept()
+        changes = filter_sensor_changes(sensor_changes.subscribe(), sensor_id)
+        try:
+            async for data in changes:
+                await websocket.send_text(data.decode())
+        except WebSocketDisconnect:
+            pass
+        finally:
+            await changes.aclose()
 
     @app.get("/sensor/{id}", response_model=Sensor)
-    async def use_get_sensor(id: int) -> Sensor:
+    async def use_get_sensor(id: int, request: Request):
         sensor = await get_sensor(id)
         if sensor is None:
             raise HTTPException(status_code=404, detail=f"Sensor with {id} not found")
-        return sensor
+        headers = caching_headers(
+            sensor_etag(sensor),
+            sensor.updated_at,
+            web_server_settings.sensor_cache_control,
+        )
+        # Revalidations of an unchanged sensor skip serializing it
+        if is_not_modified(request, headers["ETag"], sensor.updated_at):
+            return not_modified_response(headers)
+        return trusted_response(_sensor_adapter, sensor, headers=headers)
 
     @app.post("/sensor", response_model=Sensor)
-    async def use_create_sensor(sensor: Sensor):
-        return await create_sensor(sensor)
+    async def use_create_sensor(sensor: Sensor, wait_for_durability: bool = True):
+        # With the write-behind buffer enabled, wait_for_durability=false answers
+        # 202 with the submitted sensor (no id yet) as soon as it is queued
+        created_sensor = await create_sensor(
+            sensor, wait_for_durability=wait_for_durability
+        )
+        if created_sensor is None:
+            return trusted_response(_sensor_adapter, sensor, status_code=202)
+        return trusted_response(_sensor_adapter, created_sensor)
+
+    @app.post(
+        "/sensors",
+        response_model=List[Union[int, str]],
+        openapi_extra={
+            "requestBody": {
+                "required": True,
+                "content": {
+                    "application/json": {
+                        "schema": {
+                            "type": "array",
+                            "items": {"$ref": "#/components/schemas/Sensor"},
+                        }
+                    },
+                    NDJSON_MEDIA_TYPE: {
+                        "schema": {"$ref": "#/components/schemas/Sensor"}
+                    },
+                },
+            }
+        },
+    )
+    async def use_create_sensors(request: Request):
+        body = b"".join(
+            [
+                chunk
+                async for chunk in request_chunks(
+                    request, web_server_settings.max_batch_bytes
+                )
+            ]
+        )
+        sensors = parse_sensor_batch(
+            body,
+            request.headers.get("content-type", ""),
+            web_server_settings.max_batch_size,
+        )
+        created_sensors = await create_sensors(sensors)
+        return trusted_response(
+            _sensor_ids_adapter, [sensor.id for sensor in created_sensors]
+        )
+
+    @app.post("/sensor_readings", response_model=int)
+    async def use_ingest_sensor_readings(readings: List[SensorReading]):
+        if len(readings) > web_server_settings.max_batch_size:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Batch of {len(readings)} readings exceeds the maximum of {web_server_settings.max_batch_size}",
+            )
+        # The batch is all or nothing, one bad sensor_id rejects every reading
+        try:
+            return await ingest_sensor_readings(readings)
+        except InvalidSensorId as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        except SensorNotFound as e:
+            raise HTTPException(status_code=404, detail=str(e))
+
+    @app.get("/sensor/{id}/readings/aggregate", response_model=List[ReadingAggregate])
+    async def use_aggregate_sensor_readings(
+        id: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        bucket: str = "hour",
+        percentiles: List[float] = Query(default=[0.5, 0.95, 0.99]),
+    ):
+        # Defaults to the last day of readings
+        end = end or datetime.now(timezone.utc)
+        start = start or end - timedelta(days=1)
+        try:
+            aggregates = await aggregate_sensor_readings(
+                id, start, end, bucket=bucket, percentiles=percentiles
+            )
+        except InvalidSensorId as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return trusted_response(_reading_aggregates_adapter, aggregates)
 
     @app.post("/make_one_thousand_sensors", response_model=AsyncResult)
     async def use_background_make_one_thousand_sensors():
-        return await start_background_task("make_one_thousand_sensors")
+        return trusted_response(
+            _async_result_adapter,
+            await start_background_task("make_one_thousand_sensors"),
+        )
+
+    @app.post("/make_sensors_chunked", response_model=AsyncResult)
+    async def use_background_make_sensors_chunked(
+        count: int = Query(ge=1, le=web_server_settings.max_chunked_count),
+        chunk_size: int = Query(
+            default=1000, ge=1, le=web_server_settings.max_chunked_count
+        ),
+    ):
+        # The chord, one task per chunk, is built here, so the chunks are capped
+        chunks = -(-count // chunk_size)
+        if chunks > web_server_settings.max_chunks:
+            raise HTTPException(
+                status_code=422,
+                detail=f"{chunks} chunks exceed the maximum of {web_server_settings.max_chunks}, raise chunk_size",
+            )
+        return trusted_response(
+            _async_result_adapter,
+            await start_chunked_background_task(
+                "make_one_thousand_sensors", count=count, chunk_size=chunk_size
+            ),
+        )
+
+    if save_sensor_file is not None:
+
+        @app.post("/sensors/import", response_model=AsyncResult, status_code=202)
+        async def use_import_sensors(
+            request: Request, file_format: Optional[str] = None
+        ):
+            # Stores the CSV (name and value columns) or Parquet file sent as the
+            # body and answers 202 with the import task, its PROGRESS meta counts
+            # the loaded and rejected rows. The body is written as it arrives, so
+            # max_upload_bytes holds before the file is read in full. The format
+            # defaults to the one of the Content-Type.
+            file_format = file_format or import_file_format(
+                request.headers.get("content-type")
+            )
+            if file_format is None:
+                raise HTTPException(
+                    status_code=415,
+                    detail="Unknown file format, set the Content-Type or file_format",
+                )
+            try:
+                file_name = await save_sensor_file(
+                    request_chunks(request, web_server_settings.max_upload_bytes),
+                    file_format,
+                )
+            except ValueError as e:
+                raise HTTPException(status_code=415, detail=str(e))
+            return trusted_response(
+                _async_result_adapter,
+                await start_background_task("import_sensors", file_name=file_name),
+                status_code=202,
+            )
+
+    if start_sensor_export is not None:
+
+        @app.post("/sensors/export", response_model=AsyncResult, status_code=202)
+        async def use_export_sensors(
+            file_format: Literal["ndjson", "csv", "parquet"] = "ndjson"
+        ):
+            # Answers 202 with the export task, its PROGRESS meta counts the rows
+            # written and its result names the file to download. Formats this
+            # server can't write (parquet without pyarrow) get a 422.
+            try:
+                export = await start_sensor_export(file_format)
+            except ValueError as e:
+                raise HTTPException(status_code=422, detail=str(e))
+            return trusted_response(_async_result_adapter, export, status_code=202)
+
+    if get_sensor_export is not None:
+
+        @app.get("/sensor_exports/{file_name}", response_class=FileResponse)
+        async def use_download_sensor_export(file_name: str):
+            # FileResponse hands the path to servers supporting the ASGI pathsend
+            # extension (sendfile), others get it in chunks read off the loop
+            path = await get_sensor_export(file_name)
+            if path is None:
+                raise HTTPException(status_code=404, detail="Export not found")
+            return FileResponse(
+                path, media_type=export_media_type(file_name), filename=file_name
+            )
 
     return app
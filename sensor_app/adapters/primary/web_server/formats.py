@@ -0,0 +1,266 @@
+import csv
+import io
+import tempfile
+from datetime import datetime
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+from pydantic import TypeAdapter
+from sensor_app.core.domain.entities import Sensor
+
+try:
+    import pyarrow  # type: ignore
+except ImportError:  # pragma: no cover
+    pyarrow = None
+
+JSON_MEDIA_TYPE = "application/json"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+COLUMNS_JSON_MEDIA_TYPE = "application/vnd.sensor-app.columns+json"
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+CSV_MEDIA_TYPE = "text/csv"
+GZIP_MEDIA_TYPE = "application/gzip"
+PARQUET_MEDIA_TYPE = "application/vnd.apache.parquet"
+
+# Content types of bulk import bodies, by the file format they carry
+IMPORT_MEDIA_TYPES = {CSV_MEDIA_TYPE: "csv", PARQUET_MEDIA_TYPE: "parquet"}
+
+SENSOR_COLUMNS = tuple(Sensor.model_fields)
+
+# Column files larger than this spill from memory to disk
+_SPOOL_MAX_BYTES = 8 * 1024 * 1024
+_SPOOL_READ_BYTES = 64 * 1024
+
+_column_adapter = TypeAdapter(List[Any])
+
+
+def sensor_media_types() -> List[str]:
+    # In server preference order, Arrow only when pyarrow is installed
+    media_types = [
+        JSON_MEDIA_TYPE,
+        NDJSON_MEDIA_TYPE,
+        COLUMNS_JSON_MEDIA_TYPE,
+        CSV_MEDIA_TYPE,
+    ]
+    if pyarrow is not None:
+        media_types.append(ARROW_STREAM_MEDIA_TYPE)
+    return media_types
+
+
+def import_file_format(content_type: Optional[str]) -> Optional[str]:
+    # From the Content-Type of an import body (parameters such as charset are
+    # ignored), None when it isn't one of IMPORT_MEDIA_TYPES
+    if not content_type:
+        return None
+    return IMPORT_MEDIA_TYPES.get(content_type.split(";", 1)[0].strip().lower())
+
+
+def export_media_type(file_name: str) -> str:
+    # Exports are downloaded as the files they are, gzip NDJSON/CSV stay compressed
+    if file_name.endswith(".parquet"):
+        return PARQUET_MEDIA_TYPE
+    if file_name.endswith(".gz"):
+        return GZIP_MEDIA_TYPE
+    return "application/octet-stream"
+
+
+def _accepted_ranges(accept: str) -> List[Tuple[str, float]]:
+    ranges = []
+    for media_range in accept.split(","):
+        media_type, *parameters = [part.strip() for part in media_range.split(";")]
+        quality = 1.0
+        for parameter in parameters:
+            key, _, value = parameter.partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        ranges.append((media_type.lower(), quality))
+    return ranges
+
+
+def _quality(media_type: str, ranges: List[Tuple[str, float]]) -> float:
+    # The most specific matching range sets the quality (type/subtype > type/* > */*)
+    main_type = media_type.partition("/")[0]
+    quality, specificity = 0.0, -1
+    for media_range, range_quality in ranges:
+        if media_range == media_type:
+            range_specificity = 2
+        elif media_range == f"{main_type}/*":
+            range_specificity = 1
+        elif media_range == "*/*":
+            range_specificity = 0
+        else:
+            continue
+        if range_specificity > specificity:
+            quality, specificity = range_quality, range_specificity
+    return quality
+
+
+def negotiate(accept: Optional[str], offered: Sequence[str]) -> Optional[str]:
+    # The offered type with the highest quality, the earlier one on ties. None when
+    # the client accepts none of them (406).
+    if not accept or not accept.strip():
+        return offered[0]
+    ranges = _accepted_ranges(accept)
+    best, best_quality = None, 0.0
+    for media_type in offered:
+        quality = _quality(media_type, ranges)
+        if quality > best_quality:
+            best, best_quality = media_type, quality
+    return best
+
+
+async def iterate(sensors: List[Sensor]) -> AsyncIterator[Sensor]:
+    for sensor in sensors:
+        yield sensor
+
+
+async def _batches(
+    sensors: AsyncIterator[Sensor], batch_size: int
+) -> AsyncIterator[List[Sensor]]:
+    batch: List[Sensor] = []
+    async for sensor in sensors:
+        batch.append(sensor)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _column(batch: List[Sensor], name: str) -> List[Any]:
+    return [getattr(sensor, name) for sensor in batch]
+
+
+async def ndjson_chunks(
+    sensors: AsyncIterator[Sensor], batch_size: int = 500
+) -> AsyncIterator[bytes]:
+    # Group rows so each ASGI send carries a few hundred lines instead of one
+    async for batch in _batches(sensors, batch_size):
+        yield b"\n".join(sensor.model_dump_json().encode() for sensor in batch) + b"\n"
+
+
+async def columns_json_chunks(
+    sensors: AsyncIterator[Sensor], batch_size: int = 1000
+) -> AsyncIterator[bytes]:
+    # {"id": [...], "name": [...], ...} in one pass over the cursor: the first column
+    # goes straight out, the others are spooled (to disk past _SPOOL_MAX_BYTES) and
+    # sent after it, so memory stays flat however many rows there are.
+    first, *others = SENSOR_COLUMNS
+    spools = {
+        name: tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX_BYTES)
+        for name in others
+    }
+    try:
+        separator = b""
+        yield b'{"' + first.encode() + b'":['
+        async for batch in _batches(sensors, batch_size):
+            # dump_json of the column list, minus the brackets
+            yield separator + _column_adapter.dump_json(_column(batch, first))[1:-1]
+            for name, spool in spools.items():
+                spool.write(
+                    separator + _column_adapter.dump_json(_column(batch, name))[1:-1]
+                )
+            separator = b","
+        for name, spool in spools.items():
+            yield b'],"' + name.encode() + b'":['
+            spool.seek(0)
+            while chunk := spool.read(_SPOOL_READ_BYTES):
+                yield chunk
+        yield b"]}"
+    finally:
+        for spool in spools.values():
+            spool.close()
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+async def csv_chunks(
+    sensors: AsyncIterator[Sensor], batch_size: int = 1000
+) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(SENSOR_COLUMNS)
+    async for batch in _batches(sensors, batch_size):
+        writer.writerows(
+            [_csv_value(getattr(sensor, name)) for name in SENSOR_COLUMNS]
+            for sensor in batch
+        )
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        # Header only, no rows
+        yield buffer.getvalue().encode()
+
+
+def _arrow_schema(id_type: Any) -> Any:
+    return pyarrow.schema(
+        [
+            ("id", id_type),
+            ("name", pyarrow.string()),
+            ("value", pyarrow.float64()),
+            ("version", pyarrow.int64()),
+            ("updated_at", pyarrow.timestamp("us", tz="UTC")),
+        ]
+    )
+
+
+async def arrow_stream_chunks(
+    sensors: AsyncIterator[Sensor], batch_size: int = 1000
+) -> AsyncIterator[bytes]:
+    # Arrow IPC streaming format, one record batch per cursor batch. Ids are int64,
+    # or strings for adapters with string ids (MongoDB), decided on the first batch.
+    sink = io.BytesIO()
+    writer = None
+    try:
+        async for batch in _batches(sensors, batch_size):
+            if writer is None:
+                id_type = (
+                    pyarrow.int64()
+                    if all(isinstance(sensor.id, int) for sensor in batch)
+                    else pyarrow.string()
+                )
+                writer = pyarrow.ipc.new_stream(sink, _arrow_schema(id_type))
+            ids = _column(batch, "id")
+            if writer.schema.field("id").type == pyarrow.string():
+                ids = [str(sensor_id) for sensor_id in ids]
+            writer.write_batch(
+                pyarrow.record_batch(
+                    [ids] + [_column(batch, name) for name in SENSOR_COLUMNS[1:]],
+                    schema=writer.schema,
+                )
+            )
+            yield sink.getvalue()
+            sink.seek(0)
+            sink.truncate()
+        if writer is None:
+            writer = pyarrow.ipc.new_stream(sink, _arrow_schema(pyarrow.int64()))
+        writer.close()
+        writer = None
+        yield sink.getvalue()
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+SENSOR_ENCODERS: Dict[
+    str, Callable[[AsyncIterator[Sensor], int], AsyncIterator[bytes]]
+] = {
+    NDJSON_MEDIA_TYPE: ndjson_chunks,
+    COLUMNS_JSON_MEDIA_TYPE: columns_json_chunks,
+    CSV_MEDIA_TYPE: csv_chunks,
+    ARROW_STREAM_MEDIA_TYPE: arrow_stream_chunks,
+}
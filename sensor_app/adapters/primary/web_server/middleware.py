@@ -0,0 +1,216 @@
+import time
+import zlib
+from typing import List, Optional, Tuple, Union
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from sensor_app.adapters.metrics import HTTP_REQUEST_DURATION
+
+try:
+    import brotli  # type: ignore
+except ImportError:  # pragma: no cover
+    brotli = None
+
+
+class MetricsMiddleware:
+    # Plain ASGI middleware (not BaseHTTPMiddleware) so streamed bodies are timed
+    # until the last chunk is sent. Requests are labelled by route template, e.g.
+    # /sensor/{id}, to keep label cardinality bounded.
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.labels(
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=str(status_code),
+            ).observe(time.perf_counter() - start)
+
+
+class _GzipCompressor:
+    def __init__(self, level: int):
+        # wbits 31: zlib stream with a gzip header and trailer
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _BrotliCompressor:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+_Compressor = Union[_GzipCompressor, _BrotliCompressor]
+
+
+def _compress_chunk(compressor: _Compressor, body: bytes, more_body: bool) -> bytes:
+    # Flushed after every chunk but the last, which ends the stream
+    data = compressor.compress(body)
+    return data + (compressor.flush() if more_body else compressor.finish())
+
+
+# Sent as is: compressing them again costs CPU for nothing, and event streams must
+# reach the client event by event
+_UNCOMPRESSED_CONTENT_TYPES = (
+    "text/event-stream",
+    "application/gzip",
+    "application/vnd.apache.parquet",
+)
+
+
+def _accepted_encodings(accept_encoding: str) -> List[Tuple[str, float]]:
+    encodings = []
+    for coding in accept_encoding.split(","):
+        name, _, parameters = coding.partition(";")
+        quality = 1.0
+        key, _, value = parameters.partition("=")
+        if key.strip() == "q":
+            try:
+                quality = float(value)
+            except ValueError:
+                quality = 0.0
+        encodings.append((name.strip().lower(), quality))
+    return encodings
+
+
+class CompressionMiddleware:
+    # Plain ASGI middleware compressing response bodies with brotli (when installed)
+    # or gzip, as negotiated with Accept-Encoding. Complete bodies under
+    # minimum_size are sent as is. Streamed bodies are compressed chunk by chunk,
+    # each flushed so clients decode rows as they arrive. Event streams and
+    # already compressed files are never compressed, and neither are files sent
+    # with the pathsend extension (zero-copy, there is no body to compress).
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1000,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def choose_encoding(self, accept_encoding: str) -> Optional[str]:
+        offered = ["br", "gzip"] if brotli is not None else ["gzip"]
+        best, best_quality = None, 0.0
+        encodings = _accepted_encodings(accept_encoding)
+        for encoding in offered:
+            quality = next(
+                (q for name, q in encodings if name == encoding),
+                next((q for name, q in encodings if name == "*"), 0.0),
+            )
+            if quality > best_quality:
+                best, best_quality = encoding, quality
+        return best
+
+    def _compressor(self, encoding: str) -> _Compressor:
+        if encoding == "br":
+            return _BrotliCompressor(self.brotli_quality)
+        return _GzipCompressor(self.gzip_level)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = self.choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        compressor: Optional[_Compressor] = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message, compressor, passthrough
+            if message["type"] == "http.response.start":
+                # Held until the first body chunk tells whether to compress
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                if start_message is not None:
+                    # e.g. http.response.pathsend, the body never goes through us
+                    passthrough = True
+                    start, start_message = start_message, None
+                    await send(start)
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if start_message is not None:
+                start, start_message = start_message, None
+                headers = MutableHeaders(raw=start["headers"])
+                if (
+                    "content-encoding" in headers
+                    or start["status"] in (204, 304)
+                    or headers.get("content-type", "").startswith(
+                        _UNCOMPRESSED_CONTENT_TYPES
+                    )
+                ):
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+                headers.add_vary_header("Accept-Encoding")
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+                compressor = self._compressor(encoding)
+                headers["Content-Encoding"] = encoding
+                del headers["Content-Length"]
+                data = _compress_chunk(compressor, body, more_body)
+                if not more_body:
+                    headers["Content-Length"] = str(len(data))
+                await send(start)
+                await send(
+                    {"type": "http.response.body", "body": data, "more_body": more_body}
+                )
+                return
+
+            if compressor is None:
+                # A body before any response start, not ours to fix
+                await send(message)
+                return
+            data = _compress_chunk(compressor, body, more_body)
+            await send(
+                {"type": "http.response.body", "body": data, "more_body": more_body}
+            )
+
+        await self.app(scope, receive, send_compressed)
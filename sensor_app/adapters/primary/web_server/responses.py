@@ -0,0 +1,100 @@
+import hashlib
+from datetime import datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Iterable, Mapping, Optional, Type
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+from pydantic import TypeAdapter
+from sensor_app.core.domain.entities import Sensor
+
+DefaultJSONResponse: Type[JSONResponse]
+
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse
+
+    # orjson is optional, it encodes the plain dicts/lists FastAPI hands over
+    # several times faster than the stdlib encoder
+    DefaultJSONResponse = ORJSONResponse
+except ImportError:  # pragma: no cover
+    DefaultJSONResponse = JSONResponse
+
+
+def trusted_response(
+    adapter: TypeAdapter,
+    content: Any,
+    status_code: int = 200,
+    headers: Optional[Mapping[str, str]] = None,
+) -> Response:
+    # For domain objects the use cases already built: pydantic-core serializes them
+    # straight to JSON bytes, skipping FastAPI's response_model re-validation and
+    # jsonable_encoder pass. Keep response_model on the route for the OpenAPI schema.
+    return Response(
+        content=adapter.dump_json(content),
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json",
+    )
+
+
+def sensor_etag(sensor: Sensor) -> str:
+    # Weak: equal versions mean the same sensor, not byte identical bodies
+    return f'W/"{sensor.id}-{sensor.version}"'
+
+
+def sensors_etag(sensors: Iterable[Sensor], media_type: str = "") -> str:
+    # Ids and versions identify a page, no need to serialize it to hash it. Each
+    # representation (media type) of the page gets its own tag.
+    digest = hashlib.blake2b(media_type.encode(), digest_size=16)
+    for sensor in sensors:
+        digest.update(f"{sensor.id}:{sensor.version},".encode())
+    return f'W/"{digest.hexdigest()}"'
+
+
+def http_date(value: datetime) -> str:
+    return format_datetime(value, usegmt=True)
+
+
+def caching_headers(
+    etag: str, last_modified: Optional[datetime], cache_control: str
+) -> Dict[str, str]:
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def _opaque_tag(etag: str) -> str:
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def is_not_modified(
+    request: Request, etag: str, last_modified: Optional[datetime]
+) -> bool:
+    # RFC 9110 conditional GET: If-None-Match uses weak comparison and, when
+    # present, If-Modified-Since is ignored
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        tag = _opaque_tag(etag)
+        return any(
+            _opaque_tag(candidate.strip()) == tag
+            for candidate in if_none_match.split(",")
+        )
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        return False
+    # HTTP dates have a one second resolution
+    return last_modified.replace(microsecond=0) <= since
+
+
+def not_modified_response(headers: Mapping[str, str]) -> Response:
+    return Response(status_code=304, headers=dict(headers))
@@ -1,7 +1,15 @@
 from sensor_app.adapters.secondary.background_jobs_celery.background_jobs_repo import (
     CeleryBackgroundJobRepo,
 )
+from sensor_app.adapters.secondary.background_jobs_celery.async_background_jobs_repo import (
+    AsyncCeleryBackgroundJobRepo,
+)
+from sensor_app.adapters.secondary.background_jobs_celery.task_events import (
+    CeleryTaskEventHub,
+)
 
 __all__ = [
+    "AsyncCeleryBackgroundJobRepo",
     "CeleryBackgroundJobRepo",
+    "CeleryTaskEventHub",
 ]
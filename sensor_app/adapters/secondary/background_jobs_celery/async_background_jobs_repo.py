@@ -0,0 +1,148 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncGenerator, Callable, Dict, List, Optional, Sequence, TypeVar
+from celery import states
+from sensor_app.adapters.secondary.background_jobs_celery.task_events import (
+    CeleryTaskEventHub,
+)
+from sensor_app.core.domain.results import AsyncResult
+from sensor_app.core.ports.secondary import (
+    AsyncBackgroundJobsRepository,
+    BackgroundJobsRepository,
+)
+
+T = TypeVar("T")
+
+
+class AsyncCeleryBackgroundJobRepo(AsyncBackgroundJobsRepository):
+    # Runs the blocking Celery client calls (apply_async, backend lookups) on a
+    # bounded thread pool. A slow broker then only delays the requests waiting on
+    # it, and at most max_workers calls are in flight per process.
+    #
+    # watch_task_results is fed by the task event hub when one is given, otherwise
+    # it polls the result backend every poll_interval_seconds on the clients' behalf.
+    def __init__(
+        self,
+        background_jobs_repo: BackgroundJobsRepository,
+        max_workers: int = 8,
+        task_event_hub: Optional[CeleryTaskEventHub] = None,
+        poll_interval_seconds: float = 1.0,
+    ):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.background_jobs_repo = background_jobs_repo
+        self.max_workers = max_workers
+        self.task_event_hub = task_event_hub
+        self.poll_interval_seconds = poll_interval_seconds
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="celery-client"
+            )
+        return self._executor
+
+    async def _run(self, call: Callable[..., T], *args, **kwargs) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_executor(), functools.partial(call, *args, **kwargs)
+        )
+
+    async def connect(self) -> None:
+        self._get_executor()
+
+    async def disconnect(self) -> None:
+        if self.task_event_hub is not None:
+            self.task_event_hub.stop()
+        if self._executor is not None:
+            executor, self._executor = self._executor, None
+            # Let in-flight publishes finish without blocking the loop
+            await asyncio.to_thread(executor.shutdown, wait=True)
+
+    async def send_task(self, task_name: str, *args, **kwargs) -> AsyncResult:
+        return await self._run(
+            self.background_jobs_repo.send_task, task_name, *args, **kwargs
+        )
+
+    async def send_task_group(
+        self, task_name: str, kwargs_list: List[dict]
+    ) -> AsyncResult:
+        return await self._run(
+            self.background_jobs_repo.send_task_group, task_name, kwargs_list
+        )
+
+    async def retry_task(self, task_id: str) -> AsyncResult:
+        return await self._run(self.background_jobs_repo.retry_task, task_id)
+
+    async def get_task_results(self, task_id: str) -> AsyncResult:
+        return await self._run(self.background_jobs_repo.get_task_results, task_id)
+
+    async def get_task_results_many(self, task_ids: Sequence[str]) -> List[AsyncResult]:
+        return await self._run(
+            self.background_jobs_repo.get_task_results_many, task_ids
+        )
+
+    async def get_task_group_results(self, group_id: str) -> AsyncResult:
+        return await self._run(
+            self.background_jobs_repo.get_task_group_results, group_id
+        )
+
+    async def watch_task_results(
+        self, task_ids: Sequence[str]
+    ) -> AsyncGenerator[AsyncResult, None]:
+        task_ids = list(dict.fromkeys(task_ids))
+        if self.task_event_hub is None:
+            async for result in self._poll_task_results(task_ids):
+                yield result
+            return
+
+        # Subscribe before reading the current state so no transition is missed
+        queue = self.task_event_hub.subscribe(task_ids)
+        try:
+            pending = set(task_ids)
+            for result in await self.get_task_results_many(task_ids):
+                yield result
+                if result.status in states.READY_STATES and result.id is not None:
+                    pending.discard(result.id)
+
+            while pending:
+                state, event = await queue.get()
+                task_id = event["uuid"]
+                if task_id not in pending:
+                    continue
+                if state in states.READY_STATES:
+                    # Events only carry a repr of the result, fetch the real one
+                    pending.discard(task_id)
+                    yield await self.get_task_results(task_id)
+                else:
+                    yield AsyncResult(
+                        id=task_id, name=event.get("name"), status=state, result=None
+                    )
+        finally:
+            self.task_event_hub.unsubscribe(queue)
+
+    async def _poll_task_results(
+        self, task_ids: List[str]
+    ) -> AsyncGenerator[AsyncResult, None]:
+        # Tasks not seen yet count as PENDING
+        last_states: Dict[Optional[str], str] = {}
+        while True:
+            for result in await self.get_task_results_many(
+                [
+                    task_id
+                    for task_id in task_ids
+                    if last_states.get(task_id, states.PENDING)
+                    not in states.READY_STATES
+                ]
+            ):
+                if last_states.get(result.id) != result.status:
+                    last_states[result.id] = result.status
+                    yield result
+            if all(
+                last_states.get(task_id, states.PENDING) in states.READY_STATES
+                for task_id in task_ids
+            ):
+                return
+            await asyncio.sleep(self.poll_interval_seconds)
@@ -2,8 +2,17 @@ from sensor_app.core.ports.secondary import BackgroundJobsRepository
 from sensor_app.settings import BackgroundJobsSettings
 from sensor_app.core.domain.results import AsyncResult
 import celery.result as cr
-from celery import Celery
-from sensor_app.adapters.primary.background_job_server.celery_app import _celery_app
+from celery import Celery, chord, group, states
+from celery.backends.base import KeyValueStoreBackend  # type: ignore[attr-defined]
+from celery.backends.database import (  # type: ignore[import-untyped]
+    DatabaseBackend,
+    session_cleanup,
+)
+from typing import Any, Dict, List, Sequence, cast
+from sensor_app.adapters.primary.background_job_server.celery_app import (
+    _celery_app,
+    COLLECT_CHUNK_RESULTS_TASK,
+)
 
 
 class CeleryBackgroundJobRepo(BackgroundJobsRepository):
@@ -16,6 +25,12 @@ class CeleryBackgroundJobRepo(BackgroundJobsRepository):
             )
         self.celery_app = background_worker
 
+    @property
+    def backend(self) -> Any:
+        # Celery's stubs type it as the Backend base class, without the methods
+        # every result backend implements (get_task_meta, exception_to_python...)
+        return self.celery_app.backend
+
     def send_task(self, task_name: str, *args, **kwargs) -> AsyncResult:
         task = self.celery_app.tasks[task_name]
 
@@ -31,10 +46,19 @@ class CeleryBackgroundJobRepo(BackgroundJobsRepository):
             date_done=results.date_done,
         )
 
-    def retry_task(self, task_id: str) -> AsyncResult:
-        meta = self.celery_app.backend.get_task_meta(task_id)
-        task = self.celery_app.tasks[meta["name"]]
-        results = task.apply_async(args=meta["args"], kwargs=meta["kwargs"])
+    def send_task_group(self, task_name: str, kwargs_list: List[dict]) -> AsyncResult:
+        task = self.celery_app.tasks[task_name]
+        collect = self.celery_app.tasks[COLLECT_CHUNK_RESULTS_TASK]
+
+        # The chunks run in parallel across workers, the chord callback merges
+        # them so the whole job is tracked through a single task id
+        header = group(task.s(**kwargs) for kwargs in kwargs_list)
+        results = chord(header)(collect.s())
+        # A GroupResult, which Celery's stubs leave nearly empty
+        group_results: Any = results.parent
+        if group_results is not None:
+            # Persist the group so chunk progress can be looked up by group id
+            group_results.save()
         return AsyncResult(
             id=results.id,
             name=results.name,
@@ -44,11 +68,13 @@ class CeleryBackgroundJobRepo(BackgroundJobsRepository):
             args=results.args,
             kwargs=results.kwargs,
             date_done=results.date_done,
+            group_id=group_results.id if group_results is not None else None,
         )
 
-    def get_task_results(self, task_id: str) -> AsyncResult:
-        meta = self.celery_app.backend.get_task_meta(task_id)
-        results = cr.AsyncResult(task_id, app=self.celery_app)
+    def retry_task(self, task_id: str) -> AsyncResult:
+        meta = self.backend.get_task_meta(task_id)
+        task = self.celery_app.tasks[meta["name"]]
+        results = task.apply_async(args=meta["args"], kwargs=meta["kwargs"])
         return AsyncResult(
             id=results.id,
             name=results.name,
@@ -59,3 +85,106 @@ class CeleryBackgroundJobRepo(BackgroundJobsRepository):
             kwargs=results.kwargs,
             date_done=results.date_done,
         )
+
+    def _result_from_meta(self, task_id: str, meta: dict) -> AsyncResult:
+        # Built from the meta already fetched, going through cr.AsyncResult would
+        # read it from the backend a second time
+        result = meta.get("result")
+        if meta["status"] in states.EXCEPTION_STATES:
+            result = self.backend.exception_to_python(result)
+        return AsyncResult(
+            id=task_id,
+            name=meta.get("name"),
+            status=meta["status"],
+            result=result,
+            traceback=meta.get("traceback"),
+            args=meta.get("args"),
+            kwargs=meta.get("kwargs"),
+            date_done=meta.get("date_done"),
+        )
+
+    def get_task_results(self, task_id: str) -> AsyncResult:
+        meta = self.backend.get_task_meta(task_id)
+        return self._result_from_meta(task_id, meta)
+
+    def get_task_results_many(self, task_ids: Sequence[str]) -> List[AsyncResult]:
+        unique_task_ids = list(dict.fromkeys(task_ids))
+        backend = self.backend
+        if isinstance(backend, KeyValueStoreBackend):
+            metas = self._get_key_value_metas(backend, unique_task_ids)
+        elif isinstance(backend, DatabaseBackend):
+            metas = self._get_database_metas(backend, unique_task_ids)
+        else:
+            metas = {
+                task_id: backend.get_task_meta(task_id) for task_id in unique_task_ids
+            }
+        return [self._result_from_meta(task_id, metas[task_id]) for task_id in task_ids]
+
+    def _get_key_value_metas(
+        self, backend: KeyValueStoreBackend, task_ids: List[str]
+    ) -> Dict[str, dict]:
+        # One MGET (get_multi for memcached) instead of a round trip per task
+        keys = [backend.get_key_for_task(task_id) for task_id in task_ids]
+        values = backend.mget(keys) if keys else []
+        if isinstance(values, dict):
+            values = [values.get(key) for key in keys]
+
+        metas = {}
+        for task_id, value in zip(task_ids, values):
+            metas[task_id] = (
+                backend.decode_result(value)
+                if value
+                else {"status": states.PENDING, "result": None}
+            )
+        return metas
+
+    def _get_database_metas(
+        self, backend: DatabaseBackend, task_ids: List[str]
+    ) -> Dict[str, dict]:
+        # One SELECT ... WHERE task_id IN (...), decoded like DatabaseBackend does
+        metas = {
+            task_id: {"status": states.PENDING, "result": None} for task_id in task_ids
+        }
+        if not task_ids:
+            return metas
+        session = backend.ResultSession()
+        with session_cleanup(session):
+            tasks = session.query(backend.task_cls).filter(
+                backend.task_cls.task_id.in_(task_ids)
+            )
+            for task in tasks:
+                data = task.to_dict()
+                if data.get("args") is not None:
+                    data["args"] = backend.decode(data["args"])
+                if data.get("kwargs") is not None:
+                    data["kwargs"] = backend.decode(data["kwargs"])
+                metas[task.task_id] = backend.meta_from_decoded(data)
+        return metas
+
+    def get_task_group_results(self, group_id: str) -> AsyncResult:
+        # Typed loosely, Celery's stubs leave GroupResult (restore included) nearly
+        # empty
+        group_results: Any = cast(Any, cr.GroupResult).restore(
+            group_id, app=self.celery_app
+        )
+        if group_results is None:
+            raise ValueError(f"Task group {group_id} not found")
+
+        total = len(group_results)
+        completed = group_results.completed_count()
+        if group_results.failed():
+            status = "FAILURE"
+        elif completed == total:
+            status = "SUCCESS"
+        elif completed > 0 or any(
+            result.state == "STARTED" for result in group_results
+        ):
+            status = "PROGRESS"
+        else:
+            status = "PENDING"
+        return AsyncResult(
+            id=group_id,
+            status=status,
+            result={"completed": completed, "total": total},
+            group_id=group_id,
+        )
@@ -0,0 +1,100 @@
+import asyncio
+import logging
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from celery import Celery
+from celery.events.state import TASK_EVENT_TO_STATE  # type: ignore
+
+logger = logging.getLogger()
+
+# (state, event) pairs handed to subscribers, e.g. ("STARTED", {...})
+TaskEvent = Tuple[str, dict]
+
+
+class CeleryTaskEventHub:
+    # One Celery event receiver per process, on a daemon thread, fanning task
+    # events out to the asyncio queues of the subscribers watching those task ids.
+    # Needs workers started with task events on (worker_send_task_events / -E).
+    RECONNECT_SECONDS = 5.0
+
+    def __init__(self, celery_app: Celery):
+        self.celery_app = celery_app
+        self._subscribers: Dict[
+            str, Set[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]
+        ] = defaultdict(set)
+        self._subscriptions: Dict[asyncio.Queue, List[str]] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._receiver: Any = None
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="celery-task-events", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._receiver is not None:
+            # Checked by the receiver between drain_events calls (every second)
+            self._receiver.should_stop = True
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                with self.celery_app.connection_for_read() as connection:
+                    self._receiver = self.celery_app.events.Receiver(  # type: ignore
+                        connection, handlers={"*": self._on_event}
+                    )
+                    self._receiver.capture(limit=None, timeout=None, wakeup=False)
+            except Exception as e:
+                logger.warning(f"Celery task event receiver failed: {e}")
+                self._stopped.wait(self.RECONNECT_SECONDS)
+            finally:
+                self._receiver = None
+
+    def _on_event(self, event: dict) -> None:
+        event_type = event.get("type", "")
+        if not event_type.startswith("task-"):
+            return
+        state = TASK_EVENT_TO_STATE.get(event_type[len("task-") :])
+        task_id = event.get("uuid")
+        if state is None or task_id is None:
+            return
+        with self._lock:
+            subscribers = list(self._subscribers.get(task_id, ()))
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, (state, event))
+            except RuntimeError:
+                # The subscriber's loop is closed, it will never unsubscribe
+                self.unsubscribe(queue)
+
+    def subscribe(self, task_ids: Iterable[str]) -> asyncio.Queue:
+        self.start()
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        task_ids = list(task_ids)
+        with self._lock:
+            self._subscriptions[queue] = task_ids
+            for task_id in task_ids:
+                self._subscribers[task_id].add((loop, queue))
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        with self._lock:
+            for task_id in self._subscriptions.pop(queue, ()):
+                subscribers = self._subscribers.get(task_id)
+                if subscribers is None:
+                    continue
+                subscribers.difference_update(
+                    [subscriber for subscriber in subscribers if subscriber[1] is queue]
+                )
+                if not subscribers:
+                    del self._subscribers[task_id]
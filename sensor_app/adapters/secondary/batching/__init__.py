@@ -0,0 +1,7 @@
+from sensor_app.adapters.secondary.batching.sensor_repo import (
+    BatchingSensorRepository,
+)
+
+__all__ = [
+    "BatchingSensorRepository",
+]
@@ -0,0 +1,175 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import (
+    AsyncGenerator,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+from sensor_app.core.domain.entities import (
+    ReadingAggregate,
+    Sensor,
+    SensorChange,
+    SensorReading,
+)
+from sensor_app.core.domain.errors import InvalidSensorId
+from sensor_app.core.ports.secondary import SensorRepository
+
+logger = logging.getLogger()
+
+
+class BatchingSensorRepository(SensorRepository):
+    # DataLoader style batching for get_sensor: calls made within the same event
+    # loop tick (or within window_microseconds) are answered by one get_sensors
+    # query, and concurrent calls for the same id share a single future.
+    def __init__(
+        self,
+        sensor_repo: SensorRepository,
+        window_microseconds: int = 0,
+        max_batch_size: int = 500,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.sensor_repo = sensor_repo
+        self.window_microseconds = window_microseconds
+        self.max_batch_size = max_batch_size
+        self._pending: Dict[str, Tuple[Union[int, str], asyncio.Future]] = {}
+        self._flush_handle: Optional[asyncio.Handle] = None
+        self._loading: Set[asyncio.Task] = set()
+
+    async def connect(self) -> None:
+        await self.sensor_repo.connect()
+
+    async def disconnect(self) -> None:
+        await self.sensor_repo.disconnect()
+
+    def _schedule_flush(self, loop: asyncio.AbstractEventLoop) -> None:
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            if self.window_microseconds > 0:
+                self._flush_handle = loop.call_later(
+                    self.window_microseconds / 1_000_000, self._flush
+                )
+            else:
+                self._flush_handle = loop.call_soon(self._flush)
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, {}
+        task = asyncio.ensure_future(self._load(batch))
+        # Keep a reference so the task is not garbage collected mid-flight
+        self._loading.add(task)
+        task.add_done_callback(self._loading.discard)
+
+    async def _load(self, batch: Dict[str, Tuple[Union[int, str], asyncio.Future]]):
+        try:
+            sensors = await self.sensor_repo.get_sensors(
+                sensor_id for sensor_id, _ in batch.values()
+            )
+        except InvalidSensorId:
+            # A malformed id fails the whole query, load the ids one by one so
+            # only the caller that sent it gets the error
+            await asyncio.gather(
+                *[
+                    self._load_one(sensor_id, future)
+                    for sensor_id, future in batch.values()
+                ]
+            )
+            return
+        except Exception as e:
+            logger.warning(f"Batched get_sensors for {len(batch)} ids failed: {e}")
+            for _, future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        sensors_by_key = {str(sensor.id): sensor for sensor in sensors}
+        for key, (_, future) in batch.items():
+            if not future.done():
+                future.set_result(sensors_by_key.get(key))
+
+    async def _load_one(
+        self, sensor_id: Union[int, str], future: asyncio.Future
+    ) -> None:
+        try:
+            sensors = await self.sensor_repo.get_sensors([sensor_id])
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+            return
+        if not future.done():
+            future.set_result(sensors[0] if sensors else None)
+
+    async def get_sensor(self, sensor_id: int) -> Optional[Sensor]:
+        key = str(sensor_id)
+        pending = self._pending.get(key)
+        if pending is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending[key] = (sensor_id, future)
+            self._schedule_flush(loop)
+        else:
+            future = pending[1]
+
+        # Shield so one cancelled caller doesn't cancel the lookup for the others
+        sensor = await asyncio.shield(future)
+        # Callers sharing the future each get their own copy to mutate
+        return sensor.model_copy() if sensor is not None else None
+
+    async def get_sensors(self, sensor_ids: Iterable[Union[int, str]]) -> List[Sensor]:
+        return await self.sensor_repo.get_sensors(sensor_ids)
+
+    async def count_sensors(self) -> int:
+        return await self.sensor_repo.count_sensors()
+
+    async def create_sensor(self, sensor: Sensor) -> Sensor:
+        return await self.sensor_repo.create_sensor(sensor)
+
+    async def create_sensors(self, sensors: Iterable[Sensor]) -> List[Sensor]:
+        return await self.sensor_repo.create_sensors(sensors)
+
+    async def load_sensors(self, names: Sequence[str], values: Sequence[float]) -> int:
+        return await self.sensor_repo.load_sensors(names, values)
+
+    async def update_sensor(self, sensor: Sensor) -> Sensor:
+        return await self.sensor_repo.update_sensor(sensor)
+
+    async def delete_sensor(self, sensor_id: int) -> None:
+        await self.sensor_repo.delete_sensor(sensor_id)
+
+    async def list_sensors(
+        self, after_id: Optional[Union[int, str]] = None, limit: Optional[int] = None
+    ) -> List[Sensor]:
+        return await self.sensor_repo.list_sensors(after_id=after_id, limit=limit)
+
+    def stream_sensors(self, batch_size: int = 1000) -> AsyncGenerator[Sensor, None]:
+        return self.sensor_repo.stream_sensors(batch_size=batch_size)
+
+    def watch_sensors(self) -> AsyncGenerator[SensorChange, None]:
+        return self.sensor_repo.watch_sensors()
+
+    async def append_readings(self, readings: Iterable[SensorReading]) -> int:
+        return await self.sensor_repo.append_readings(readings)
+
+    async def aggregate_readings(
+        self,
+        sensor_id: Union[int, str],
+        start: datetime,
+        end: datetime,
+        bucket: str,
+        percentiles: Sequence[float] = (),
+    ) -> List[ReadingAggregate]:
+        return await self.sensor_repo.aggregate_readings(
+            sensor_id, start, end, bucket, percentiles
+        )
@@ -0,0 +1,7 @@
+from sensor_app.adapters.secondary.cache.sensor_repo import (
+    CachingSensorRepository,
+)
+
+__all__ = [
+    "CachingSensorRepository",
+]
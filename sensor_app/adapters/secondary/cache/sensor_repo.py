@@ -0,0 +1,263 @@
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import (
+    Any,
+    AsyncGenerator,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+from sensor_app.core.domain.entities import (
+    ReadingAggregate,
+    Sensor,
+    SensorChange,
+    SensorReading,
+)
+from sensor_app.core.ports.secondary import SensorRepository
+
+logger = logging.getLogger()
+
+_MISSING = object()
+
+
+class LruTtlCache:
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: str) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISSING
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return _MISSING
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class CachingSensorRepository(SensorRepository):
+    # Read-through cache for get_sensor and count_sensors in front of any
+    # SensorRepository. The in-process tier is per worker, the optional Redis tier
+    # is shared, so writes made elsewhere are only seen locally after ttl_seconds.
+    SENSOR_KEY = "sensor:"
+    COUNT_KEY = "sensor_count"
+
+    def __init__(
+        self,
+        sensor_repo: SensorRepository,
+        max_entries: int = 10000,
+        ttl_seconds: float = 5.0,
+        redis_url: Optional[str] = None,
+        redis_ttl_seconds: float = 30.0,
+        key_prefix: str = "sensor_app:",
+    ):
+        self.sensor_repo = sensor_repo
+        self.local_cache = LruTtlCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self.redis_url = redis_url
+        self.redis_ttl_seconds = redis_ttl_seconds
+        self.key_prefix = key_prefix
+        self._redis = self._create_redis_client()
+        self.hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "local_entries": len(self.local_cache),
+        }
+
+    def _create_redis_client(self):
+        if not self.redis_url:
+            return None
+        import redis.asyncio as redis
+
+        return redis.from_url(self.redis_url)
+
+    async def connect(self) -> None:
+        if self._redis is None:
+            self._redis = self._create_redis_client()
+        await self.sensor_repo.connect()
+
+    async def disconnect(self) -> None:
+        if self._redis is not None:
+            client, self._redis = self._redis, None
+            await client.aclose()
+        await self.sensor_repo.disconnect()
+
+    async def _redis_get(self, key: str) -> Optional[bytes]:
+        if self._redis is None:
+            return None
+        try:
+            return await self._redis.get(self.key_prefix + key)
+        except Exception as e:
+            # The cache must never take reads down with it, fall back to the repo
+            logger.warning(f"Redis cache read failed for {key}: {e}")
+            return None
+
+    async def _redis_set(self, key: str, value: str) -> None:
+        if self._redis is None:
+            return
+        try:
+            await self._redis.set(
+                self.key_prefix + key, value, px=int(self.redis_ttl_seconds * 1000)
+            )
+        except Exception as e:
+            logger.warning(f"Redis cache write failed for {key}: {e}")
+
+    async def _invalidate(self, *keys: str) -> None:
+        self.invalidations += len(keys)
+        for key in keys:
+            self.local_cache.delete(key)
+        if self._redis is None:
+            return
+        try:
+            await self._redis.delete(*[self.key_prefix + key for key in keys])
+        except Exception as e:
+            logger.warning(f"Redis cache invalidation failed for {keys}: {e}")
+
+    def _sensor_key(self, sensor_id: Union[int, str, None]) -> str:
+        return f"{self.SENSOR_KEY}{sensor_id}"
+
+    async def count_sensors(self) -> int:
+        cached = self.local_cache.get(self.COUNT_KEY)
+        if cached is not _MISSING:
+            self.hits += 1
+            return cached
+
+        cached_value = await self._redis_get(self.COUNT_KEY)
+        if cached_value is not None:
+            try:
+                count = int(cached_value)
+            except ValueError:
+                # Not written as a plain integer (e.g. by an older release), treat
+                # it as a miss, it is overwritten below
+                logger.warning(f"Ignoring cached {self.COUNT_KEY} {cached_value!r}")
+            else:
+                self.redis_hits += 1
+                self.local_cache.set(self.COUNT_KEY, count)
+                return count
+
+        self.misses += 1
+        # Only ever cache the integer, whatever the repository hands back
+        count = int(await self.sensor_repo.count_sensors())
+        self.local_cache.set(self.COUNT_KEY, count)
+        await self._redis_set(self.COUNT_KEY, str(count))
+        return count
+
+    async def create_sensor(self, sensor: Sensor) -> Sensor:
+        created_sensor = await self.sensor_repo.create_sensor(sensor)
+        # The id may have been cached as missing before it existed
+        await self._invalidate(self.COUNT_KEY, self._sensor_key(created_sensor.id))
+        return created_sensor
+
+    async def create_sensors(self, sensors: Iterable[Sensor]) -> List[Sensor]:
+        created_sensors = await self.sensor_repo.create_sensors(sensors)
+        if created_sensors:
+            await self._invalidate(
+                self.COUNT_KEY,
+                *[self._sensor_key(sensor.id) for sensor in created_sensors],
+            )
+        return created_sensors
+
+    async def load_sensors(self, names: Sequence[str], values: Sequence[float]) -> int:
+        # The new ids aren't known, ids cached as missing before the load answer
+        # 404 until their entries expire
+        try:
+            return await self.sensor_repo.load_sensors(names, values)
+        finally:
+            await self._invalidate(self.COUNT_KEY)
+
+    async def get_sensor(self, sensor_id: int) -> Optional[Sensor]:
+        key = self._sensor_key(sensor_id)
+        cached = self.local_cache.get(key)
+        if cached is not _MISSING:
+            self.hits += 1
+            # Hand out copies, callers are free to mutate the sensors they get
+            return cached.model_copy() if cached is not None else None
+
+        cached_value = await self._redis_get(key)
+        if cached_value is not None:
+            self.redis_hits += 1
+            sensor = (
+                None
+                if cached_value == b"null"
+                else Sensor.model_validate_json(cached_value)
+            )
+            self.local_cache.set(key, sensor)
+            return sensor.model_copy() if sensor is not None else None
+
+        self.misses += 1
+        sensor = await self.sensor_repo.get_sensor(sensor_id)
+        # Missing sensors are cached too so repeated 404s don't reach the database
+        self.local_cache.set(key, sensor.model_copy() if sensor is not None else None)
+        await self._redis_set(
+            key, sensor.model_dump_json() if sensor is not None else "null"
+        )
+        return sensor
+
+    async def get_sensors(self, sensor_ids: Iterable[Union[int, str]]) -> List[Sensor]:
+        return await self.sensor_repo.get_sensors(sensor_ids)
+
+    async def update_sensor(self, sensor: Sensor) -> Sensor:
+        try:
+            return await self.sensor_repo.update_sensor(sensor)
+        finally:
+            await self._invalidate(self._sensor_key(sensor.id))
+
+    async def delete_sensor(self, sensor_id: int) -> None:
+        try:
+            await self.sensor_repo.delete_sensor(sensor_id)
+        finally:
+            await self._invalidate(self.COUNT_KEY, self._sensor_key(sensor_id))
+
+    async def list_sensors(
+        self, after_id: Optional[Union[int, str]] = None, limit: Optional[int] = None
+    ) -> List[Sensor]:
+        return await self.sensor_repo.list_sensors(after_id=after_id, limit=limit)
+
+    def stream_sensors(self, batch_size: int = 1000) -> AsyncGenerator[Sensor, None]:
+        return self.sensor_repo.stream_sensors(batch_size=batch_size)
+
+    def watch_sensors(self) -> AsyncGenerator[SensorChange, None]:
+        return self.sensor_repo.watch_sensors()
+
+    async def append_readings(self, readings: Iterable[SensorReading]) -> int:
+        return await self.sensor_repo.append_readings(readings)
+
+    async def aggregate_readings(
+        self,
+        sensor_id: Union[int, str],
+        start: datetime,
+        end: datetime,
+        bucket: str,
+        percentiles: Sequence[float] = (),
+    ) -> List[ReadingAggregate]:
+        return await self.sensor_repo.aggregate_readings(
+            sensor_id, start, end, bucket, percentiles
+        )
@@ -0,0 +1,7 @@
+from sensor_app.adapters.secondary.counting.sensor_repo import (
+    CountingSensorRepository,
+)
+
+__all__ = [
+    "CountingSensorRepository",
+]
@@ -0,0 +1,139 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import (
+    AsyncGenerator,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Union,
+)
+from sensor_app.core.domain.entities import (
+    ReadingAggregate,
+    Sensor,
+    SensorChange,
+    SensorReading,
+)
+from sensor_app.core.ports.secondary import SensorRepository
+
+logger = logging.getLogger()
+
+
+class CountingSensorRepository(SensorRepository):
+    # Answers count_sensors from a counter kept up to date by the writes made
+    # through this repository, without querying the wrapped repository. A task
+    # started by connect resets the counter from the wrapped repository every
+    # reconcile_seconds. That corrects deletes of ids that didn't exist, a write
+    # racing a reconcile being counted twice, and writes made by other processes.
+    # Each process keeps its own counter, so processes can disagree by the writes
+    # the others made since their last reconcile, never for longer than
+    # reconcile_seconds.
+    def __init__(self, sensor_repo: SensorRepository, reconcile_seconds: float = 60.0):
+        self.sensor_repo = sensor_repo
+        self.reconcile_seconds = reconcile_seconds
+        self._count: Optional[int] = None
+        self._count_lock = asyncio.Lock()
+        self._reconcile_task: Optional[asyncio.Task] = None
+
+    async def connect(self) -> None:
+        await self.sensor_repo.connect()
+        if self._reconcile_task is None:
+            # Counted once before serving, requests never wait for the count
+            await self._reconcile()
+            self._reconcile_task = asyncio.ensure_future(
+                self._reconcile_periodically(self.reconcile_seconds)
+            )
+
+    async def disconnect(self) -> None:
+        if self._reconcile_task is not None:
+            task, self._reconcile_task = self._reconcile_task, None
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await self.sensor_repo.disconnect()
+
+    async def _reconcile(self) -> int:
+        async with self._count_lock:
+            count = await self.sensor_repo.count_sensors()
+            self._count = count
+        return count
+
+    async def _reconcile_periodically(self, interval_seconds: float) -> None:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await self._reconcile()
+            except Exception as e:
+                logger.warning(f"Sensor count reconcile failed: {e}")
+
+    def _adjust(self, delta: int) -> None:
+        if self._count is not None:
+            self._count = max(self._count + delta, 0)
+
+    async def count_sensors(self) -> int:
+        count = self._count
+        if count is None:
+            # Not connected (e.g. a script), counted once on first use
+            async with self._count_lock:
+                count = self._count
+                if count is None:
+                    count = await self.sensor_repo.count_sensors()
+                    self._count = count
+        return count
+
+    async def create_sensor(self, sensor: Sensor) -> Sensor:
+        created_sensor = await self.sensor_repo.create_sensor(sensor)
+        self._adjust(1)
+        return created_sensor
+
+    async def create_sensors(self, sensors: Iterable[Sensor]) -> List[Sensor]:
+        created_sensors = await self.sensor_repo.create_sensors(sensors)
+        self._adjust(len(created_sensors))
+        return created_sensors
+
+    async def load_sensors(self, names: Sequence[str], values: Sequence[float]) -> int:
+        loaded = await self.sensor_repo.load_sensors(names, values)
+        self._adjust(loaded)
+        return loaded
+
+    async def get_sensor(self, sensor_id: int) -> Optional[Sensor]:
+        return await self.sensor_repo.get_sensor(sensor_id)
+
+    async def get_sensors(self, sensor_ids: Iterable[Union[int, str]]) -> List[Sensor]:
+        return await self.sensor_repo.get_sensors(sensor_ids)
+
+    async def update_sensor(self, sensor: Sensor) -> Sensor:
+        return await self.sensor_repo.update_sensor(sensor)
+
+    async def delete_sensor(self, sensor_id: int) -> None:
+        await self.sensor_repo.delete_sensor(sensor_id)
+        self._adjust(-1)
+
+    async def list_sensors(
+        self, after_id: Optional[Union[int, str]] = None, limit: Optional[int] = None
+    ) -> List[Sensor]:
+        return await self.sensor_repo.list_sensors(after_id=after_id, limit=limit)
+
+    def stream_sensors(self, batch_size: int = 1000) -> AsyncGenerator[Sensor, None]:
+        return self.sensor_repo.stream_sensors(batch_size=batch_size)
+
+    def watch_sensors(self) -> AsyncGenerator[SensorChange, None]:
+        return self.sensor_repo.watch_sensors()
+
+    async def append_readings(self, readings: Iterable[SensorReading]) -> int:
+        return await self.sensor_repo.append_readings(readings)
+
+    async def aggregate_readings(
+        self,
+        sensor_id: Union[int, str],
+        start: datetime,
+        end: datetime,
+        bucket: str,
+        percentiles: Sequence[float] = (),
+    ) -> List[ReadingAggregate]:
+        return await self.sensor_repo.aggregate_readings(
+            sensor_id, start, end, bucket, percentiles
+        )
@@ -0,0 +1,7 @@
+from sensor_app.adapters.secondary.instrumentation.repository import (
+    InstrumentedRepository,
+)
+
+__all__ = [
+    "InstrumentedRepository",
+]
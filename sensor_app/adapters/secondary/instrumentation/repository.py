@@ -0,0 +1,89 @@
+import functools
+import inspect
+import time
+from typing import Any, Callable, Dict
+from sensor_app.adapters.metrics import observe_repository_call
+
+
+class InstrumentedRepository:
+    # Transparent proxy timing every public method of the wrapped repository, so
+    # any adapter for any port gets call counters and latency histograms as is.
+    # Async generators (streams) are timed from first to last item.
+    def __init__(self, repo: Any, port: str):
+        self._repo = repo
+        self._port = port
+        self._wrapped: Dict[str, Callable] = {}
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._repo, name)
+        if name.startswith("_") or not callable(attribute):
+            return attribute
+        wrapped = self._wrapped.get(name)
+        if wrapped is None:
+            wrapped = self._wrapped[name] = self._instrument(name)
+        return wrapped
+
+    def _instrument(self, name: str) -> Callable:
+        method = getattr(type(self._repo), name, None)
+        port = self._port
+
+        if inspect.isasyncgenfunction(method):
+
+            @functools.wraps(method)
+            async def instrumented_stream(*args, **kwargs):
+                error = None
+                start = time.perf_counter()
+                stream = getattr(self._repo, name)(*args, **kwargs)
+                try:
+                    async for item in stream:
+                        yield item
+                except GeneratorExit:
+                    # The consumer stopped early, that is not a failure
+                    raise
+                except BaseException as e:
+                    error = e
+                    raise
+                finally:
+                    # Closing the wrapper closes the wrapped stream right away,
+                    # releasing its cursor or connection instead of leaving it to
+                    # garbage collection
+                    try:
+                        await stream.aclose()
+                    finally:
+                        observe_repository_call(
+                            port, name, time.perf_counter() - start, error
+                        )
+
+            return instrumented_stream
+
+        if inspect.iscoroutinefunction(method):
+
+            @functools.wraps(method)
+            async def instrumented_async_call(*args, **kwargs):
+                error = None
+                start = time.perf_counter()
+                try:
+                    return await getattr(self._repo, name)(*args, **kwargs)
+                except BaseException as e:
+                    error = e
+                    raise
+                finally:
+                    observe_repository_call(
+                        port, name, time.perf_counter() - start, error
+                    )
+
+            return instrumented_async_call
+
+        @functools.wraps(getattr(self._repo, name))
+        def instrumented_call(*args, **kwargs):
+            error = None
+            start = time.perf_counter()
+            try:
+                return getattr(self._repo, name)(*args, **kwargs)
+            except BaseException as e:
+                error = e
+                raise
+            finally:
+                observe_repository_call(port, name, time.perf_counter() - start, error)
+
+        return instrumented_call
@@ -0,0 +1,7 @@
+from sensor_app.adapters.secondary.persistence_memory.sensor_repo import (
+    InMemorySensorRepository,
+)
+
+__all__ = [
+    "InMemorySensorRepository",
+]
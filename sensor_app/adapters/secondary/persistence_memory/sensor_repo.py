@@ -0,0 +1,500 @@
+import asyncio
+import json
+import logging
+import math
+import os
+import tempfile
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta, timezone
+from typing import (
+    AsyncGenerator,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+    cast,
+)
+import numpy as np
+from sensor_app.core.domain.aggregation import aggregate_columns
+from sensor_app.core.domain.entities import (
+    ReadingAggregate,
+    Sensor,
+    SensorChange,
+    SensorChangeOperation,
+    SensorReading,
+)
+from sensor_app.core.domain.errors import InvalidSensorId, SensorNotFound
+from sensor_app.core.ports.secondary import SensorRepository
+
+logger = logging.getLogger()
+
+# Version 2 added the sensor version and updated_at columns, version 1 snapshots
+# load with every sensor at version 1, last updated when loaded
+SNAPSHOT_VERSION = 2
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _now_microseconds() -> int:
+    return time.time_ns() // 1000
+
+
+class _ReadingColumns:
+    __slots__ = ("epoch_seconds", "values")
+
+    def __init__(self):
+        self.epoch_seconds = array("d")
+        self.values = array("d")
+
+
+class InMemorySensorRepository(SensorRepository):
+    # Column store for sensors: rows are appended in id order to array backed
+    # columns, a dict maps id -> row and deletes leave a tombstone until the columns
+    # are compacted. Sorted (key, id) indexes on name and value serve range queries,
+    # they are rebuilt lazily on the first query after a write.
+    #
+    # Every method mutates state without awaiting in between, so concurrent
+    # coroutines on the loop always see a consistent store without any locking.
+    COMPACT_MIN_TOMBSTONES = 1024
+
+    def __init__(
+        self,
+        snapshot_path: Optional[str] = None,
+        snapshot_interval_seconds: Optional[float] = None,
+    ):
+        self.snapshot_path = snapshot_path
+        self.snapshot_interval_seconds = snapshot_interval_seconds
+        self._clear()
+        self._loaded = False
+        self._snapshot_lock: Optional[asyncio.Lock] = None
+        self._snapshot_task: Optional[asyncio.Task] = None
+        # Queues of the watch_sensors subscribers, see _publish
+        self._watchers: Set[asyncio.Queue] = set()
+
+    def _clear(self) -> None:
+        self._ids = array("q")
+        self._names: List[Optional[str]] = []
+        self._values = array("d")
+        self._versions = array("q")
+        # Microseconds since the epoch, exact unlike float seconds
+        self._updated_at = array("q")
+        self._row_by_id: Dict[int, int] = {}
+        self._tombstones = 0
+        self._next_id = 1
+        self._readings: Dict[int, _ReadingColumns] = {}
+        self._name_index: Optional[List[Tuple[str, int]]] = None
+        self._value_index: Optional[List[Tuple[float, int]]] = None
+
+    async def connect(self) -> None:
+        if self.snapshot_path and not self._loaded:
+            self._loaded = True
+            if os.path.exists(self.snapshot_path):
+                state = await asyncio.to_thread(_read_snapshot, self.snapshot_path)
+                self._restore(state)
+                logger.info(
+                    f"Loaded {len(self._row_by_id)} sensors from {self.snapshot_path}"
+                )
+        if (
+            self.snapshot_path
+            and self.snapshot_interval_seconds
+            and self._snapshot_task is None
+        ):
+            self._snapshot_task = asyncio.ensure_future(
+                self._snapshot_periodically(self.snapshot_interval_seconds)
+            )
+
+    async def disconnect(self) -> None:
+        if self._snapshot_task is not None:
+            task, self._snapshot_task = self._snapshot_task, None
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        if self.snapshot_path:
+            await self.snapshot()
+
+    async def _snapshot_periodically(self, interval_seconds: float) -> None:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await self.snapshot()
+            except Exception as e:
+                logger.warning(f"Periodic snapshot to {self.snapshot_path} failed: {e}")
+
+    async def snapshot(self, path: Optional[str] = None) -> None:
+        path = path or self.snapshot_path
+        if not path:
+            raise ValueError("No snapshot path configured")
+        if self._snapshot_lock is None:
+            self._snapshot_lock = asyncio.Lock()
+        # The state is copied on the loop, so writes made while the file is being
+        # written end up in the next snapshot instead of a torn one
+        async with self._snapshot_lock:
+            await asyncio.to_thread(_write_snapshot, path, self._dump())
+
+    async def restore(self, path: Optional[str] = None) -> None:
+        path = path or self.snapshot_path
+        if not path:
+            raise ValueError("No snapshot path configured")
+        self._restore(await asyncio.to_thread(_read_snapshot, path))
+        self._loaded = True
+
+    def _dump(self) -> dict:
+        live_rows = [
+            row
+            for row, name in enumerate(self._names)
+            if name is not None  # skip tombstones
+        ]
+        return {
+            "version": SNAPSHOT_VERSION,
+            "next_id": self._next_id,
+            "sensors": {
+                "id": [self._ids[row] for row in live_rows],
+                "name": [self._names[row] for row in live_rows],
+                "value": [self._values[row] for row in live_rows],
+                "version": [self._versions[row] for row in live_rows],
+                "updated_at": [self._updated_at[row] for row in live_rows],
+            },
+            "readings": {
+                str(sensor_id): {
+                    "epoch_seconds": columns.epoch_seconds.tolist(),
+                    "value": columns.values.tolist(),
+                }
+                for sensor_id, columns in self._readings.items()
+            },
+        }
+
+    def _restore(self, state: dict) -> None:
+        if state.get("version") not in (1, SNAPSHOT_VERSION):
+            raise ValueError(f"Unsupported snapshot version {state.get('version')}")
+        self._clear()
+        sensors = state["sensors"]
+        self._ids = array("q", sensors["id"])
+        self._names = list(sensors["name"])
+        self._values = array("d", sensors["value"])
+        self._versions = array("q", sensors.get("version", [1] * len(self._ids)))
+        self._updated_at = array(
+            "q", sensors.get("updated_at", [_now_microseconds()] * len(self._ids))
+        )
+        self._row_by_id = {sensor_id: row for row, sensor_id in enumerate(self._ids)}
+        self._next_id = state["next_id"]
+        for sensor_id, readings in state["readings"].items():
+            columns = _ReadingColumns()
+            columns.epoch_seconds.extend(readings["epoch_seconds"])
+            columns.values.extend(readings["value"])
+            self._readings[int(sensor_id)] = columns
+
+    def _sensor(self, row: int) -> Sensor:
+        return Sensor(
+            id=self._ids[row],
+            # Only live rows are read, tombstones (None names) never are
+            name=cast(str, self._names[row]),
+            value=self._values[row],
+            version=self._versions[row],
+            updated_at=_EPOCH + timedelta(microseconds=self._updated_at[row]),
+        )
+
+    def _invalidate_indexes(self) -> None:
+        self._name_index = None
+        self._value_index = None
+
+    def _append(self, sensor: Sensor) -> int:
+        sensor_id = self._next_id
+        self._next_id += 1
+        self._row_by_id[sensor_id] = len(self._ids)
+        self._ids.append(sensor_id)
+        self._names.append(sensor.name)
+        self._values.append(sensor.value)
+        self._versions.append(1)
+        self._updated_at.append(_now_microseconds())
+        return sensor_id
+
+    def _compact(self) -> None:
+        live_rows = [row for row, name in enumerate(self._names) if name is not None]
+        self._ids = array("q", (self._ids[row] for row in live_rows))
+        self._names = [self._names[row] for row in live_rows]
+        self._values = array("d", (self._values[row] for row in live_rows))
+        self._versions = array("q", (self._versions[row] for row in live_rows))
+        self._updated_at = array("q", (self._updated_at[row] for row in live_rows))
+        self._row_by_id = {sensor_id: row for row, sensor_id in enumerate(self._ids)}
+        self._tombstones = 0
+
+    @staticmethod
+    def _to_id(sensor_id: Union[int, str, None]) -> Optional[int]:
+        if sensor_id is None:
+            return None
+        try:
+            return int(sensor_id)
+        except ValueError:
+            return None
+
+    def _row(self, sensor_id: Union[int, str, None]) -> Optional[int]:
+        row_id = self._to_id(sensor_id)
+        return self._row_by_id.get(row_id) if row_id is not None else None
+
+    def _publish(
+        self,
+        operation: SensorChangeOperation,
+        sensor_id: Union[int, str],
+        sensor: Optional[Sensor] = None,
+    ) -> None:
+        if not self._watchers:
+            return
+        change = SensorChange(operation=operation, sensor_id=sensor_id, sensor=sensor)
+        for queue in self._watchers:
+            queue.put_nowait(change)
+
+    async def count_sensors(self) -> int:
+        return len(self._row_by_id)
+
+    async def create_sensor(self, sensor: Sensor) -> Sensor:
+        sensor_id = self._append(sensor)
+        self._invalidate_indexes()
+        created_sensor = self._sensor(self._row_by_id[sensor_id])
+        self._publish("insert", sensor_id, created_sensor)
+        return created_sensor
+
+    async def create_sensors(self, sensors: Iterable[Sensor]) -> List[Sensor]:
+        sensor_ids = [self._append(sensor) for sensor in sensors]
+        created_sensors = [
+            self._sensor(self._row_by_id[sensor_id]) for sensor_id in sensor_ids
+        ]
+        if created_sensors:
+            self._invalidate_indexes()
+        if self._watchers:
+            for sensor_id, created_sensor in zip(sensor_ids, created_sensors):
+                self._publish("insert", sensor_id, created_sensor)
+        return created_sensors
+
+    async def load_sensors(self, names: Sequence[str], values: Sequence[float]) -> int:
+        count = len(names)
+        if not count:
+            return 0
+        # Whole columns are extended at once rather than appending row by row
+        first_id, first_row = self._next_id, len(self._ids)
+        ids = range(first_id, first_id + count)
+        self._next_id += count
+        self._row_by_id.update(zip(ids, range(first_row, first_row + count)))
+        self._ids.extend(ids)
+        self._names.extend(names)
+        self._values.extend(float(value) for value in values)
+        self._versions.extend(array("q", [1]) * count)
+        self._updated_at.extend(array("q", [_now_microseconds()]) * count)
+        self._invalidate_indexes()
+        if self._watchers:
+            for row in range(first_row, first_row + count):
+                self._publish("insert", self._ids[row], self._sensor(row))
+        return count
+
+    async def get_sensor(self, sensor_id: int) -> Optional[Sensor]:
+        row = self._row(sensor_id)
+        return self._sensor(row) if row is not None else None
+
+    async def get_sensors(self, sensor_ids: Iterable[Union[int, str]]) -> List[Sensor]:
+        rows: Set[int] = set()
+        for sensor_id in sensor_ids:
+            row_id = self._to_id(sensor_id)
+            if row_id is None:
+                raise InvalidSensorId(f"Invalid sensor id {sensor_id!r}")
+            row = self._row_by_id.get(row_id)
+            if row is not None:
+                rows.add(row)
+        return [self._sensor(row) for row in sorted(rows)]
+
+    async def update_sensor(self, sensor: Sensor) -> Sensor:
+        row = self._row(sensor.id)
+        if row is None:
+            raise ValueError(f"Sensor with id {sensor.id} not found")
+        self._names[row] = sensor.name
+        self._values[row] = sensor.value
+        self._versions[row] += 1
+        self._updated_at[row] = _now_microseconds()
+        self._invalidate_indexes()
+        updated_sensor = self._sensor(row)
+        self._publish("update", self._ids[row], updated_sensor)
+        return updated_sensor
+
+    async def delete_sensor(self, sensor_id: int) -> None:
+        row_id = self._to_id(sensor_id)
+        row = self._row_by_id.pop(row_id, None) if row_id is not None else None
+        if row_id is None or row is None:
+            return
+        self._names[row] = None
+        self._values[row] = math.nan
+        self._readings.pop(row_id, None)
+        self._tombstones += 1
+        self._invalidate_indexes()
+        if self._tombstones >= max(self.COMPACT_MIN_TOMBSTONES, len(self._ids) // 2):
+            self._compact()
+        self._publish("delete", row_id)
+
+    def _rows_after(self, after_id: Optional[int], limit: Optional[int]) -> List[int]:
+        # Rows are in id order, so keyset pagination is a bisect on the id column
+        start = bisect_right(self._ids, after_id) if after_id is not None else 0
+        rows: List[int] = []
+        for row in range(start, len(self._ids)):
+            if limit is not None and len(rows) >= limit:
+                break
+            if self._names[row] is not None:
+                rows.append(row)
+        return rows
+
+    async def list_sensors(
+        self, after_id: Optional[Union[int, str]] = None, limit: Optional[int] = None
+    ) -> List[Sensor]:
+        after_row_id = None
+        if after_id is not None:
+            # A cursor that isn't an id is an error, like for the other adapters,
+            # rather than silently the first page
+            after_row_id = self._to_id(after_id)
+            if after_row_id is None:
+                raise InvalidSensorId(f"Invalid sensor id {after_id!r}")
+        return [self._sensor(row) for row in self._rows_after(after_row_id, limit)]
+
+    async def stream_sensors(
+        self, batch_size: int = 1000
+    ) -> AsyncGenerator[Sensor, None]:
+        # Resolve each batch from the last id seen, rows may be compacted in between
+        after_id = None
+        while True:
+            sensors = [
+                self._sensor(row) for row in self._rows_after(after_id, batch_size)
+            ]
+            for sensor in sensors:
+                yield sensor
+            if len(sensors) < batch_size:
+                return
+            after_id = sensors[-1].id
+
+    async def watch_sensors(self) -> AsyncGenerator[SensorChange, None]:
+        # Changes are pushed to every watcher's queue as the writes happen, so a
+        # watcher sees them in write order. Only writes made through this instance
+        # (this process) are seen.
+        queue: asyncio.Queue = asyncio.Queue()
+        self._watchers.add(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self._watchers.discard(queue)
+
+    def _get_name_index(self) -> List[Tuple[str, int]]:
+        if self._name_index is None:
+            self._name_index = sorted(
+                (name, self._ids[row])
+                for row, name in enumerate(self._names)
+                if name is not None
+            )
+        return self._name_index
+
+    def _get_value_index(self) -> List[Tuple[float, int]]:
+        if self._value_index is None:
+            self._value_index = sorted(
+                (self._values[row], self._ids[row])
+                for row, name in enumerate(self._names)
+                if name is not None
+            )
+        return self._value_index
+
+    async def find_sensors_by_value(
+        self,
+        min_value: float = -math.inf,
+        max_value: float = math.inf,
+        limit: Optional[int] = None,
+    ) -> List[Sensor]:
+        # Inclusive range, ordered by value then id
+        index = self._get_value_index()
+        start = bisect_left(index, (min_value,))
+        end = bisect_right(index, (max_value, math.inf))
+        if limit is not None:
+            end = min(end, start + limit)
+        return [
+            self._sensor(self._row_by_id[sensor_id])
+            for _, sensor_id in index[start:end]
+        ]
+
+    async def find_sensors_by_name(
+        self, prefix: str, limit: Optional[int] = None
+    ) -> List[Sensor]:
+        # Sensors whose name starts with prefix, ordered by name then id
+        index = self._get_name_index()
+        sensors: List[Sensor] = []
+        for position in range(bisect_left(index, (prefix,)), len(index)):
+            name, sensor_id = index[position]
+            if not name.startswith(prefix) or (
+                limit is not None and len(sensors) >= limit
+            ):
+                break
+            sensors.append(self._sensor(self._row_by_id[sensor_id]))
+        return sensors
+
+    async def append_readings(self, readings: Iterable[SensorReading]) -> int:
+        readings = list(readings)
+        # Validate every reading before touching the columns, like a single insert
+        sensor_ids = []
+        for reading in readings:
+            sensor_id = self._to_id(reading.sensor_id)
+            if sensor_id is None:
+                raise InvalidSensorId(f"Invalid sensor id {reading.sensor_id!r}")
+            if sensor_id not in self._row_by_id:
+                raise SensorNotFound(f"Sensor with id {reading.sensor_id} not found")
+            sensor_ids.append(sensor_id)
+
+        for sensor_id, reading in zip(sensor_ids, readings):
+            columns = self._readings.get(sensor_id)
+            if columns is None:
+                columns = self._readings[sensor_id] = _ReadingColumns()
+            columns.epoch_seconds.append(reading.recorded_at.timestamp())
+            columns.values.append(reading.value)
+        return len(readings)
+
+    async def aggregate_readings(
+        self,
+        sensor_id: Union[int, str],
+        start: datetime,
+        end: datetime,
+        bucket: str,
+        percentiles: Sequence[float] = (),
+    ) -> List[ReadingAggregate]:
+        row_id = self._to_id(sensor_id)
+        columns = self._readings.get(row_id) if row_id is not None else None
+        if row_id is None or columns is None:
+            return []
+        # Copy the columns out (a memcpy), a live buffer export would stop them growing
+        epoch_seconds = np.array(columns.epoch_seconds, dtype=np.float64)
+        values = np.array(columns.values, dtype=np.float64)
+        in_range = (epoch_seconds >= start.timestamp()) & (
+            epoch_seconds < end.timestamp()
+        )
+        return aggregate_columns(
+            row_id, epoch_seconds[in_range], values[in_range], bucket, percentiles
+        )
+
+
+def _write_snapshot(path: str, state: dict) -> None:
+    # Write next to the target and rename, a crash never leaves a partial snapshot
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".sensors-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as stream:
+            json.dump(state, stream, separators=(",", ":"))
+            stream.flush()
+            os.fsync(stream.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _read_snapshot(path: str) -> dict:
+    with open(path, "r") as stream:
+        return json.load(stream)
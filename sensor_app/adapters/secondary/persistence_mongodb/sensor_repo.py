@@ -1,58 +1,315 @@
-from typing import List, Optional
+from datetime import datetime, timezone
+from typing import (
+    AsyncGenerator,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Union,
+)
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING
 from bson import ObjectId
-from sensor_app.core.domain.entities import Sensor
+from bson.errors import InvalidId
+from sensor_app.core.domain.aggregation import percentile_key
+from sensor_app.core.domain.entities import (
+    ReadingAggregate,
+    Sensor,
+    SensorChange,
+    SensorChangeOperation,
+    SensorReading,
+)
+from sensor_app.core.domain.errors import InvalidSensorId, SensorNotFound
 from sensor_app.core.ports.secondary import SensorRepository
 
 
+# Change stream operation types reported as SensorChange operations, the others
+# (drop, rename, invalidate) end the stream
+_CHANGE_OPERATIONS: Dict[str, SensorChangeOperation] = {
+    "insert": "insert",
+    "update": "update",
+    "replace": "update",
+    "delete": "delete",
+}
+
+
+def _now() -> datetime:
+    # BSON dates have millisecond precision, truncate so the sensor returned by a
+    # write equals the one read back later
+    now = datetime.now(timezone.utc)
+    return now.replace(microsecond=now.microsecond // 1000 * 1000)
+
+
+def _object_id(sensor_id: Union[int, str]) -> ObjectId:
+    try:
+        return ObjectId(str(sensor_id))
+    except InvalidId:
+        raise InvalidSensorId(f"Invalid sensor id {sensor_id!r}")
+
+
+def _to_sensor(document: dict) -> Sensor:
+    updated_at = document.get("updated_at")
+    return Sensor(
+        id=str(document["_id"]),
+        name=document["name"],
+        value=document["value"],
+        # Documents written before versioning count as version 1
+        version=document.get("version", 1),
+        # Motor returns naive datetimes in UTC
+        updated_at=updated_at.replace(tzinfo=timezone.utc) if updated_at else None,
+    )
+
+
 class MongoDBSensorRepository(SensorRepository):
-    def __init__(self, connection_string: str):
+    def __init__(self, connection_string: str, count_strategy: str = "exact"):
+        if count_strategy not in ("exact", "estimated"):
+            raise ValueError("count_strategy must be exact or estimated")
+        self.count_strategy = count_strategy
         self.client = AsyncIOMotorClient(connection_string)
         self.db = self.client.get_default_database()
         self.collection = self.db.sensors
+        self.readings_collection = self.db.sensor_readings
+
+    async def connect(self) -> None:
+        # Motor manages its own connection pool and connects lazily. The readings
+        # index serves aggregate_readings' sensor and time range match, like the
+        # btree index of the SQL table. Creating an existing index is a no-op.
+        await self.readings_collection.create_index(
+            [("sensor_id", ASCENDING), ("recorded_at", ASCENDING)]
+        )
+
+    async def disconnect(self) -> None:
+        self.client.close()
 
     async def count_sensors(self) -> int:
+        if self.count_strategy == "estimated":
+            # Read from the collection metadata instead of scanning it
+            return await self.collection.estimated_document_count()
         return await self.collection.count_documents({})
 
     async def create_sensor(self, sensor: Sensor) -> Sensor:
+        updated_at = _now()
         result = await self.collection.insert_one(
-            {"name": sensor.name, "value": sensor.value}
+            {
+                "name": sensor.name,
+                "value": sensor.value,
+                "version": 1,
+                "updated_at": updated_at,
+            }
         )
         sensor.id = str(result.inserted_id)
+        sensor.version = 1
+        sensor.updated_at = updated_at
         return sensor
 
+    async def create_sensors(self, sensors: Iterable[Sensor]) -> List[Sensor]:
+        sensors = list(sensors)
+        if not sensors:
+            return []
+        updated_at = _now()
+        result = await self.collection.insert_many(
+            [
+                {
+                    "name": sensor.name,
+                    "value": sensor.value,
+                    "version": 1,
+                    "updated_at": updated_at,
+                }
+                for sensor in sensors
+            ],
+            ordered=True,
+        )
+        # inserted_ids follows the order of the submitted documents
+        for sensor, inserted_id in zip(sensors, result.inserted_ids):
+            sensor.id = str(inserted_id)
+            sensor.version = 1
+            sensor.updated_at = updated_at
+        return sensors
+
+    async def load_sensors(self, names: Sequence[str], values: Sequence[float]) -> int:
+        if not len(names):
+            return 0
+        updated_at = _now()
+        # Unordered lets the server apply the batch in parallel
+        result = await self.collection.insert_many(
+            [
+                {
+                    "name": name,
+                    "value": float(value),
+                    "version": 1,
+                    "updated_at": updated_at,
+                }
+                for name, value in zip(names, values)
+            ],
+            ordered=False,
+        )
+        return len(result.inserted_ids)
+
     async def get_sensor(self, sensor_id: int) -> Optional[Sensor]:
         result = await self.collection.find_one({"_id": ObjectId(str(sensor_id))})
         if result:
-            return Sensor(
-                id=str(result["_id"]), name=result["name"], value=result["value"]
-            )
+            return _to_sensor(result)
         return None
 
+    async def get_sensors(self, sensor_ids: Iterable[Union[int, str]]) -> List[Sensor]:
+        object_ids = [_object_id(sensor_id) for sensor_id in sensor_ids]
+        if not object_ids:
+            return []
+        cursor = self.collection.find({"_id": {"$in": object_ids}})
+        return [_to_sensor(document) async for document in cursor]
+
     async def update_sensor(self, sensor: Sensor) -> Sensor:
         result = await self.collection.find_one_and_update(
             {"_id": ObjectId(str(sensor.id))},
-            {"$set": {"name": sensor.name, "value": sensor.value}},
+            # Pipeline update so documents without a version go from 1 to 2,
+            # $literal keeps a name starting with $ from being read as a field path
+            [
+                {
+                    "$set": {
+                        "name": {"$literal": sensor.name},
+                        "value": {"$literal": sensor.value},
+                        "updated_at": _now(),
+                        "version": {"$add": [{"$ifNull": ["$version", 1]}, 1]},
+                    }
+                }
+            ],
             return_document=True,
         )
         if result:
-            return Sensor(
-                id=str(result["_id"]), name=result["name"], value=result["value"]
-            )
+            return _to_sensor(result)
         raise ValueError(f"Sensor with id {sensor.id} not found")
 
     async def delete_sensor(self, sensor_id: int) -> None:
         await self.collection.delete_one({"_id": ObjectId(str(sensor_id))})
 
-    async def list_sensors(self) -> List[Sensor]:
-        cursor = self.collection.find({})
+    async def list_sensors(
+        self, after_id: Optional[Union[int, str]] = None, limit: Optional[int] = None
+    ) -> List[Sensor]:
+        query = {}
+        if after_id is not None:
+            query = {"_id": {"$gt": _object_id(after_id)}}
+        cursor = self.collection.find(query).sort("_id", 1)
+        if limit is not None:
+            cursor = cursor.limit(limit)
         sensors = []
         async for document in cursor:
-            sensors.append(
-                Sensor(
-                    id=str(document["_id"]),
-                    name=document["name"],
-                    value=document["value"],
+            sensors.append(_to_sensor(document))
+        return sensors
+
+    async def stream_sensors(
+        self, batch_size: int = 1000
+    ) -> AsyncGenerator[Sensor, None]:
+        cursor = self.collection.find({}).sort("_id", 1).batch_size(batch_size)
+        async for document in cursor:
+            yield _to_sensor(document)
+
+    async def watch_sensors(self) -> AsyncGenerator[SensorChange, None]:
+        # Change streams need a replica set (a single node one is enough). One stream
+        # is one server cursor, fan it out in process rather than opening one per
+        # consumer. updateLookup attaches the current document to updates.
+        async with self.collection.watch(full_document="updateLookup") as stream:
+            async for event in stream:
+                operation = _CHANGE_OPERATIONS.get(event["operationType"])
+                if operation is None:
+                    return
+                sensor_id = str(event["documentKey"]["_id"])
+                document = event.get("fullDocument")
+                if operation != "delete" and document is None:
+                    # Deleted before the update was looked up, its delete follows
+                    continue
+                yield SensorChange(
+                    operation=operation,
+                    sensor_id=sensor_id,
+                    sensor=_to_sensor(document) if document is not None else None,
                 )
+
+    async def append_readings(self, readings: Iterable[SensorReading]) -> int:
+        readings = list(readings)
+        if not readings:
+            return 0
+        sensor_ids = [_object_id(reading.sensor_id) for reading in readings]
+        # No foreign keys here, check the sensors exist like Postgres does
+        wanted_ids = set(sensor_ids)
+        found_ids = {
+            document["_id"]
+            async for document in self.collection.find(
+                {"_id": {"$in": list(wanted_ids)}}, {"_id": 1}
             )
-        return sensors
+        }
+        missing_ids = wanted_ids - found_ids
+        if missing_ids:
+            raise SensorNotFound(f"Sensor with id {min(missing_ids)} not found")
+        documents = [
+            {
+                "sensor_id": str(sensor_id),
+                "recorded_at": reading.recorded_at,
+                "value": reading.value,
+            }
+            for sensor_id, reading in zip(sensor_ids, readings)
+        ]
+        # Unordered lets the server apply the batch in parallel
+        result = await self.readings_collection.insert_many(documents, ordered=False)
+        return len(result.inserted_ids)
+
+    async def aggregate_readings(
+        self,
+        sensor_id: Union[int, str],
+        start: datetime,
+        end: datetime,
+        bucket: str,
+        percentiles: Sequence[float] = (),
+    ) -> List[ReadingAggregate]:
+        group = {
+            "_id": {
+                "$dateTrunc": {
+                    "date": "$recorded_at",
+                    "unit": bucket,
+                    "timezone": "UTC",
+                    "startOfWeek": "monday",
+                }
+            },
+            "count": {"$sum": 1},
+            "min": {"$min": "$value"},
+            "max": {"$max": "$value"},
+            "mean": {"$avg": "$value"},
+        }
+        if percentiles:
+            # $percentile needs MongoDB 7.0+
+            group["percentiles"] = {
+                "$percentile": {
+                    "input": "$value",
+                    "p": list(percentiles),
+                    "method": "approximate",
+                }
+            }
+        cursor = self.readings_collection.aggregate(
+            [
+                {
+                    "$match": {
+                        "sensor_id": str(sensor_id),
+                        "recorded_at": {"$gte": start, "$lt": end},
+                    }
+                },
+                {"$group": group},
+                {"$sort": {"_id": 1}},
+            ]
+        )
+        return [
+            ReadingAggregate(
+                sensor_id=sensor_id,
+                # Mongo hands back naive UTC datetimes
+                bucket_start=document["_id"].replace(tzinfo=timezone.utc),
+                count=document["count"],
+                min=document["min"],
+                max=document["max"],
+                mean=document["mean"],
+                percentiles={
+                    percentile_key(percentile): value
+                    for percentile, value in zip(
+                        percentiles, document.get("percentiles", [])
+                    )
+                },
+            )
+            async for document in cursor
+        ]
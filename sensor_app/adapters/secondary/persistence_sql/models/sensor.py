@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float
+from sqlalchemy import Column, DateTime, Integer, String, Float, func
 from sensor_app.adapters.secondary.persistence_sql.models.base import Base
 
 
@@ -7,3 +7,7 @@ class Sensor(Base):
     id = Column(Integer, primary_key=True)
     name = Column(String, nullable=False)
     value = Column(Float, nullable=False)
+    version = Column(Integer, nullable=False, server_default="1")
+    updated_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
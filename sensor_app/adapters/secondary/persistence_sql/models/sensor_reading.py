@@ -0,0 +1,22 @@
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, Integer
+from sensor_app.adapters.secondary.persistence_sql.models.base import Base
+
+
+class SensorReading(Base):
+    __tablename__ = "sensor_readings"
+    sensor_id = Column(
+        Integer, ForeignKey("sensors.id", ondelete="CASCADE"), nullable=False
+    )
+    recorded_at = Column(DateTime(timezone=True), nullable=False)
+    value = Column(Float, nullable=False)
+
+    __table_args__ = (
+        Index(
+            "ix_sensor_readings_recorded_at_brin",
+            "recorded_at",
+            postgresql_using="brin",
+        ),
+        Index("ix_sensor_readings_sensor_id_recorded_at", "sensor_id", "recorded_at"),
+    )
+    # The table has no primary key constraint, the ORM only needs an identity
+    __mapper_args__ = {"primary_key": [sensor_id, recorded_at]}
@@ -1,66 +1,419 @@
+import asyncio
+import json
 import asyncpg  # type: ignore
-from typing import List, Optional
-from sensor_app.core.domain.entities import Sensor
+from asyncpg.prepared_stmt import PreparedStatement  # type: ignore
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import (
+    AsyncGenerator,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Union,
+)
+from sensor_app.core.domain.aggregation import percentile_key
+from sensor_app.core.domain.entities import (
+    ReadingAggregate,
+    Sensor,
+    SensorChange,
+    SensorReading,
+)
+from sensor_app.core.domain.errors import InvalidSensorId, SensorNotFound
 from sensor_app.core.ports.secondary import SensorRepository
 
+# Channel the sensors table triggers publish changes on, a SensorChange document
+# for single row statements, the operation and the changed sensor_ids otherwise
+SENSOR_CHANGES_CHANNEL = "sensor_changes"
+
+# Selected in this order by every statement returning sensors, see construct_sensor
+SENSOR_COLUMNS = "id, name, value, version, updated_at"
+
+# Every query the repository runs, by name. The SQL is fixed (no per call string
+# building) so each statement is parsed and planned once per connection.
+STATEMENTS: Dict[str, str] = {
+    "count_sensors": "SELECT COUNT(*) FROM sensors",
+    # Planner statistics kept up to date by autovacuum/ANALYZE, -1 before the
+    # table was ever analyzed
+    "estimate_sensors": "SELECT reltuples::bigint FROM pg_class WHERE oid = 'sensors'::regclass",
+    "create_sensor": f"INSERT INTO sensors (name, value) VALUES ($1, $2) RETURNING {SENSOR_COLUMNS}",
+    # The arrays are unnested server side and ids are drawn from the sequence in
+    # input order, so sorting by id restores it
+    "create_sensors": f"""
+        INSERT INTO sensors (name, value)
+        SELECT name, value
+        FROM unnest($1::text[], $2::float8[]) WITH ORDINALITY AS t(name, value, position)
+        ORDER BY position
+        RETURNING {SENSOR_COLUMNS}
+    """,
+    "get_sensor": f"SELECT {SENSOR_COLUMNS} FROM sensors WHERE id = $1",
+    "get_sensors": f"SELECT {SENSOR_COLUMNS} FROM sensors WHERE id = ANY($1::int[])",
+    "update_sensor": f"""
+        UPDATE sensors SET name = $1, value = $2, version = version + 1, updated_at = now()
+        WHERE id = $3
+        RETURNING {SENSOR_COLUMNS}
+    """,
+    "delete_sensor": "DELETE FROM sensors WHERE id = $1",
+    # Keyset pagination: seeking past the last seen id uses the primary key index,
+    # so every page costs the same no matter how deep it is. Ids start at 1, so
+    # after_id 0 is the first page, and LIMIT NULL means no limit.
+    "list_sensors": f"SELECT {SENSOR_COLUMNS} FROM sensors WHERE id > $1 ORDER BY id LIMIT $2",
+    "stream_sensors": f"SELECT {SENSOR_COLUMNS} FROM sensors ORDER BY id",
+    # Bucketing, ordering and percentiles all happen in Postgres, only one row per
+    # bucket crosses the wire. The (sensor_id, recorded_at) index serves the scan.
+    "aggregate_readings": """
+        SELECT date_trunc($2, recorded_at, 'UTC') AS bucket_start,
+               count(*) AS count,
+               min(value) AS min,
+               max(value) AS max,
+               avg(value) AS mean,
+               percentile_cont($5::float8[]) WITHIN GROUP (ORDER BY value) AS percentiles
+        FROM sensor_readings
+        WHERE sensor_id = $1 AND recorded_at >= $3 AND recorded_at < $4
+        GROUP BY bucket_start
+        ORDER BY bucket_start
+    """,
+}
+
+
+class PreparedStatementConnection(asyncpg.Connection):
+    # Holds the STATEMENTS prepared on this connection. They survive the reset done
+    # when a pooled connection is released, so they are reused until it is closed.
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._prepared_statements: Dict[str, PreparedStatement] = {}
+
+    async def statement(self, name: str) -> PreparedStatement:
+        statement = self._prepared_statements.get(name)
+        if statement is None:
+            statement = await self.prepare(STATEMENTS[name])
+            self._prepared_statements[name] = statement
+        return statement
+
+    async def prepare_statements(self) -> None:
+        for name in STATEMENTS:
+            await self.statement(name)
+
+
+_SENSOR_FIELDS = frozenset(Sensor.model_fields)
+
+
+def construct_sensor(row: asyncpg.Record) -> Sensor:
+    # Trusted SENSOR_COLUMNS rows straight into a Sensor without validation. This
+    # is what model_construct does, minus its per field default handling, which
+    # makes model_construct slower than validating on pydantic 2.8.
+    sensor = object.__new__(Sensor)
+    object.__setattr__(
+        sensor,
+        "__dict__",
+        {
+            "id": row[0],
+            "name": row[1],
+            "value": row[2],
+            "version": row[3],
+            "updated_at": row[4],
+        },
+    )
+    object.__setattr__(sensor, "__pydantic_fields_set__", set(_SENSOR_FIELDS))
+    object.__setattr__(sensor, "__pydantic_extra__", None)
+    object.__setattr__(sensor, "__pydantic_private__", None)
+    return sensor
+
+
+def validate_sensor(row: asyncpg.Record) -> Sensor:
+    return Sensor(**row)
+
+
+def to_sensor_id(sensor_id: Union[int, str]) -> int:
+    try:
+        return int(sensor_id)
+    except (TypeError, ValueError):
+        raise InvalidSensorId(f"Invalid sensor id {sensor_id!r}")
+
 
 class AsyncpgSensorRepository(SensorRepository):
-    def __init__(self, database_url: str):
+    def __init__(
+        self,
+        database_url: str,
+        use_pool: bool = False,
+        pool_min_size: int = 1,
+        pool_max_size: int = 10,
+        pool_max_inactive_connection_lifetime: float = 300.0,
+        statement_cache_size: int = 100,
+        prepare_statements: bool = True,
+        fast_mode: bool = False,
+        count_strategy: str = "exact",
+    ):
+        if count_strategy not in ("exact", "estimated"):
+            raise ValueError("count_strategy must be exact or estimated")
         self.database_url = database_url
+        self.use_pool = use_pool
+        self.pool_min_size = pool_min_size
+        self.pool_max_size = pool_max_size
+        self.pool_max_inactive_connection_lifetime = (
+            pool_max_inactive_connection_lifetime
+        )
+        self.statement_cache_size = statement_cache_size
+        self.prepare_statements = prepare_statements
+        self.fast_mode = fast_mode
+        self.count_strategy = count_strategy
+        # Rows are mapped without validation in fast mode, they come from our schema
+        self._to_sensor = construct_sensor if fast_mode else validate_sensor
+        self._pool: Optional[asyncpg.Pool] = None
+        self._pool_lock = asyncio.Lock()
+
+    async def connect(self) -> None:
+        # Without pooling every call opens its own connection, nothing to set up
+        if not self.use_pool:
+            return
+        async with self._pool_lock:
+            if self._pool is None:
+                self._pool = await asyncpg.create_pool(
+                    self.database_url,
+                    min_size=self.pool_min_size,
+                    max_size=self.pool_max_size,
+                    max_inactive_connection_lifetime=self.pool_max_inactive_connection_lifetime,
+                    statement_cache_size=self.statement_cache_size,
+                    connection_class=PreparedStatementConnection,
+                    init=self._init_connection,
+                )
 
-    async def _get_connection(self) -> asyncpg.Connection:
-        return await asyncpg.connect(self.database_url)
+    async def disconnect(self) -> None:
+        async with self._pool_lock:
+            if self._pool is not None:
+                pool, self._pool = self._pool, None
+                await pool.close()
+
+    async def _init_connection(self, conn: PreparedStatementConnection) -> None:
+        # Runs once per new pooled connection, requests then only bind and execute
+        if self.prepare_statements:
+            await conn.prepare_statements()
+
+    async def _get_connection(self) -> PreparedStatementConnection:
+        # Short lived, statements are prepared on first use only
+        return await asyncpg.connect(
+            self.database_url,
+            statement_cache_size=self.statement_cache_size,
+            connection_class=PreparedStatementConnection,
+        )
+
+    @asynccontextmanager
+    async def _connection(self) -> AsyncIterator[PreparedStatementConnection]:
+        if self.use_pool:
+            # The pool is normally opened by the startup hooks, but open it lazily
+            # so the repository also works when no lifecycle hook ran (e.g. scripts)
+            if self._pool is None:
+                await self.connect()
+            pool = self._pool
+            if pool is None:
+                # Closed by disconnect() while we were opening it
+                raise RuntimeError(
+                    "The sensor repository pool is closed, call connect() first"
+                )
+            async with pool.acquire() as conn:
+                yield conn
+        else:
+            conn = await self._get_connection()
+            try:
+                yield conn
+            finally:
+                await conn.close()
 
     async def count_sensors(self) -> int:
-        conn = await self._get_connection()
-        async with conn.transaction():
-            row = await conn.fetchrow(
-                "SELECT COUNT(*) from sensors",
-            )
-        await conn.close()
-        return row
+        async with self._connection() as conn:
+            if self.count_strategy == "estimated":
+                statement = await conn.statement("estimate_sensors")
+                estimate = await statement.fetchval()
+                if estimate is not None and estimate >= 0:
+                    return estimate
+            # COUNT(*) scans the whole table, the cost grows with it
+            statement = await conn.statement("count_sensors")
+            return await statement.fetchval()
 
     async def create_sensor(self, sensor: Sensor) -> Sensor:
-        conn = await self._get_connection()
-        async with conn.transaction():
-            row = await conn.fetchrow(
-                "INSERT INTO sensors (name, value) VALUES ($1, $2) RETURNING id, name, value",
-                sensor.name,
-                sensor.value,
+        async with self._connection() as conn:
+            async with conn.transaction():
+                statement = await conn.statement("create_sensor")
+                row = await statement.fetchrow(sensor.name, sensor.value)
+        return self._to_sensor(row)
+
+    async def create_sensors(self, sensors: Iterable[Sensor]) -> List[Sensor]:
+        names = []
+        values = []
+        for sensor in sensors:
+            names.append(sensor.name)
+            values.append(sensor.value)
+        if not names:
+            return []
+
+        # One round trip for the whole batch
+        async with self._connection() as conn:
+            async with conn.transaction():
+                statement = await conn.statement("create_sensors")
+                rows = await statement.fetch(names, values)
+        return [self._to_sensor(row) for row in sorted(rows, key=lambda row: row[0])]
+
+    async def load_sensors(self, names: Sequence[str], values: Sequence[float]) -> int:
+        if not len(names):
+            return 0
+        # COPY in the binary protocol, ids, versions and timestamps come from the
+        # column defaults. Nothing is returned, which is what makes it faster than
+        # create_sensors for bulk imports.
+        async with self._connection() as conn:
+            await conn.copy_records_to_table(
+                "sensors", records=zip(names, values), columns=["name", "value"]
             )
-        await conn.close()
-        return Sensor(**row)
+        return len(names)
 
     async def get_sensor(self, sensor_id: int) -> Optional[Sensor]:
-        conn = await self._get_connection()
-        row = await conn.fetchrow(
-            "SELECT id, name, value FROM sensors WHERE id = $1", sensor_id
-        )
-        await conn.close()
+        async with self._connection() as conn:
+            statement = await conn.statement("get_sensor")
+            row = await statement.fetchrow(sensor_id)
         if row:
-            return Sensor(**row)
+            return self._to_sensor(row)
         return None
 
+    async def get_sensors(self, sensor_ids: Iterable[Union[int, str]]) -> List[Sensor]:
+        ids = [to_sensor_id(sensor_id) for sensor_id in sensor_ids]
+        if not ids:
+            return []
+        async with self._connection() as conn:
+            statement = await conn.statement("get_sensors")
+            rows = await statement.fetch(ids)
+        return [self._to_sensor(row) for row in rows]
+
     async def update_sensor(self, sensor: Sensor) -> Sensor:
-        conn = await self._get_connection()
-        async with conn.transaction():
-            row = await conn.fetchrow(
-                "UPDATE sensors SET name = $1, value = $2 WHERE id = $3 RETURNING id, name, value",
-                sensor.name,
-                sensor.value,
-                sensor.id,
-            )
-        await conn.close()
-        return Sensor(**row)
+        async with self._connection() as conn:
+            async with conn.transaction():
+                statement = await conn.statement("update_sensor")
+                row = await statement.fetchrow(sensor.name, sensor.value, sensor.id)
+        return self._to_sensor(row)
 
     async def delete_sensor(self, sensor_id: int) -> None:
-        conn = await self._get_connection()
-        async with conn.transaction():
-            await conn.execute("DELETE FROM sensors WHERE id = $1", sensor_id)
-        await conn.close()
+        async with self._connection() as conn:
+            async with conn.transaction():
+                statement = await conn.statement("delete_sensor")
+                await statement.fetch(sensor_id)
 
-    async def list_sensors(self) -> List[Sensor]:
+    async def list_sensors(
+        self, after_id: Optional[Union[int, str]] = None, limit: Optional[int] = None
+    ) -> List[Sensor]:
+        async with self._connection() as conn:
+            statement = await conn.statement("list_sensors")
+            rows = await statement.fetch(
+                to_sensor_id(after_id) if after_id is not None else 0, limit
+            )
+        return [self._to_sensor(row) for row in rows]
+
+    async def stream_sensors(
+        self, batch_size: int = 1000
+    ) -> AsyncGenerator[Sensor, None]:
+        # Server side cursors only live inside a transaction, rows are pulled
+        # batch_size at a time so memory stays flat regardless of table size
+        async with self._connection() as conn:
+            async with conn.transaction():
+                statement = await conn.statement("stream_sensors")
+                async for row in statement.cursor(prefetch=batch_size):
+                    yield self._to_sensor(row)
+
+    async def watch_sensors(self) -> AsyncGenerator[SensorChange, None]:
+        # LISTEN holds its connection for as long as the subscription lives, so it
+        # gets its own instead of pinning one of the pool. Fan it out in process
+        # rather than opening one per consumer.
         conn = await self._get_connection()
-        rows = await conn.fetch("SELECT id, name, value FROM sensors")
-        await conn.close()
-        return [Sensor(**row) for row in rows]
+        payloads: asyncio.Queue = asyncio.Queue()
+
+        def on_notification(connection, pid, channel, payload):
+            payloads.put_nowait(payload)
+
+        def on_termination(connection):
+            payloads.put_nowait(None)
+
+        try:
+            conn.add_termination_listener(on_termination)
+            await conn.add_listener(SENSOR_CHANGES_CHANNEL, on_notification)
+            while True:
+                payload = await payloads.get()
+                if payload is None:
+                    raise ConnectionError("Sensor change listener connection lost")
+                notification = json.loads(payload)
+                if "sensor_ids" not in notification:
+                    yield SensorChange.model_validate(notification)
+                    continue
+                # A statement changing several rows (or one too large for a
+                # notification) sends their ids, read the sensors back
+                operation = notification["operation"]
+                if operation == "delete":
+                    for sensor_id in notification["sensor_ids"]:
+                        yield SensorChange(operation=operation, sensor_id=sensor_id)
+                    continue
+                sensors = {
+                    sensor.id: sensor
+                    for sensor in await self.get_sensors(notification["sensor_ids"])
+                }
+                for sensor_id in notification["sensor_ids"]:
+                    sensor = sensors.get(sensor_id)
+                    if sensor is None:
+                        # Deleted since, its delete notification follows
+                        continue
+                    yield SensorChange(
+                        operation=operation, sensor_id=sensor_id, sensor=sensor
+                    )
+        finally:
+            conn.remove_termination_listener(on_termination)
+            await conn.close()
+
+    async def append_readings(self, readings: Iterable[SensorReading]) -> int:
+        records = [
+            (to_sensor_id(reading.sensor_id), reading.recorded_at, reading.value)
+            for reading in readings
+        ]
+        if not records:
+            return 0
+        # COPY streams the rows in the binary protocol, far faster than INSERTs.
+        # The foreign key rejects the whole batch if one sensor doesn't exist.
+        async with self._connection() as conn:
+            try:
+                await conn.copy_records_to_table(
+                    "sensor_readings",
+                    records=records,
+                    columns=["sensor_id", "recorded_at", "value"],
+                )
+            except asyncpg.ForeignKeyViolationError as e:
+                raise SensorNotFound(e.detail or "Sensor not found") from e
+        return len(records)
+
+    async def aggregate_readings(
+        self,
+        sensor_id: Union[int, str],
+        start: datetime,
+        end: datetime,
+        bucket: str,
+        percentiles: Sequence[float] = (),
+    ) -> List[ReadingAggregate]:
+        async with self._connection() as conn:
+            statement = await conn.statement("aggregate_readings")
+            rows = await statement.fetch(
+                to_sensor_id(sensor_id),
+                bucket,
+                start,
+                end,
+                list(percentiles),
+            )
+        return [
+            ReadingAggregate(
+                sensor_id=sensor_id,
+                bucket_start=row["bucket_start"],
+                count=row["count"],
+                min=row["min"],
+                max=row["max"],
+                mean=row["mean"],
+                percentiles={
+                    percentile_key(percentile): value
+                    for percentile, value in zip(percentiles, row["percentiles"] or [])
+                },
+            )
+            for row in rows
+        ]
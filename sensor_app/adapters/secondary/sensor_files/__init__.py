@@ -0,0 +1,7 @@
+from sensor_app.adapters.secondary.sensor_files.local_file_store import (
+    LocalSensorFileStore,
+)
+
+__all__ = [
+    "LocalSensorFileStore",
+]
@@ -0,0 +1,363 @@
+import asyncio
+import csv
+import gzip
+import io
+import logging
+import os
+import time
+from datetime import datetime
+from itertools import islice
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Generator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+from uuid import uuid4
+from sensor_app.core.domain.bulk import (
+    SENSOR_EXPORT_FORMATS,
+    SENSOR_FILE_FORMATS,
+    sensor_file_format,
+)
+from sensor_app.core.domain.entities import Sensor, SensorImport
+from sensor_app.core.ports.secondary import SensorFileStore
+
+try:
+    import pyarrow.parquet  # type: ignore
+except ImportError:  # pragma: no cover
+    pyarrow = None
+
+logger = logging.getLogger()
+
+SensorColumns = Tuple[Sequence[Optional[str]], Sequence[Any]]
+
+SENSOR_COLUMNS = tuple(Sensor.model_fields)
+
+# Parquet is compressed column by column inside the file, gzip on top of it would
+# only stop readers from skipping to the columns they need
+_EXPORT_EXTENSIONS = {"ndjson": "ndjson.gz", "csv": "csv.gz", "parquet": "parquet"}
+
+_EXPORTS_DIRECTORY = "exports"
+
+
+def _csv_columns(path: str, chunk_size: int) -> Generator[SensorColumns, None, None]:
+    # utf-8-sig drops the byte order mark spreadsheets put in front of the header
+    with open(path, newline="", encoding="utf-8-sig") as stream:
+        reader = csv.reader(stream)
+        header = [column.strip().lower() for column in next(reader, [])]
+        if "name" not in header or "value" not in header:
+            raise ValueError("Sensor CSV files need a header with name and value")
+        name_index, value_index = header.index("name"), header.index("value")
+        while rows := list(islice(reader, chunk_size)):
+            # Short rows get None, rejected by validation like any invalid cell
+            yield (
+                [row[name_index] if len(row) > name_index else None for row in rows],
+                [row[value_index] if len(row) > value_index else None for row in rows],
+            )
+
+
+def _parquet_columns(
+    path: str, chunk_size: int
+) -> Generator[SensorColumns, None, None]:
+    parquet_file = pyarrow.parquet.ParquetFile(path)
+    for batch in parquet_file.iter_batches(
+        batch_size=chunk_size, columns=["name", "value"]
+    ):
+        # Nulls become None names and NaN values
+        yield (
+            batch.column("name").to_pylist(),
+            batch.column("value").to_numpy(zero_copy_only=False),
+        )
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+class _NdjsonExportWriter:
+    def __init__(self, path: str, gzip_level: int):
+        self.stream = gzip.open(path, "wb", compresslevel=gzip_level)
+
+    def write(self, batch: List[Sensor]) -> None:
+        self.stream.write(
+            b"".join(sensor.model_dump_json().encode() + b"\n" for sensor in batch)
+        )
+
+    def close(self) -> None:
+        self.stream.close()
+
+
+class _CsvExportWriter:
+    def __init__(self, path: str, gzip_level: int):
+        self.stream = io.TextIOWrapper(
+            gzip.open(path, "wb", compresslevel=gzip_level),
+            encoding="utf-8",
+            newline="",
+        )
+        self.writer = csv.writer(self.stream, lineterminator="\n")
+        self.writer.writerow(SENSOR_COLUMNS)
+
+    def write(self, batch: List[Sensor]) -> None:
+        self.writer.writerows(
+            [_csv_value(getattr(sensor, name)) for name in SENSOR_COLUMNS]
+            for sensor in batch
+        )
+
+    def close(self) -> None:
+        self.stream.close()
+
+
+def _arrow_schema(id_type: Any) -> Any:
+    return pyarrow.schema(
+        [
+            ("id", id_type),
+            ("name", pyarrow.string()),
+            ("value", pyarrow.float64()),
+            ("version", pyarrow.int64()),
+            ("updated_at", pyarrow.timestamp("us", tz="UTC")),
+        ]
+    )
+
+
+class _ParquetExportWriter:
+    # One row group per batch. Ids are int64, or strings for adapters with string
+    # ids (MongoDB), decided on the first batch.
+    def __init__(self, path: str, gzip_level: int):
+        self.path = path
+        self.writer: Any = None
+
+    def write(self, batch: List[Sensor]) -> None:
+        if self.writer is None:
+            id_type = (
+                pyarrow.int64()
+                if all(isinstance(sensor.id, int) for sensor in batch)
+                else pyarrow.string()
+            )
+            self.writer = pyarrow.parquet.ParquetWriter(
+                self.path, _arrow_schema(id_type), compression="zstd"
+            )
+        ids = [sensor.id for sensor in batch]
+        if self.writer.schema.field("id").type == pyarrow.string():
+            ids = [str(sensor_id) for sensor_id in ids]
+        self.writer.write_table(
+            pyarrow.table(
+                [ids]
+                + [
+                    [getattr(sensor, name) for sensor in batch]
+                    for name in SENSOR_COLUMNS[1:]
+                ],
+                schema=self.writer.schema,
+            )
+        )
+
+    def close(self) -> None:
+        if self.writer is None:
+            # No sensors, still a valid (empty) file
+            self.writer = pyarrow.parquet.ParquetWriter(
+                self.path, _arrow_schema(pyarrow.int64()), compression="zstd"
+            )
+        self.writer.close()
+
+
+_EXPORT_WRITERS: Dict[str, Callable[[str, int], Any]] = {
+    "ndjson": _NdjsonExportWriter,
+    "csv": _CsvExportWriter,
+    "parquet": _ParquetExportWriter,
+}
+
+
+class LocalSensorFileStore(SensorFileStore):
+    # Sensor files in a local directory, a shared volume when the web server and the
+    # workers run on different hosts. Files are written under a temporary name and
+    # renamed once complete, so a reader never sees a partial file. File I/O runs on
+    # worker threads, parsing and compression included, to keep the event loop
+    # free. Exports go to an exports subdirectory, apart from the uploads. The
+    # progress of an import is kept next to its file, and uploads older than
+    # upload_retention_seconds (those of failed imports, imported ones are deleted)
+    # are removed whenever a new one is saved. Likewise exports older than
+    # export_retention_seconds are removed whenever a new one is written.
+    def __init__(
+        self,
+        directory: str,
+        gzip_level: int = 6,
+        upload_retention_seconds: float = 7 * 24 * 3600,
+        export_retention_seconds: float = 24 * 3600,
+    ):
+        self.directory = directory
+        self.exports_directory = os.path.join(directory, _EXPORTS_DIRECTORY)
+        self.gzip_level = gzip_level
+        self.upload_retention_seconds = upload_retention_seconds
+        self.export_retention_seconds = export_retention_seconds
+
+    def file_formats(self) -> Sequence[str]:
+        if pyarrow is None:
+            return [
+                file_format
+                for file_format in SENSOR_FILE_FORMATS
+                if file_format != "parquet"
+            ]
+        return list(SENSOR_FILE_FORMATS)
+
+    def path(self, file_name: str, directory: Optional[str] = None) -> str:
+        # Only plain names generated by save, nothing that leaves the directory
+        if (
+            not file_name
+            or os.path.basename(file_name) != file_name
+            or file_name.startswith(".")
+        ):
+            raise ValueError(f"Invalid sensor file name {file_name!r}")
+        return os.path.join(directory or self.directory, file_name)
+
+    async def save(self, chunks: AsyncIterator[bytes], file_format: str) -> str:
+        if file_format not in self.file_formats():
+            raise ValueError(f"Unsupported sensor file format {file_format!r}")
+        file_name = f"{uuid4().hex}.{file_format}"
+        path = self.path(file_name)
+        partial_path = os.path.join(self.directory, f".{file_name}.part")
+        await asyncio.to_thread(os.makedirs, self.directory, exist_ok=True)
+        stream = await asyncio.to_thread(open, partial_path, "wb")
+        try:
+            try:
+                async for chunk in chunks:
+                    await asyncio.to_thread(stream.write, chunk)
+            finally:
+                await asyncio.to_thread(stream.close)
+            await asyncio.to_thread(os.replace, partial_path, path)
+        except BaseException:
+            await asyncio.to_thread(_remove, partial_path)
+            raise
+        await asyncio.to_thread(
+            _remove_expired, self.directory, self.upload_retention_seconds
+        )
+        return file_name
+
+    def _progress_path(self, file_name: str) -> str:
+        # Hidden, like partial files, so it can't be asked for as a sensor file
+        self.path(file_name)
+        return os.path.join(self.directory, f".{file_name}.progress")
+
+    async def read_sensor_columns(
+        self, file_name: str, chunk_size: int
+    ) -> AsyncIterator[SensorColumns]:
+        file_format = sensor_file_format(file_name)
+        if file_format is None or file_format not in self.file_formats():
+            raise ValueError(f"Unsupported sensor file {file_name!r}")
+        read_columns = _parquet_columns if file_format == "parquet" else _csv_columns
+        chunks = read_columns(self.path(file_name), chunk_size)
+        try:
+            while True:
+                columns: Optional[SensorColumns] = await asyncio.to_thread(
+                    next, chunks, None
+                )
+                if columns is None:
+                    return
+                yield columns
+        finally:
+            chunks.close()
+
+    async def delete(self, file_name: str) -> None:
+        await asyncio.to_thread(_remove, self.path(file_name))
+        await asyncio.to_thread(_remove, self._progress_path(file_name))
+
+    async def read_import_progress(self, file_name: str) -> Optional[SensorImport]:
+        try:
+            content = await asyncio.to_thread(
+                _read_bytes, self._progress_path(file_name)
+            )
+        except FileNotFoundError:
+            return None
+        return SensorImport.model_validate_json(content)
+
+    async def save_import_progress(self, progress: SensorImport) -> None:
+        path = self._progress_path(progress.file_name)
+        await asyncio.to_thread(
+            _replace_bytes, path, progress.model_dump_json().encode()
+        )
+
+    def export_formats(self) -> Sequence[str]:
+        if pyarrow is None:
+            return [
+                file_format
+                for file_format in SENSOR_EXPORT_FORMATS
+                if file_format != "parquet"
+            ]
+        return list(SENSOR_EXPORT_FORMATS)
+
+    async def write_sensors(
+        self, batches: AsyncIterator[List[Sensor]], file_format: str
+    ) -> str:
+        if file_format not in self.export_formats():
+            raise ValueError(f"Unsupported sensor export format {file_format!r}")
+        file_name = f"sensors-{uuid4().hex}.{_EXPORT_EXTENSIONS[file_format]}"
+        path = self.path(file_name, self.exports_directory)
+        partial_path = os.path.join(self.exports_directory, f".{file_name}.part")
+        await asyncio.to_thread(os.makedirs, self.exports_directory, exist_ok=True)
+        writer = await asyncio.to_thread(
+            _EXPORT_WRITERS[file_format], partial_path, self.gzip_level
+        )
+        try:
+            try:
+                async for batch in batches:
+                    await asyncio.to_thread(writer.write, batch)
+            finally:
+                await asyncio.to_thread(writer.close)
+            await asyncio.to_thread(os.replace, partial_path, path)
+        except BaseException:
+            await asyncio.to_thread(_remove, partial_path)
+            raise
+        await asyncio.to_thread(
+            _remove_expired, self.exports_directory, self.export_retention_seconds
+        )
+        return file_name
+
+    async def export_path(self, file_name: str) -> Optional[str]:
+        try:
+            path = self.path(file_name, self.exports_directory)
+        except ValueError:
+            return None
+        return path if await asyncio.to_thread(os.path.isfile, path) else None
+
+
+def _read_bytes(path: str) -> bytes:
+    with open(path, "rb") as stream:
+        return stream.read()
+
+
+def _replace_bytes(path: str, content: bytes) -> None:
+    # Written aside and renamed, a crash never leaves a truncated file
+    partial_path = f"{path}.part"
+    with open(partial_path, "wb") as stream:
+        stream.write(content)
+    os.replace(partial_path, path)
+
+
+def _remove_expired(directory: str, max_age_seconds: float) -> None:
+    # Files directly in the directory (not its subdirectories) last modified more
+    # than max_age_seconds ago, partial files and import progress included
+    expired_before = time.time() - max_age_seconds
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            try:
+                expired = entry.is_file() and entry.stat().st_mtime < expired_before
+            except FileNotFoundError:
+                # Removed meanwhile, e.g. by another process
+                continue
+            if expired:
+                logger.info(f"Removing expired sensor file {entry.path}")
+                _remove(entry.path)
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(f"Could not remove sensor file {path}: {e}")
@@ -0,0 +1,7 @@
+from sensor_app.adapters.secondary.write_behind.sensor_write_buffer import (
+    AsyncioSensorWriteBuffer,
+)
+
+__all__ = [
+    "AsyncioSensorWriteBuffer",
+]
@@ -0,0 +1,139 @@
+import asyncio
+import logging
+from typing import List, Optional, Tuple
+from sensor_app.core.domain.entities import Sensor
+from sensor_app.core.ports.secondary import SensorRepository, SensorWriteBuffer
+
+logger = logging.getLogger()
+
+# A queued sensor and the future of the caller waiting for it to be written, None
+# when the caller only wanted the acknowledgement
+_QueuedWrite = Tuple[Sensor, Optional[asyncio.Future]]
+
+
+class AsyncioSensorWriteBuffer(SensorWriteBuffer):
+    # A single flusher task drains the queue: it takes what is waiting, up to
+    # max_batch_size, and waits at most flush_interval_ms for a batch to fill before
+    # writing it with one create_sensors. When max_queue_size sensors are waiting,
+    # write() blocks until the flusher catches up (backpressure). Once drain starts
+    # new writes are rejected, and drain waits for the writers already blocked on
+    # the full queue before waiting for the queue to be written.
+    def __init__(
+        self,
+        sensor_repo: SensorRepository,
+        max_batch_size: int = 500,
+        flush_interval_ms: float = 5.0,
+        max_queue_size: int = 10000,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.sensor_repo = sensor_repo
+        self.max_batch_size = max_batch_size
+        self.flush_interval_ms = flush_interval_ms
+        self.max_queue_size = max_queue_size
+        self._queue: asyncio.Queue[_QueuedWrite] = asyncio.Queue(maxsize=max_queue_size)
+        self._flusher: Optional[asyncio.Task] = None
+        self._closed = False
+        # Writers between the closed check and the end of their put
+        self._writers = 0
+        self._no_writers = asyncio.Event()
+        self._no_writers.set()
+        self.flushed_batches = 0
+        self.failed_writes = 0
+
+    async def start(self) -> None:
+        if self._flusher is None or self._flusher.done():
+            self._closed = False
+            # A new queue, bound to the loop running the new flusher
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+            self._no_writers = asyncio.Event()
+            if not self._writers:
+                self._no_writers.set()
+            self._flusher = asyncio.ensure_future(self._flush_forever())
+
+    async def drain(self) -> None:
+        if self._flusher is None:
+            return
+        self._closed = True
+        # Everything accepted before closing is written before the repository
+        # closes, including the sensors of writers still waiting for room
+        await self._no_writers.wait()
+        await self._queue.join()
+        flusher, self._flusher = self._flusher, None
+        flusher.cancel()
+        try:
+            await flusher
+        except asyncio.CancelledError:
+            pass
+
+    async def write(
+        self, sensor: Sensor, wait_for_durability: bool = True
+    ) -> Optional[Sensor]:
+        if self._closed:
+            raise RuntimeError("The sensor write buffer is drained")
+        if self._flusher is None:
+            await self.start()
+
+        future = (
+            asyncio.get_running_loop().create_future() if wait_for_durability else None
+        )
+        self._writers += 1
+        self._no_writers.clear()
+        try:
+            await self._queue.put((sensor, future))
+        finally:
+            self._writers -= 1
+            if not self._writers:
+                self._no_writers.set()
+        if future is None:
+            return None
+        return await future
+
+    async def _next_batch(self) -> List[_QueuedWrite]:
+        batch = [await self._queue.get()]
+        deadline = asyncio.get_running_loop().time() + self.flush_interval_ms / 1000
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - asyncio.get_running_loop().time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _flush_forever(self) -> None:
+        while True:
+            batch = await self._next_batch()
+            try:
+                await self._flush(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _flush(self, batch: List[_QueuedWrite]) -> None:
+        try:
+            created_sensors = await self.sensor_repo.create_sensors(
+                sensor for sensor, _ in batch
+            )
+        except Exception as e:
+            self.failed_writes += len(batch)
+            acknowledged = sum(1 for _, future in batch if future is None)
+            if acknowledged:
+                # Nobody is waiting for these, the error log is all that's left
+                logger.error(
+                    f"Write-behind flush lost {acknowledged} acknowledged sensors: {e}"
+                )
+            for _, future in batch:
+                if future is not None and not future.done():
+                    future.set_exception(e)
+            return
+
+        self.flushed_batches += 1
+        # create_sensors returns the sensors in input order
+        for (_, future), created_sensor in zip(batch, created_sensors):
+            if future is not None and not future.done():
+                future.set_result(created_sensor)
@@ -0,0 +1,116 @@
+import numpy as np
+from datetime import datetime, timezone
+from typing import Iterable, List, Sequence, Union
+from sensor_app.core.domain.entities import ReadingAggregate, SensorReading
+
+# Bucket sizes understood by every adapter (date_trunc / $dateTrunc units)
+READING_BUCKETS = ("minute", "hour", "day", "week", "month")
+
+_BUCKET_SECONDS = {"minute": 60, "hour": 3600, "day": 86400, "week": 604800}
+
+# Weeks start on Monday like Postgres date_trunc, 1970-01-01 was a Thursday so
+# the first Monday boundary is three days before the epoch
+_WEEK_OFFSET_SECONDS = -3 * 86400
+
+
+def percentile_key(percentile: float) -> str:
+    return f"p{percentile * 100:g}"
+
+
+def as_utc(moment: datetime) -> datetime:
+    # Naive datetimes are taken as UTC, the time zone buckets are computed in
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment
+
+
+def validate_aggregation(
+    start: datetime, end: datetime, bucket: str, percentiles: Sequence[float]
+) -> None:
+    if bucket not in READING_BUCKETS:
+        raise ValueError(f"bucket must be one of {', '.join(READING_BUCKETS)}")
+    if start >= end:
+        raise ValueError("start must be before end")
+    if any(percentile < 0 or percentile > 1 for percentile in percentiles):
+        raise ValueError("percentiles must be between 0 and 1")
+
+
+def _bucket_starts(epoch_seconds: np.ndarray, bucket: str) -> np.ndarray:
+    if bucket == "month":
+        months = epoch_seconds.astype("datetime64[s]").astype("datetime64[M]")
+        return months.astype("datetime64[s]").astype(np.int64)
+    size = _BUCKET_SECONDS[bucket]
+    offset = _WEEK_OFFSET_SECONDS if bucket == "week" else 0
+    return (epoch_seconds - offset) // size * size + offset
+
+
+def aggregate_readings(
+    readings: Iterable[SensorReading],
+    bucket: str,
+    percentiles: Sequence[float] = (),
+) -> List[ReadingAggregate]:
+    readings = list(readings)
+    if not readings:
+        return []
+    epoch_seconds = np.fromiter(
+        (reading.recorded_at.timestamp() for reading in readings),
+        dtype=np.float64,
+        count=len(readings),
+    )
+    values = np.fromiter(
+        (reading.value for reading in readings), dtype=np.float64, count=len(readings)
+    )
+    return aggregate_columns(
+        readings[0].sensor_id, epoch_seconds, values, bucket, percentiles
+    )
+
+
+def aggregate_columns(
+    sensor_id: Union[int, str],
+    epoch_seconds: np.ndarray,
+    values: np.ndarray,
+    bucket: str,
+    percentiles: Sequence[float] = (),
+) -> List[ReadingAggregate]:
+    # In-process equivalent of the SQL/pipeline aggregations for adapters that
+    # hold readings in memory. Buckets are computed in UTC for all rows at once and
+    # per bucket min/max/sum come from a single reduceat over the sorted values.
+    if len(values) == 0:
+        return []
+
+    bucket_starts = _bucket_starts(np.floor(epoch_seconds).astype(np.int64), bucket)
+    order = np.argsort(bucket_starts, kind="stable")
+    bucket_starts = bucket_starts[order]
+    values = values[order]
+
+    unique_starts, group_starts, counts = np.unique(
+        bucket_starts, return_index=True, return_counts=True
+    )
+    minimums = np.minimum.reduceat(values, group_starts)
+    maximums = np.maximum.reduceat(values, group_starts)
+    means = np.add.reduceat(values, group_starts) / counts
+
+    aggregates = []
+    for index, group_start in enumerate(group_starts):
+        aggregate_percentiles = {}
+        if percentiles:
+            group_values = values[group_start : group_start + counts[index]]
+            quantiles = np.quantile(group_values, percentiles)
+            aggregate_percentiles = {
+                percentile_key(percentile): float(quantile)
+                for percentile, quantile in zip(percentiles, quantiles)
+            }
+        aggregates.append(
+            ReadingAggregate(
+                sensor_id=sensor_id,
+                bucket_start=datetime.fromtimestamp(
+                    int(unique_starts[index]), tz=timezone.utc
+                ),
+                count=int(counts[index]),
+                min=float(minimums[index]),
+                max=float(maximums[index]),
+                mean=float(means[index]),
+                percentiles=aggregate_percentiles,
+            )
+        )
+    return aggregates
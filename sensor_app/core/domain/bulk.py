@@ -0,0 +1,75 @@
+import numpy as np
+from typing import Any, List, Optional, Sequence, Tuple
+
+# File formats of bulk sensor imports
+SENSOR_FILE_FORMATS = ("csv", "parquet")
+
+# File formats of bulk sensor exports, the text ones are gzip compressed
+SENSOR_EXPORT_FORMATS = ("ndjson", "csv", "parquet")
+
+
+def sensor_file_format(file_name: Optional[str]) -> Optional[str]:
+    # From the file extension, None when it isn't one of SENSOR_FILE_FORMATS
+    if not file_name or "." not in file_name:
+        return None
+    extension = file_name.rsplit(".", 1)[1].lower()
+    return extension if extension in SENSOR_FILE_FORMATS else None
+
+
+def _to_float(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def sensor_values(raw_values: Sequence[Any]) -> np.ndarray:
+    # Numbers as float64, strings parsed, NaN for anything that isn't a number. The
+    # whole column is converted at once, element by element only when that fails.
+    column = np.asarray(raw_values)
+    if column.dtype.kind in "fiub":
+        return column.astype(np.float64, copy=False)
+    try:
+        return column.astype(np.float64)
+    except (TypeError, ValueError):
+        return np.fromiter(
+            (_to_float(value) for value in column),
+            dtype=np.float64,
+            count=len(column),
+        )
+
+
+def validate_sensor_columns(
+    names: Sequence[Optional[str]], values: Sequence[Any]
+) -> Tuple[List[str], List[float], np.ndarray]:
+    # Checks a chunk of rows column-wise instead of building a Sensor per row.
+    # Names must be non-blank text without NUL characters (Postgres rejects them),
+    # values finite numbers. Returns the names and values of the valid rows and
+    # the offsets of the rejected ones within the chunk.
+    name_column = np.asarray(names, dtype=object)
+    parsed_values = sensor_values(values)
+    if len(name_column) != len(parsed_values):
+        raise ValueError("names and values must have the same length")
+
+    is_text = np.fromiter(
+        (isinstance(name, str) for name in name_column),
+        dtype=bool,
+        count=len(name_column),
+    )
+    texts = np.where(is_text, name_column, "")
+    valid = (
+        is_text
+        & (np.char.str_len(np.char.strip(texts.astype(str))) > 0)
+        & np.isfinite(parsed_values)
+    )
+    # numpy strings end at the first NUL, so look for them in Python, row by row
+    # only in the rare chunks holding one
+    if "\x00" in "".join(texts.tolist()):
+        valid &= np.fromiter(
+            ("\x00" not in text for text in texts), dtype=bool, count=len(texts)
+        )
+    return (
+        texts[valid].tolist(),
+        parsed_values[valid].tolist(),
+        np.flatnonzero(~valid),
+    )
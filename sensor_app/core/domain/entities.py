@@ -1,8 +1,64 @@
 from pydantic import BaseModel
-from typing import Optional, Union
+from datetime import datetime
+from typing import Dict, List, Literal, Optional, Union
 
 
 class Sensor(BaseModel):
     id: Optional[Union[int, str]] = None
     name: str
     value: float
+    # Maintained by the repositories: version starts at 1 and is bumped by every
+    # update, updated_at is the time of the last write
+    version: Optional[int] = None
+    updated_at: Optional[datetime] = None
+
+
+class SensorReading(BaseModel):
+    sensor_id: Union[int, str]
+    recorded_at: datetime
+    value: float
+
+
+class ReadingAggregate(BaseModel):
+    sensor_id: Union[int, str]
+    bucket_start: datetime
+    count: int
+    min: float
+    max: float
+    mean: float
+    percentiles: Dict[str, float] = {}
+
+
+SensorChangeOperation = Literal["insert", "update", "delete"]
+
+
+class SensorChange(BaseModel):
+    operation: SensorChangeOperation
+    sensor_id: Union[int, str]
+    # The sensor after the change, None for deletes
+    sensor: Optional[Sensor] = None
+
+
+class SensorImport(BaseModel):
+    # Progress of a bulk import, reported after every chunk and returned at the end
+    file_name: str
+    chunks: int = 0
+    # Data rows read from the file, loaded or rejected
+    rows: int = 0
+    loaded: int = 0
+    rejected: int = 0
+    # Data row numbers (the first row after the header is 1) of the first rejected
+    # rows, capped so the task meta stays small
+    rejected_rows: List[int] = []
+    done: bool = False
+
+
+class SensorExport(BaseModel):
+    # Progress of a bulk export, reported after every batch and returned at the end
+    file_format: str
+    exported: int = 0
+    # Sensor count when the export started, rows written meanwhile change it
+    total: Optional[int] = None
+    # Set once the file is complete, the name to download it by
+    file_name: Optional[str] = None
+    done: bool = False
@@ -0,0 +1,11 @@
+class InvalidSensorId(ValueError):
+    # A sensor id (or pagination cursor) the repository cannot parse, e.g. text
+    # for an integer id or a malformed ObjectId. Raised the same way by every
+    # adapter so callers can answer 422 whatever the storage.
+    pass
+
+
+class SensorNotFound(ValueError):
+    # A write referencing a sensor that doesn't exist, e.g. readings for an unknown
+    # sensor_id
+    pass
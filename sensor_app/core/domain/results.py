@@ -1,7 +1,6 @@
 from pydantic import BaseModel
 from typing import Optional, Any
 from datetime import datetime
-import json
 import logging
 
 logger = logging.getLogger()
@@ -16,26 +15,44 @@ class AsyncResult(BaseModel):
     args: Optional[Any] = None
     kwargs: Optional[Any] = None
     date_done: Optional[datetime] = None
+    group_id: Optional[str] = None
 
     def __init__(self, **data):
         super().__init__(**data)
         # Attempt to serialize the `result` field
         self.result = self.serialize_result(self.result) or self.result
 
-    def serialize_result(self, result: Any) -> str:
-        if isinstance(result, BaseModel):
-            # If the result is a BaseModel, skip serialization
-            return result
-        elif isinstance(result, list) and all(
-            isinstance(item, BaseModel) for item in result
-        ):
-            # If the result is a list of BaseModels, skip serialization
-            return result
-        else:
-            try:
-                # Attempt to serialize `result` directly
-                json.dumps(result)
-            except Exception as e:
-                logger.warning(f"Problem serializing AsyncResult {self.id} error: {e}")
-                return str(result)
+    def serialize_result(self, result: Any) -> Any:
+        if is_json_serializable(result):
             return None
+        logger.warning(
+            f"Problem serializing AsyncResult {self.id} error: "
+            f"{type(result).__name__} result is not JSON serializable"
+        )
+        return str(result)
+
+
+_JSON_SCALARS = (str, int, float, bool, type(None))
+
+
+def is_json_serializable(value: Any, _ancestors: Optional[set] = None) -> bool:
+    # Same verdict as json.dumps (BaseModels are accepted anywhere, pydantic dumps
+    # them) but by walking the types, without encoding a result only to drop it
+    if isinstance(value, (_JSON_SCALARS, BaseModel)):
+        return True
+    if not isinstance(value, (list, tuple, dict)):
+        return False
+
+    ancestors = _ancestors if _ancestors is not None else set()
+    if id(value) in ancestors:
+        # json.dumps rejects circular references
+        return False
+    ancestors.add(id(value))
+    try:
+        if isinstance(value, dict):
+            return all(isinstance(key, _JSON_SCALARS) for key in value) and all(
+                is_json_serializable(item, ancestors) for item in value.values()
+            )
+        return all(is_json_serializable(item, ancestors) for item in value)
+    finally:
+        ancestors.discard(id(value))
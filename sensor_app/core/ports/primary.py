@@ -1,6 +1,104 @@
-from typing import Protocol
+import functools
+import inspect
+import logging
+import time
+from typing import AsyncGenerator, Callable, List, Optional, Protocol
+
+logger = logging.getLogger()
+
+# Called after every use case invocation with the use case name, the duration in
+# seconds and the exception it raised (if any). Adapters register observers to
+# export metrics, so the core stays free of any metrics library.
+UseCaseObserver = Callable[[str, float, Optional[BaseException]], None]
+
+_use_case_observers: List[UseCaseObserver] = []
+
+
+def add_use_case_observer(observer: UseCaseObserver) -> None:
+    if observer not in _use_case_observers:
+        _use_case_observers.append(observer)
+
+
+def remove_use_case_observer(observer: UseCaseObserver) -> None:
+    if observer in _use_case_observers:
+        _use_case_observers.remove(observer)
+
+
+def _notify_observers(
+    name: str, duration: float, error: Optional[BaseException]
+) -> None:
+    for observer in _use_case_observers:
+        try:
+            observer(name, duration, error)
+        except Exception as e:
+            logger.warning(f"Use case observer failed for {name}: {e}")
+
+
+async def _observed_stream(
+    name: str, stream: AsyncGenerator, start: float
+) -> AsyncGenerator:
+    # Use cases returning a stream are timed until it is exhausted, fails or is
+    # closed, not only while the generator is created
+    error = None
+    try:
+        async for item in stream:
+            yield item
+    except GeneratorExit:
+        # The consumer stopped early, that is not a failure
+        raise
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        try:
+            await stream.aclose()
+        finally:
+            _notify_observers(name, time.perf_counter() - start, error)
+
+
+def _observed(name: str, call: Callable) -> Callable:
+    if inspect.iscoroutinefunction(call):
+
+        @functools.wraps(call)
+        async def observed_async_call(self, *args, **kwargs):
+            if not _use_case_observers:
+                return await call(self, *args, **kwargs)
+            error = None
+            start = time.perf_counter()
+            try:
+                return await call(self, *args, **kwargs)
+            except BaseException as e:
+                error = e
+                raise
+            finally:
+                _notify_observers(name, time.perf_counter() - start, error)
+
+        return observed_async_call
+
+    @functools.wraps(call)
+    def observed_call(self, *args, **kwargs):
+        if not _use_case_observers:
+            return call(self, *args, **kwargs)
+        start = time.perf_counter()
+        try:
+            result = call(self, *args, **kwargs)
+        except BaseException as e:
+            _notify_observers(name, time.perf_counter() - start, e)
+            raise
+        if inspect.isasyncgen(result):
+            return _observed_stream(name, result, start)
+        _notify_observers(name, time.perf_counter() - start, None)
+        return result
+
+    return observed_call
 
 
 class UseCase(Protocol):
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Every concrete use case is timed without any code of its own
+        if "__call__" in cls.__dict__ and not getattr(cls, "_is_protocol", False):
+            cls.__call__ = _observed(cls.__name__, cls.__dict__["__call__"])
+
     def __call__(self, *args, **kwargs):
         raise NotImplementedError()
@@ -1,5 +1,23 @@
-from typing import Protocol, List, Optional
-from sensor_app.core.domain.entities import Sensor
+from datetime import datetime
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Iterable,
+    Protocol,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+from sensor_app.core.domain.entities import (
+    ReadingAggregate,
+    Sensor,
+    SensorChange,
+    SensorImport,
+    SensorReading,
+)
 from sensor_app.core.domain.results import AsyncResult
 
 
@@ -7,28 +25,172 @@ class BackgroundJobsRepository(Protocol):
     def send_task(self, task_name: str, *args, **kwargs) -> AsyncResult:
         pass
 
+    def send_task_group(self, task_name: str, kwargs_list: List[dict]) -> AsyncResult:
+        pass
+
     def retry_task(self, task_id: str) -> AsyncResult:
         pass
 
     def get_task_results(self, task_id: str) -> AsyncResult:
         pass
 
+    def get_task_results_many(self, task_ids: Sequence[str]) -> List[AsyncResult]:
+        pass
+
+    def get_task_group_results(self, group_id: str) -> AsyncResult:
+        pass
+
+
+class AsyncBackgroundJobsRepository(Protocol):
+    # Same operations as BackgroundJobsRepository for callers running on an event
+    # loop, broker and result backend I/O never blocks the loop
+    async def connect(self) -> None:
+        pass
+
+    async def disconnect(self) -> None:
+        pass
+
+    async def send_task(self, task_name: str, *args, **kwargs) -> AsyncResult:
+        pass
+
+    async def send_task_group(
+        self, task_name: str, kwargs_list: List[dict]
+    ) -> AsyncResult:
+        pass
+
+    async def retry_task(self, task_id: str) -> AsyncResult:
+        pass
+
+    async def get_task_results(self, task_id: str) -> AsyncResult:
+        pass
+
+    async def get_task_results_many(self, task_ids: Sequence[str]) -> List[AsyncResult]:
+        pass
+
+    async def get_task_group_results(self, group_id: str) -> AsyncResult:
+        pass
+
+    def watch_task_results(
+        self, task_ids: Sequence[str]
+    ) -> AsyncGenerator[AsyncResult, None]:
+        # Current result of every task, then each state change until all of
+        # them reached a ready state (SUCCESS, FAILURE, REVOKED)
+        pass
+
 
 class SensorRepository(Protocol):
+    async def connect(self) -> None:
+        pass
+
+    async def disconnect(self) -> None:
+        pass
+
     async def count_sensors(self) -> int:
         pass
 
     async def create_sensor(self, sensor: Sensor) -> Sensor:
         pass
 
+    async def create_sensors(self, sensors: Iterable[Sensor]) -> List[Sensor]:
+        pass
+
+    async def load_sensors(self, names: Sequence[str], values: Sequence[float]) -> int:
+        # Bulk load of already validated rows, nothing is read back: returns the
+        # number of sensors created
+        pass
+
     async def get_sensor(self, sensor_id: int) -> Optional[Sensor]:
         pass
 
+    async def get_sensors(self, sensor_ids: Iterable[Union[int, str]]) -> List[Sensor]:
+        pass
+
     async def update_sensor(self, sensor: Sensor) -> Sensor:
         pass
 
     async def delete_sensor(self, sensor_id: int) -> None:
         pass
 
-    async def list_sensors(self) -> List[Sensor]:
+    async def list_sensors(
+        self, after_id: Optional[Union[int, str]] = None, limit: Optional[int] = None
+    ) -> List[Sensor]:
+        pass
+
+    def stream_sensors(self, batch_size: int = 1000) -> AsyncGenerator[Sensor, None]:
+        pass
+
+    def watch_sensors(self) -> AsyncGenerator[SensorChange, None]:
+        # Every sensor created, updated or deleted from now on, until closed
+        pass
+
+    async def append_readings(self, readings: Iterable[SensorReading]) -> int:
+        pass
+
+    async def aggregate_readings(
+        self,
+        sensor_id: Union[int, str],
+        start: datetime,
+        end: datetime,
+        bucket: str,
+        percentiles: Sequence[float] = (),
+    ) -> List[ReadingAggregate]:
+        pass
+
+
+class SensorWriteBuffer(Protocol):
+    # Write-behind queue in front of SensorRepository.create_sensors. Sensors are
+    # written in batches, write() waits for the batch holding the sensor to be
+    # committed, or returns once it is queued when wait_for_durability is False.
+    async def start(self) -> None:
+        pass
+
+    async def drain(self) -> None:
+        # Stop accepting writes and flush everything queued
+        pass
+
+    async def write(
+        self, sensor: Sensor, wait_for_durability: bool = True
+    ) -> Optional[Sensor]:
+        pass
+
+
+class SensorFileStore(Protocol):
+    # Files of sensors exchanged with the bulk import/export background jobs, by
+    # name. The web server and the workers must share the storage.
+    def file_formats(self) -> Sequence[str]:
+        pass
+
+    async def save(self, chunks: AsyncIterator[bytes], file_format: str) -> str:
+        # Stores the file and returns its name
+        pass
+
+    def read_sensor_columns(
+        self, file_name: str, chunk_size: int
+    ) -> AsyncIterator[Tuple[Sequence[Optional[str]], Sequence[Any]]]:
+        # The name and value columns of the file, up to chunk_size rows at a time
+        pass
+
+    async def delete(self, file_name: str) -> None:
+        # Deletes the file and its import progress
+        pass
+
+    async def read_import_progress(self, file_name: str) -> Optional[SensorImport]:
+        # Progress saved by the last import of the file, None if it never started
+        pass
+
+    async def save_import_progress(self, progress: SensorImport) -> None:
+        pass
+
+    def export_formats(self) -> Sequence[str]:
+        pass
+
+    async def write_sensors(
+        self, batches: AsyncIterator[List[Sensor]], file_format: str
+    ) -> str:
+        # Writes an export batch by batch and returns its name once complete
+        pass
+
+    async def export_path(self, file_name: str) -> Optional[str]:
+        # Local path of a complete export for zero-copy serving, None if there is
+        # no such export
         pass
@@ -1,38 +1,100 @@
 import logging
-from typing import List
+from typing import AsyncGenerator, List, Sequence
 from sensor_app.core.ports.primary import UseCase
-from sensor_app.core.ports.secondary import BackgroundJobsRepository
+from sensor_app.core.ports.secondary import AsyncBackgroundJobsRepository
 from sensor_app.core.domain.results import AsyncResult
 
 logger = logging.getLogger()
 
 
 class RetryBackgroundTaskById(UseCase):
-    def __init__(self, background_jobs_repo: BackgroundJobsRepository):
+    def __init__(self, background_jobs_repo: AsyncBackgroundJobsRepository):
         self.background_jobs_repo = background_jobs_repo
 
     async def __call__(self, task_id: str):
-        results = self.background_jobs_repo.retry_task(task_id)
+        results = await self.background_jobs_repo.retry_task(task_id)
         return results
 
 
 class GetBackgroundTaskResultsById(UseCase):
-    def __init__(self, background_jobs_repo: BackgroundJobsRepository):
+    def __init__(self, background_jobs_repo: AsyncBackgroundJobsRepository):
         self.background_jobs_repo = background_jobs_repo
 
     async def __call__(self, task_id: str):
-        results = self.background_jobs_repo.get_task_results(task_id)
+        results = await self.background_jobs_repo.get_task_results(task_id)
         return results
 
 
+class GetBackgroundTaskResultsByIds(UseCase):
+    def __init__(self, background_jobs_repo: AsyncBackgroundJobsRepository):
+        self.background_jobs_repo = background_jobs_repo
+
+    async def __call__(self, task_ids: Sequence[str]) -> List[AsyncResult]:
+        if not task_ids:
+            return []
+        return await self.background_jobs_repo.get_task_results_many(task_ids)
+
+
+class WatchBackgroundTaskResults(UseCase):
+    def __init__(self, background_jobs_repo: AsyncBackgroundJobsRepository):
+        self.background_jobs_repo = background_jobs_repo
+
+    def __call__(self, task_ids: Sequence[str]) -> AsyncGenerator[AsyncResult, None]:
+        if not task_ids:
+            raise ValueError("At least one task id is required")
+        return self.background_jobs_repo.watch_task_results(task_ids)
+
+
+class GetBackgroundTaskGroupResultsById(UseCase):
+    def __init__(self, background_jobs_repo: AsyncBackgroundJobsRepository):
+        self.background_jobs_repo = background_jobs_repo
+
+    async def __call__(self, group_id: str):
+        results = await self.background_jobs_repo.get_task_group_results(group_id)
+        return results
+
+
+class StartChunkedBackgroundTask(UseCase):
+    def __init__(self, background_jobs_repo: AsyncBackgroundJobsRepository):
+        self.background_jobs_repo = background_jobs_repo
+
+    async def __call__(
+        self, task_name: str, count: int, chunk_size: int
+    ) -> AsyncResult:
+        if count < 1 or chunk_size < 1:
+            raise ValueError("count and chunk_size must be at least 1")
+
+        # Each chunk task receives its slice as count/offset
+        kwargs_list: List[dict] = [
+            {"count": min(chunk_size, count - offset), "offset": offset}
+            for offset in range(0, count, chunk_size)
+        ]
+        logger.info(
+            f"Starting the background task {task_name} as {len(kwargs_list)} chunks."
+        )
+        try:
+            results = await self.background_jobs_repo.send_task_group(
+                task_name=task_name, kwargs_list=kwargs_list
+            )
+            logger.info(f"Background task group {results.group_id} entered queue.")
+            return results
+        except Exception as e:
+            logger.error(
+                f"An error occurred while running the background task group: {e}"
+            )
+            raise
+
+
 class StartBackgroundTask(UseCase):
-    def __init__(self, background_jobs_repo: BackgroundJobsRepository):
+    def __init__(self, background_jobs_repo: AsyncBackgroundJobsRepository):
         self.background_jobs_repo = background_jobs_repo
 
-    async def __call__(self, task_name: str) -> AsyncResult:
+    async def __call__(self, task_name: str, **kwargs) -> AsyncResult:
         logger.info(f"Starting the background task {task_name}.")
         try:
-            results = self.background_jobs_repo.send_task(task_name=task_name)
+            results = await self.background_jobs_repo.send_task(
+                task_name=task_name, **kwargs
+            )
             logger.info(f"Background task {task_name} entered queue successfully.")
             return results
         except Exception as e:
@@ -0,0 +1,197 @@
+import logging
+from typing import AsyncGenerator, AsyncIterator, Callable, List, Optional
+from sensor_app.core.ports.primary import UseCase
+from sensor_app.core.ports.secondary import (
+    AsyncBackgroundJobsRepository,
+    SensorFileStore,
+    SensorRepository,
+)
+from sensor_app.core.domain.bulk import validate_sensor_columns
+from sensor_app.core.domain.entities import Sensor, SensorExport, SensorImport
+from sensor_app.core.domain.results import AsyncResult
+
+logger = logging.getLogger()
+
+# Rejected row numbers kept in the import progress
+MAX_REPORTED_REJECTED_ROWS = 100
+
+
+class SaveSensorFile(UseCase):
+    def __init__(self, sensor_files: SensorFileStore):
+        self.sensor_files = sensor_files
+
+    async def __call__(self, chunks: AsyncIterator[bytes], file_format: str) -> str:
+        if file_format not in self.sensor_files.file_formats():
+            raise ValueError(
+                f"Unsupported file format {file_format!r}, expected one of "
+                f"{', '.join(self.sensor_files.file_formats())}"
+            )
+        return await self.sensor_files.save(chunks, file_format)
+
+
+class ImportSensors(UseCase):
+    def __init__(
+        self,
+        sensor_repo: SensorRepository,
+        sensor_files: SensorFileStore,
+        chunk_size: int = 10000,
+    ):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        self.sensor_repo = sensor_repo
+        self.sensor_files = sensor_files
+        self.chunk_size = chunk_size
+
+    async def __call__(
+        self,
+        file_name: str,
+        on_progress: Optional[Callable[[SensorImport], None]] = None,
+    ) -> SensorImport:
+        # Loads the file chunk by chunk, each one validated as a whole and written
+        # with one bulk load. Invalid rows are skipped and counted. The progress is
+        # saved with the file after every committed chunk, so a retry after a
+        # failure resumes after the last saved chunk (one interrupted between its
+        # commit and the save is loaded again). The file is deleted once imported.
+        progress = await self.sensor_files.read_import_progress(file_name)
+        if progress is None:
+            progress = SensorImport(file_name=file_name)
+            logger.info(f"Importing sensors from {file_name}.")
+        else:
+            logger.info(
+                f"Resuming the import of {file_name} after row {progress.rows}."
+            )
+        imported_rows = progress.rows
+        rows = 0
+        async for names, values in self.sensor_files.read_sensor_columns(
+            file_name, self.chunk_size
+        ):
+            first_row = rows + 1
+            rows += len(names)
+            if rows <= imported_rows:
+                continue
+            if first_row <= imported_rows:
+                # The chunk size changed since the last attempt
+                skipped = imported_rows - first_row + 1
+                names, values = names[skipped:], values[skipped:]
+                first_row += skipped
+            valid_names, valid_values, rejected = validate_sensor_columns(names, values)
+            progress.loaded += await self.sensor_repo.load_sensors(
+                valid_names, valid_values
+            )
+            progress.rejected += len(rejected)
+            free_slots = MAX_REPORTED_REJECTED_ROWS - len(progress.rejected_rows)
+            if free_slots > 0:
+                progress.rejected_rows.extend(
+                    int(offset) + first_row for offset in rejected[:free_slots]
+                )
+            progress.chunks += 1
+            progress.rows = rows
+            await self.sensor_files.save_import_progress(progress)
+            if on_progress is not None:
+                on_progress(progress)
+
+        await self.sensor_files.delete(file_name)
+        progress.done = True
+        logger.info(
+            f"Imported {progress.loaded} sensors from {file_name}, "
+            f"{progress.rejected} rows rejected."
+        )
+        return progress
+
+
+class ExportSensors(UseCase):
+    def __init__(
+        self,
+        sensor_repo: SensorRepository,
+        sensor_files: SensorFileStore,
+        batch_size: int = 10000,
+    ):
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.sensor_repo = sensor_repo
+        self.sensor_files = sensor_files
+        self.batch_size = batch_size
+
+    async def _batches(
+        self,
+        progress: SensorExport,
+        on_progress: Optional[Callable[[SensorExport], None]],
+    ) -> AsyncGenerator[List[Sensor], None]:
+        # Progress is counted when the file store asks for the next batch, that is
+        # once the previous one is written
+        stream = self.sensor_repo.stream_sensors(batch_size=self.batch_size)
+        batch: List[Sensor] = []
+        try:
+            async for sensor in stream:
+                batch.append(sensor)
+                if len(batch) >= self.batch_size:
+                    yield batch
+                    progress.exported += len(batch)
+                    batch = []
+                    if on_progress is not None:
+                        on_progress(progress)
+            if batch:
+                yield batch
+                progress.exported += len(batch)
+        finally:
+            await stream.aclose()
+
+    async def __call__(
+        self,
+        file_format: str = "ndjson",
+        on_progress: Optional[Callable[[SensorExport], None]] = None,
+    ) -> SensorExport:
+        # Streams the whole table from the repository cursor into a file, memory
+        # stays flat whatever the number of sensors. Download it by file_name.
+        if file_format not in self.sensor_files.export_formats():
+            raise ValueError(
+                f"Unsupported export format {file_format!r}, expected one of "
+                f"{', '.join(self.sensor_files.export_formats())}"
+            )
+        progress = SensorExport(
+            file_format=file_format, total=await self.sensor_repo.count_sensors()
+        )
+        logger.info(f"Exporting {progress.total} sensors as {file_format}.")
+        batches = self._batches(progress, on_progress)
+        try:
+            progress.file_name = await self.sensor_files.write_sensors(
+                batches, file_format
+            )
+        finally:
+            await batches.aclose()
+        progress.done = True
+        logger.info(f"Exported {progress.exported} sensors to {progress.file_name}.")
+        return progress
+
+
+class StartSensorExport(UseCase):
+    # Checks the format before queueing the export, so an unsupported one is
+    # refused right away instead of failing in the worker
+    def __init__(
+        self,
+        background_jobs_repo: AsyncBackgroundJobsRepository,
+        sensor_files: SensorFileStore,
+        task_name: str = "export_sensors",
+    ):
+        self.background_jobs_repo = background_jobs_repo
+        self.sensor_files = sensor_files
+        self.task_name = task_name
+
+    async def __call__(self, file_format: str) -> AsyncResult:
+        if file_format not in self.sensor_files.export_formats():
+            raise ValueError(
+                f"Unsupported export format {file_format!r}, expected one of "
+                f"{', '.join(self.sensor_files.export_formats())}"
+            )
+        logger.info(f"Starting the {file_format} sensor export.")
+        return await self.background_jobs_repo.send_task(
+            task_name=self.task_name, file_format=file_format
+        )
+
+
+class GetSensorExport(UseCase):
+    def __init__(self, sensor_files: SensorFileStore):
+        self.sensor_files = sensor_files
+
+    async def __call__(self, file_name: str) -> Optional[str]:
+        return await self.sensor_files.export_path(file_name)
@@ -1,8 +1,12 @@
 import logging
-from typing import List, Optional
+from typing import AsyncGenerator, Iterable, List, Optional, Union
 from sensor_app.core.ports.primary import UseCase
-from sensor_app.core.ports.secondary import SensorRepository, BackgroundJobsRepository
-from sensor_app.core.domain.entities import Sensor
+from sensor_app.core.ports.secondary import (
+    SensorRepository,
+    BackgroundJobsRepository,
+    SensorWriteBuffer,
+)
+from sensor_app.core.domain.entities import Sensor, SensorChange
 
 logger = logging.getLogger()
 
@@ -27,29 +31,62 @@ class ListSensors(UseCase):
     def __init__(self, sensor_repo: SensorRepository):
         self.sensor_repo = sensor_repo
 
-    async def __call__(self) -> List[Sensor]:
-        return await self.sensor_repo.list_sensors()
+    async def __call__(
+        self, after_id: Optional[Union[int, str]] = None, limit: Optional[int] = None
+    ) -> List[Sensor]:
+        return await self.sensor_repo.list_sensors(after_id=after_id, limit=limit)
+
+
+class StreamSensors(UseCase):
+    def __init__(self, sensor_repo: SensorRepository):
+        self.sensor_repo = sensor_repo
+
+    def __call__(self, batch_size: int = 1000) -> AsyncGenerator[Sensor, None]:
+        return self.sensor_repo.stream_sensors(batch_size=batch_size)
+
+
+class WatchSensors(UseCase):
+    def __init__(self, sensor_repo: SensorRepository):
+        self.sensor_repo = sensor_repo
+
+    def __call__(self) -> AsyncGenerator[SensorChange, None]:
+        return self.sensor_repo.watch_sensors()
 
 
 class CreateSensor(UseCase):
+    def __init__(
+        self,
+        sensor_repo: SensorRepository,
+        write_buffer: Optional[SensorWriteBuffer] = None,
+    ):
+        self.sensor_repo = sensor_repo
+        self.write_buffer = write_buffer
+
+    async def __call__(
+        self, sensor: Sensor, wait_for_durability: bool = True
+    ) -> Optional[Sensor]:
+        # Without a write buffer every sensor is its own insert and always durable
+        if self.write_buffer is None:
+            return await self.sensor_repo.create_sensor(sensor)
+        return await self.write_buffer.write(
+            sensor, wait_for_durability=wait_for_durability
+        )
+
+
+class CreateSensors(UseCase):
     def __init__(self, sensor_repo: SensorRepository):
         self.sensor_repo = sensor_repo
 
-    async def __call__(self, sensor: Sensor) -> Sensor:
-        return await self.sensor_repo.create_sensor(sensor)
+    async def __call__(self, sensors: Iterable[Sensor]) -> List[Sensor]:
+        return await self.sensor_repo.create_sensors(sensors)
 
 
 class MakeOneThousandSensors(UseCase):
     def __init__(self, sensor_repo: SensorRepository):
         self.sensor_repo = sensor_repo
 
-    async def __call__(self, count: int = 10) -> List[Sensor]:
-        sensors = []
-        for i in range(0, count):
-            sensors.append(
-                await self.sensor_repo.create_sensor(
-                    Sensor(name=f"Sensor {i}", value=i)
-                )
-            )
-
-        return sensors
+    async def __call__(self, count: int = 10, offset: int = 0) -> List[Sensor]:
+        # offset lets chunked jobs continue the numbering of the previous chunk
+        return await self.sensor_repo.create_sensors(
+            Sensor(name=f"Sensor {i}", value=i) for i in range(offset, offset + count)
+        )
@@ -0,0 +1,36 @@
+import logging
+from datetime import datetime
+from typing import Iterable, List, Sequence, Union
+from sensor_app.core.ports.primary import UseCase
+from sensor_app.core.ports.secondary import SensorRepository
+from sensor_app.core.domain.aggregation import as_utc, validate_aggregation
+from sensor_app.core.domain.entities import ReadingAggregate, SensorReading
+
+logger = logging.getLogger()
+
+
+class IngestSensorReadings(UseCase):
+    def __init__(self, sensor_repo: SensorRepository):
+        self.sensor_repo = sensor_repo
+
+    async def __call__(self, readings: Iterable[SensorReading]) -> int:
+        return await self.sensor_repo.append_readings(readings)
+
+
+class AggregateSensorReadings(UseCase):
+    def __init__(self, sensor_repo: SensorRepository):
+        self.sensor_repo = sensor_repo
+
+    async def __call__(
+        self,
+        sensor_id: Union[int, str],
+        start: datetime,
+        end: datetime,
+        bucket: str = "hour",
+        percentiles: Sequence[float] = (0.5, 0.95, 0.99),
+    ) -> List[ReadingAggregate]:
+        start, end = as_utc(start), as_utc(end)
+        validate_aggregation(start, end, bucket, percentiles)
+        return await self.sensor_repo.aggregate_readings(
+            sensor_id, start, end, bucket, percentiles
+        )
@@ -1,29 +1,149 @@
 # setup
 import logging
+from typing import Optional
 from celery import Celery
 from flower.app import Flower
 from sensor_app import settings
 import sensor_app.adapters.secondary.persistence_sql as ps
+import sensor_app.adapters.secondary.persistence_mongodb.sensor_repo as pn
+import sensor_app.adapters.secondary.persistence_memory as pm
+import sensor_app.adapters.secondary.cache as sc
+import sensor_app.adapters.secondary.batching as sb
+import sensor_app.adapters.secondary.counting as sco
+import sensor_app.adapters.secondary.write_behind as swb
+import sensor_app.adapters.secondary.sensor_files as ssf
+from sensor_app.adapters import metrics
+from sensor_app.adapters.secondary.instrumentation import InstrumentedRepository
 import sensor_app.adapters.secondary.background_jobs_celery as bjc
 from sensor_app.adapters.primary.web_server.fast_api_app import create_fastapi_app
 from sensor_app.adapters.primary.background_job_server.celery_app import (
     create_celery_app,
 )
+from sensor_app.core.ports.secondary import SensorRepository, SensorWriteBuffer
+
+
+def create_persistence_repo() -> SensorRepository:
+    database_settings = app_settings.database
+    # The counter strategy reconciles with exact counts
+    count_strategy = (
+        "estimated" if database_settings.count_strategy == "estimated" else "exact"
+    )
+    if database_settings.adapter == "memory":
+        return pm.InMemorySensorRepository(
+            snapshot_path=database_settings.snapshot_path,
+            snapshot_interval_seconds=database_settings.snapshot_interval_seconds,
+        )
+    if database_settings.adapter == "mongodb":
+        return pn.MongoDBSensorRepository(
+            app_settings.no_sql_database.connection, count_strategy=count_strategy
+        )
+    return ps.AsyncpgSensorRepository(
+        database_settings.connection,
+        use_pool=database_settings.use_pool,
+        pool_min_size=database_settings.pool_min_size,
+        pool_max_size=database_settings.pool_max_size,
+        pool_max_inactive_connection_lifetime=database_settings.pool_max_inactive_connection_lifetime,
+        statement_cache_size=database_settings.statement_cache_size,
+        prepare_statements=database_settings.prepare_statements,
+        fast_mode=database_settings.fast_mode,
+        count_strategy=count_strategy,
+    )
+
+
+def create_sensor_repo() -> SensorRepository:
+    sensor_repo: SensorRepository = InstrumentedRepository(
+        create_persistence_repo(), port="SensorRepository"
+    )
+
+    database_settings = app_settings.database
+    if database_settings.count_strategy == "counter":
+        sensor_repo = sco.CountingSensorRepository(
+            sensor_repo, reconcile_seconds=database_settings.count_reconcile_seconds
+        )
+
+    batching_settings = app_settings.batching
+    if batching_settings.enabled:
+        sensor_repo = sb.BatchingSensorRepository(
+            sensor_repo,
+            window_microseconds=batching_settings.window_microseconds,
+            max_batch_size=batching_settings.max_batch_size,
+        )
+
+    # The cache sits in front so only cache misses reach the batching layer
+    cache_settings = app_settings.cache
+    if cache_settings.enabled:
+        sensor_repo = sc.CachingSensorRepository(
+            sensor_repo,
+            max_entries=cache_settings.max_entries,
+            ttl_seconds=cache_settings.ttl_seconds,
+            redis_url=cache_settings.redis_url,
+            redis_ttl_seconds=cache_settings.redis_ttl_seconds,
+            key_prefix=cache_settings.key_prefix,
+        )
+    return sensor_repo
+
+
+def create_sensor_write_buffer(
+    sensor_repo: SensorRepository,
+) -> Optional[SensorWriteBuffer]:
+    write_behind_settings = app_settings.write_behind
+    if not write_behind_settings.enabled:
+        return None
+    return swb.AsyncioSensorWriteBuffer(
+        sensor_repo,
+        max_batch_size=write_behind_settings.max_batch_size,
+        flush_interval_ms=write_behind_settings.flush_interval_ms,
+        max_queue_size=write_behind_settings.max_queue_size,
+    )
+
+
+def create_sensor_file_store() -> ssf.LocalSensorFileStore:
+    return ssf.LocalSensorFileStore(
+        app_settings.sensor_files.directory,
+        gzip_level=app_settings.sensor_files.export_gzip_level,
+        upload_retention_seconds=app_settings.sensor_files.upload_retention_seconds,
+        export_retention_seconds=app_settings.sensor_files.export_retention_seconds,
+    )
 
 
 def serve():
     try:
         if app_settings.running.run_web_server is True:
             # REST server
+            sensor_repo = create_sensor_repo()
+            background_jobs_repo = InstrumentedRepository(
+                bjc.AsyncCeleryBackgroundJobRepo(
+                    bjc.CeleryBackgroundJobRepo(
+                        app_settings.background_jobs,
+                        background_worker=background_worker,
+                    ),
+                    max_workers=app_settings.background_jobs.client_max_workers,
+                    task_event_hub=(
+                        bjc.CeleryTaskEventHub(background_worker)
+                        if app_settings.background_jobs.worker_send_task_events
+                        else None
+                    ),
+                    poll_interval_seconds=app_settings.background_jobs.task_result_poll_seconds,
+                ),
+                port="BackgroundJobsRepository",
+            )
+            sensor_write_buffer = create_sensor_write_buffer(sensor_repo)
             app = create_fastapi_app(
                 web_server_settings=app_settings.web_server,
-                background_jobs_repo=bjc.CeleryBackgroundJobRepo(
-                    app_settings.background_jobs, background_worker=background_worker
-                ),
-                sensor_repo=ps.AsyncpgSensorRepository(
-                    app_settings.database.connection
-                ),
+                background_jobs_repo=background_jobs_repo,
+                sensor_repo=sensor_repo,
+                sensor_write_buffer=sensor_write_buffer,
+                sensor_files=create_sensor_file_store(),
             )
+            # Open the connection pool on the server's event loop
+            app.add_event_handler("startup", sensor_repo.connect)
+            app.add_event_handler("startup", background_jobs_repo.connect)
+            if sensor_write_buffer is not None:
+                app.add_event_handler("startup", sensor_write_buffer.start)
+                # Flush queued sensors while the pool is still open
+                app.add_event_handler("shutdown", sensor_write_buffer.drain)
+            app.add_event_handler("shutdown", sensor_repo.disconnect)
+            app.add_event_handler("shutdown", background_jobs_repo.disconnect)
             return app
 
     except Exception as e:
@@ -35,9 +155,10 @@ def start_background_worker() -> Celery:
         if app_settings.running.run_background_jobs is True:
             app = create_celery_app(
                 background_job_settings=app_settings.background_jobs,
-                sensor_repo=ps.AsyncpgSensorRepository(
-                    app_settings.database.connection
-                ),
+                sensor_repo=create_sensor_repo(),
+                sensor_files=create_sensor_file_store(),
+                import_chunk_size=app_settings.sensor_files.import_chunk_size,
+                export_batch_size=app_settings.sensor_files.export_batch_size,
             )
             return app
     except Exception as e:
@@ -65,6 +186,9 @@ logger.setLevel(app_settings.config.log_level)
 
 settings.log_config(app_settings, logger)
 
+# Time every use case invocation, in the web server and in the worker
+metrics.enable_use_case_metrics()
+
 if __name__ == "sensor_app.main":
     background_worker = start_background_worker()
     app = serve()
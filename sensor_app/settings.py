@@ -33,7 +33,14 @@ class BackgroundJobsSettings:
         broker_connection_retry_on_startup: bool = True,
         task_track_started: bool = True,
         task_send_sent_event: bool = True,
+        use_uvloop: bool = False,
+        metrics_port: Optional[int] = None,
+        client_max_workers: int = 8,
+        worker_send_task_events: bool = True,
+        task_result_poll_seconds: float = 1.0,
     ):
+        if client_max_workers < 1:
+            raise ValueError("Background jobs client_max_workers must be at least 1.")
         self.name = name
         self.broker = broker
         self.backend = backend
@@ -46,6 +53,11 @@ class BackgroundJobsSettings:
         self.broker_connection_retry_on_startup = broker_connection_retry_on_startup
         self.task_track_started = task_track_started
         self.task_send_sent_event = task_send_sent_event
+        self.use_uvloop = use_uvloop
+        self.metrics_port = metrics_port
+        self.client_max_workers = client_max_workers
+        self.worker_send_task_events = worker_send_task_events
+        self.task_result_poll_seconds = task_result_poll_seconds
 
 
 class ConfigSettings:
@@ -59,10 +71,52 @@ class ConfigSettings:
 
 
 class DatabaseSettings:
-    def __init__(self, connection=None):
-        if None in [connection]:
+    ADAPTERS = ("asyncpg", "mongodb", "memory")
+    COUNT_STRATEGIES = ("exact", "estimated", "counter")
+
+    def __init__(
+        self,
+        connection=None,
+        adapter: str = "asyncpg",
+        use_pool: bool = False,
+        pool_min_size: int = 1,
+        pool_max_size: int = 10,
+        pool_max_inactive_connection_lifetime: float = 300.0,
+        statement_cache_size: int = 100,
+        prepare_statements: bool = True,
+        fast_mode: bool = False,
+        count_strategy: str = "exact",
+        count_reconcile_seconds: float = 60.0,
+        snapshot_path: Optional[str] = None,
+        snapshot_interval_seconds: Optional[float] = None,
+    ):
+        if adapter not in self.ADAPTERS:
+            raise ValueError(
+                f"Database adapter must be one of {', '.join(self.ADAPTERS)}."
+            )
+        if count_strategy not in self.COUNT_STRATEGIES:
+            raise ValueError(
+                f"Database count_strategy must be one of {', '.join(self.COUNT_STRATEGIES)}."
+            )
+        if adapter == "asyncpg" and None in [connection]:
             raise ValueError("Database connection string is required.")
+        if pool_min_size > pool_max_size:
+            raise ValueError("Database pool_min_size cannot exceed pool_max_size.")
         self.connection = connection
+        self.adapter = adapter
+        self.use_pool = use_pool
+        self.pool_min_size = pool_min_size
+        self.pool_max_size = pool_max_size
+        self.pool_max_inactive_connection_lifetime = (
+            pool_max_inactive_connection_lifetime
+        )
+        self.statement_cache_size = statement_cache_size
+        self.prepare_statements = prepare_statements
+        self.fast_mode = fast_mode
+        self.count_strategy = count_strategy
+        self.count_reconcile_seconds = count_reconcile_seconds
+        self.snapshot_path = snapshot_path
+        self.snapshot_interval_seconds = snapshot_interval_seconds
 
 
 class NoSqlDatabaseSettings:
@@ -72,6 +126,86 @@ class NoSqlDatabaseSettings:
         self.connection = connection
 
 
+class CacheSettings:
+    def __init__(
+        self,
+        enabled: bool = False,
+        max_entries: int = 10000,
+        ttl_seconds: float = 5.0,
+        redis_url: Optional[str] = None,
+        redis_ttl_seconds: float = 30.0,
+        key_prefix: str = "sensor_app:",
+    ):
+        if max_entries < 1:
+            raise ValueError("Cache max_entries must be at least 1.")
+        self.enabled = enabled
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.redis_url = redis_url
+        self.redis_ttl_seconds = redis_ttl_seconds
+        self.key_prefix = key_prefix
+
+
+class BatchingSettings:
+    def __init__(
+        self,
+        enabled: bool = False,
+        window_microseconds: int = 0,
+        max_batch_size: int = 500,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("Batching max_batch_size must be at least 1.")
+        self.enabled = enabled
+        self.window_microseconds = window_microseconds
+        self.max_batch_size = max_batch_size
+
+
+class WriteBehindSettings:
+    def __init__(
+        self,
+        enabled: bool = False,
+        max_batch_size: int = 500,
+        flush_interval_ms: float = 5.0,
+        max_queue_size: int = 10000,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("Write-behind max_batch_size must be at least 1.")
+        if max_queue_size < 1:
+            raise ValueError("Write-behind max_queue_size must be at least 1.")
+        self.enabled = enabled
+        self.max_batch_size = max_batch_size
+        self.flush_interval_ms = flush_interval_ms
+        self.max_queue_size = max_queue_size
+
+
+class SensorFilesSettings:
+    def __init__(
+        self,
+        directory: str = "./sensor_files",
+        import_chunk_size: int = 10000,
+        export_batch_size: int = 10000,
+        export_gzip_level: int = 6,
+        upload_retention_seconds: float = 7 * 24 * 3600,
+        export_retention_seconds: float = 24 * 3600,
+    ):
+        if import_chunk_size < 1:
+            raise ValueError("Sensor files import_chunk_size must be at least 1.")
+        if export_batch_size < 1:
+            raise ValueError("Sensor files export_batch_size must be at least 1.")
+        if not 0 <= export_gzip_level <= 9:
+            raise ValueError("Sensor files export_gzip_level must be between 0 and 9.")
+        if upload_retention_seconds <= 0:
+            raise ValueError("Sensor files upload_retention_seconds must be positive.")
+        if export_retention_seconds <= 0:
+            raise ValueError("Sensor files export_retention_seconds must be positive.")
+        self.directory = directory
+        self.import_chunk_size = import_chunk_size
+        self.export_batch_size = export_batch_size
+        self.export_gzip_level = export_gzip_level
+        self.upload_retention_seconds = upload_retention_seconds
+        self.export_retention_seconds = export_retention_seconds
+
+
 class WebServerSettings:
     def __init__(
         self,
@@ -80,12 +214,60 @@ class WebServerSettings:
         swagger_relative_path=None,
         local_development=False,
         host="127.0.0.1",
+        max_batch_size: int = 10000,
+        max_batch_bytes: int = 16 * 1024 * 1024,
+        max_chunked_count: int = 1000000,
+        max_chunks: int = 100,
+        max_page_size: int = 1000,
+        stream_batch_size: int = 1000,
+        max_watched_tasks: int = 100,
+        event_stream_heartbeat_seconds: float = 15.0,
+        max_watched_sensors: int = 1000,
+        sensor_event_queue_size: int = 1000,
+        sensor_cache_control: str = "no-cache",
+        compression_enabled: bool = True,
+        compression_minimum_size: int = 1000,
+        compression_gzip_level: int = 6,
+        compression_brotli_quality: int = 4,
+        max_upload_bytes: int = 512 * 1024 * 1024,
     ):
+        if max_batch_size < 1:
+            raise ValueError("Web server max_batch_size must be at least 1.")
+        if max_batch_bytes < 1:
+            raise ValueError("Web server max_batch_bytes must be at least 1.")
+        if max_chunked_count < 1:
+            raise ValueError("Web server max_chunked_count must be at least 1.")
+        if max_chunks < 1:
+            raise ValueError("Web server max_chunks must be at least 1.")
+        if max_page_size < 1:
+            raise ValueError("Web server max_page_size must be at least 1.")
+        if max_watched_tasks < 1:
+            raise ValueError("Web server max_watched_tasks must be at least 1.")
+        if sensor_event_queue_size < 1:
+            raise ValueError("Web server sensor_event_queue_size must be at least 1.")
+        if max_upload_bytes < 1:
+            raise ValueError("Web server max_upload_bytes must be at least 1.")
         self.port = port
         self.debug = debug
         self.swagger_relative_path = swagger_relative_path
         self.local_development = local_development
         self.host = host
+        self.max_batch_size = max_batch_size
+        self.max_batch_bytes = max_batch_bytes
+        self.max_chunked_count = max_chunked_count
+        self.max_chunks = max_chunks
+        self.max_page_size = max_page_size
+        self.stream_batch_size = stream_batch_size
+        self.max_watched_tasks = max_watched_tasks
+        self.event_stream_heartbeat_seconds = event_stream_heartbeat_seconds
+        self.max_watched_sensors = max_watched_sensors
+        self.sensor_event_queue_size = sensor_event_queue_size
+        self.sensor_cache_control = sensor_cache_control
+        self.compression_enabled = compression_enabled
+        self.compression_minimum_size = compression_minimum_size
+        self.compression_gzip_level = compression_gzip_level
+        self.compression_brotli_quality = compression_brotli_quality
+        self.max_upload_bytes = max_upload_bytes
 
 
 class Settings:
@@ -97,6 +279,10 @@ class Settings:
             **settings.get("no_sql_database", {})
         )
         self.web_server = WebServerSettings(**settings.get("web_server", {}))
+        self.cache = CacheSettings(**settings.get("cache", {}))
+        self.batching = BatchingSettings(**settings.get("batching", {}))
+        self.write_behind = WriteBehindSettings(**settings.get("write_behind", {}))
+        self.sensor_files = SensorFilesSettings(**settings.get("sensor_files", {}))
         self.background_jobs = BackgroundJobsSettings(
             **settings.get("background_jobs", {})
         )
@@ -124,7 +310,7 @@ def log_config(app_settings, logger=None):
                 _log(item, value, f"{section}|{key}")
         else:
             # If it's the database section
-            if re.search(r"^database", section):
+            if re.search(r"^database", section) and isinstance(value, str):
                 # Let's mask user and password for database connections'
                 match = re.search(r"://(.+)?@", value)
                 if match:
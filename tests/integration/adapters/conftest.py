@@ -1,5 +1,6 @@
 import pytest
 from fastapi.testclient import TestClient
+from sensor_app.adapters import metrics
 from sensor_app.adapters.primary.web_server.fast_api_app import create_fastapi_app
 from sensor_app.adapters.primary.background_job_server.celery_app import (
     create_celery_app,
@@ -10,9 +11,13 @@ from sensor_app.adapters.secondary.persistence_sql.sensor_repo import (
 from sensor_app.adapters.secondary.persistence_mongodb.sensor_repo import (
     MongoDBSensorRepository,
 )
+from sensor_app.adapters.secondary.sensor_files import LocalSensorFileStore
 from sensor_app.adapters.secondary.background_jobs_celery.background_jobs_repo import (
     CeleryBackgroundJobRepo,
 )
+from sensor_app.adapters.secondary.background_jobs_celery.async_background_jobs_repo import (
+    AsyncCeleryBackgroundJobRepo,
+)
 
 
 @pytest.fixture
@@ -25,6 +30,12 @@ def no_sql_sensor_repo(conftest_settings):
     return MongoDBSensorRepository(conftest_settings.no_sql_database.connection)
 
 
+@pytest.fixture(scope="session")
+def sensor_files(tmp_path_factory):
+    # Session wide, the Celery app (and its import task) is a global singleton
+    return LocalSensorFileStore(str(tmp_path_factory.mktemp("sensor_files")))
+
+
 @pytest.fixture
 def background_jobs_repo(conftest_settings, test_background_jobs_worker):
     return CeleryBackgroundJobRepo(
@@ -33,19 +44,22 @@ def background_jobs_repo(conftest_settings, test_background_jobs_worker):
 
 
 @pytest.fixture
-def test_app(conftest_settings, sensor_repo, background_jobs_repo):
+def test_app(conftest_settings, sensor_repo, background_jobs_repo, sensor_files):
+    metrics.enable_use_case_metrics()
     return create_fastapi_app(
         web_server_settings=conftest_settings.web_server_settings,
         sensor_repo=sensor_repo,
-        background_jobs_repo=background_jobs_repo,
+        background_jobs_repo=AsyncCeleryBackgroundJobRepo(background_jobs_repo),
+        sensor_files=sensor_files,
     )
 
 
 @pytest.fixture
-def test_background_jobs_worker(conftest_settings, sensor_repo):
+def test_background_jobs_worker(conftest_settings, sensor_repo, sensor_files):
     return create_celery_app(
         background_job_settings=conftest_settings.background_jobs,
         sensor_repo=sensor_repo,
+        sensor_files=sensor_files,
     )
 
 
@@ -0,0 +1,44 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from sensor_app.adapters.primary.background_job_server.async_runtime import (
+    AsyncRuntime,
+)
+
+
+async def running_loop() -> asyncio.AbstractEventLoop:
+    await asyncio.sleep(0.01)
+    return asyncio.get_running_loop()
+
+
+def test_runtime_shares_one_loop_across_threads():
+    runtime = AsyncRuntime()
+    try:
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            loops = set(executor.map(lambda _: runtime.run(running_loop), range(8)))
+    finally:
+        runtime.stop()
+    assert len(loops) == 1
+
+
+def test_runtime_can_be_restarted():
+    runtime = AsyncRuntime()
+    first_loop = runtime.run(running_loop)
+    runtime.stop()
+    assert first_loop.is_closed()
+    second_loop = runtime.run(running_loop)
+    runtime.stop()
+    assert second_loop is not first_loop
+
+
+def test_runtime_stop_keeps_a_blocked_loop_open():
+    runtime = AsyncRuntime()
+    loop = runtime.run(running_loop)
+    loop.call_soon_threadsafe(time.sleep, 0.5)
+    runtime.stop(timeout=0.05)
+    # Closing a loop that is still running raises, it is left to its thread
+    assert not loop.is_closed()
+    deadline = time.monotonic() + 5
+    while not loop.is_closed() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert loop.is_closed()
@@ -1,4 +1,7 @@
+import gzip
+import os
 import pytest
+from uuid import uuid4
 from fastapi.testclient import TestClient
 from sensor_app.core.domain.entities import Sensor
 
@@ -17,3 +20,413 @@ async def test_get_sensors_with_data(test_client, sensor_repo):
     response = test_client.get("/sensors")
     assert response.status_code == 200
     assert len(response.json()) == 1
+
+
+def test_create_sensors_batch(test_client):
+    response = test_client.post(
+        "/sensors",
+        json=[{"name": "Batch 1", "value": 1.0}, {"name": "Batch 2", "value": 2.0}],
+    )
+    assert response.status_code == 200
+    ids = response.json()
+    assert len(ids) == 2
+
+    assert test_client.get(f"/sensor/{ids[0]}").json()["name"] == "Batch 1"
+    assert test_client.get(f"/sensor/{ids[1]}").json()["name"] == "Batch 2"
+
+
+def test_create_sensors_batch_ndjson(test_client):
+    response = test_client.post(
+        "/sensors",
+        content=b'{"name": "Line 1", "value": 1.0}\n{"name": "Line 2", "value": 2.0}\n',
+        headers={"content-type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+
+
+def test_create_sensors_batch_rejects_invalid_sensor(test_client):
+    response = test_client.post("/sensors", json=[{"name": "No value"}])
+    assert response.status_code == 422
+    assert len(test_client.get("/sensors").json()) == 0
+
+
+def test_create_sensors_batch_too_large(test_client, conftest_settings):
+    max_batch_size = conftest_settings.web_server_settings.max_batch_size
+    response = test_client.post(
+        "/sensors",
+        json=[{"name": "Too many", "value": 1.0}] * (max_batch_size + 1),
+    )
+    assert response.status_code == 413
+
+
+def test_create_sensors_batch_ndjson_one_sensor_per_line(test_client):
+    response = test_client.post(
+        "/sensors",
+        content=b'{"name": "Line 1", "value": 1.0},{"name": "Line 2", "value": 2.0}\n',
+        headers={"content-type": "application/x-ndjson"},
+    )
+    assert response.status_code == 422
+    assert len(test_client.get("/sensors").json()) == 0
+
+
+def test_create_sensors_batch_ndjson_too_large(test_client, conftest_settings):
+    max_batch_size = conftest_settings.web_server_settings.max_batch_size
+    response = test_client.post(
+        "/sensors",
+        content=b'{"name": "Too many", "value": 1.0}\n' * (max_batch_size + 1),
+        headers={"content-type": "application/x-ndjson"},
+    )
+    assert response.status_code == 413
+
+
+def test_create_sensors_batch_body_too_large(test_client, conftest_settings):
+    max_batch_bytes = conftest_settings.web_server_settings.max_batch_bytes
+    response = test_client.post(
+        "/sensors",
+        content=b" " * (max_batch_bytes + 1),
+        headers={"content-type": "application/json"},
+    )
+    assert response.status_code == 413
+
+
+def test_get_sensors_paginated(test_client):
+    ids = test_client.post(
+        "/sensors", json=[{"name": f"Page {i}", "value": i} for i in range(0, 3)]
+    ).json()
+
+    response = test_client.get("/sensors", params={"limit": 2})
+    assert [sensor["id"] for sensor in response.json()] == ids[0:2]
+    next_after_id = response.headers["X-Next-After-Id"]
+
+    response = test_client.get(
+        "/sensors", params={"limit": 2, "after_id": next_after_id}
+    )
+    assert [sensor["id"] for sensor in response.json()] == ids[2:]
+    assert "X-Next-After-Id" not in response.headers
+
+
+def test_get_sensors_invalid_cursor(test_client):
+    response = test_client.get("/sensors", params={"limit": 2, "after_id": "abc"})
+    assert response.status_code == 422
+
+
+def test_stream_sensors(test_client):
+    test_client.post(
+        "/sensors", json=[{"name": f"Stream {i}", "value": i} for i in range(0, 3)]
+    )
+    response = test_client.get("/sensors/stream")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = response.text.splitlines()
+    assert [Sensor.model_validate_json(line).name for line in lines] == [
+        "Stream 0",
+        "Stream 1",
+        "Stream 2",
+    ]
+
+
+def test_make_sensors_chunked(test_client):
+    response = test_client.post(
+        "/make_sensors_chunked", params={"count": 5, "chunk_size": 2}
+    )
+    assert response.status_code == 200
+    assert response.json()["status"] == "SUCCESS"
+    assert len(test_client.get("/sensors").json()) == 5
+
+
+def test_make_sensors_chunked_limits(test_client, conftest_settings):
+    web_server_settings = conftest_settings.web_server_settings
+    response = test_client.post(
+        "/make_sensors_chunked",
+        params={"count": web_server_settings.max_chunked_count + 1},
+    )
+    assert response.status_code == 422
+    response = test_client.post(
+        "/make_sensors_chunked",
+        params={"count": web_server_settings.max_chunks + 1, "chunk_size": 1},
+    )
+    assert response.status_code == 422
+
+
+def test_ingest_sensor_readings(test_client):
+    sensor_id = test_client.post(
+        "/sensor", json={"name": "Reading Sensor", "value": 0.0}
+    ).json()["id"]
+    response = test_client.post(
+        "/sensor_readings",
+        json=[
+            {
+                "sensor_id": sensor_id,
+                "recorded_at": f"2024-01-01T00:0{i}:00+00:00",
+                "value": i,
+            }
+            for i in range(0, 5)
+        ],
+    )
+    assert response.status_code == 200
+    assert response.json() == 5
+
+
+def test_ingest_sensor_readings_unknown_sensor(test_client):
+    reading = {"recorded_at": "2024-01-01T00:00:00+00:00", "value": 1.0}
+    response = test_client.post("/sensor_readings", json=[{"sensor_id": -1, **reading}])
+    assert response.status_code == 404
+    response = test_client.post(
+        "/sensor_readings", json=[{"sensor_id": "not-an-id", **reading}]
+    )
+    assert response.status_code == 422
+
+
+def test_aggregate_sensor_readings(test_client):
+    sensor_id = test_client.post(
+        "/sensor", json={"name": "Reading Sensor", "value": 0.0}
+    ).json()["id"]
+    test_client.post(
+        "/sensor_readings",
+        json=[
+            {
+                "sensor_id": sensor_id,
+                "recorded_at": f"2024-01-01T0{i}:30:00+00:00",
+                "value": i,
+            }
+            for i in range(0, 4)
+        ],
+    )
+    response = test_client.get(
+        f"/sensor/{sensor_id}/readings/aggregate",
+        params={
+            "start": "2024-01-01T00:00:00+00:00",
+            "end": "2024-01-02T00:00:00+00:00",
+            "bucket": "day",
+            "percentiles": [0.5],
+        },
+    )
+    assert response.status_code == 200
+    [aggregate] = response.json()
+    assert aggregate["count"] == 4
+    assert aggregate["min"] == 0
+    assert aggregate["max"] == 3
+    assert aggregate["percentiles"] == {"p50": 1.5}
+
+    # Naive datetimes are UTC, with or without the other end of the window
+    for params in (
+        {"start": "2024-01-01T00:00:00", "end": "2024-01-02T00:00:00"},
+        {"start": "2024-01-01T00:00:00", "end": "2024-01-02T00:00:00+00:00"},
+    ):
+        response = test_client.get(
+            f"/sensor/{sensor_id}/readings/aggregate",
+            params={**params, "bucket": "day", "percentiles": [0.5]},
+        )
+        assert response.status_code == 200
+        assert response.json() == [aggregate]
+    response = test_client.get(
+        f"/sensor/{sensor_id}/readings/aggregate",
+        params={"start": "2024-01-01T00:00:00"},
+    )
+    assert response.status_code == 200
+
+
+def test_aggregate_sensor_readings_invalid_bucket(test_client):
+    response = test_client.get(
+        "/sensor/1/readings/aggregate", params={"bucket": "year"}
+    )
+    assert response.status_code == 400
+
+
+def test_metrics(test_client):
+    test_client.get("/sensors")
+    response = test_client.get("/metrics")
+    assert response.status_code == 200
+    assert (
+        'sensor_app_http_request_duration_seconds_count{method="GET",route="/sensors",status="200"}'
+        in response.text
+    )
+    assert 'use_case="ListSensors"' in response.text
+
+
+def test_watch_background_task_results_limits(test_client):
+    assert test_client.get("/background_task_events").status_code == 422
+    response = test_client.get(
+        "/background_task_events",
+        params={"task_id": [str(uuid4()) for _ in range(101)]},
+    )
+    assert response.status_code == 413
+
+
+def test_sensor_count(test_client):
+    test_client.post("/sensors", json=[{"name": "Counted", "value": 1.0}])
+    response = test_client.get("/sensor_count")
+    assert response.status_code == 200
+    assert response.json() == 1
+
+
+@pytest.mark.asyncio
+async def test_get_sensor_conditional(test_client, sensor_repo):
+    created_sensor = await sensor_repo.create_sensor(
+        Sensor(name="Cached Sensor", value=1.0)
+    )
+
+    response = test_client.get(f"/sensor/{created_sensor.id}")
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert etag.startswith('W/"')
+    assert "last-modified" in response.headers
+    assert "cache-control" in response.headers
+
+    response = test_client.get(
+        f"/sensor/{created_sensor.id}", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+
+    # Every update bumps the version, so the old ETag no longer matches
+    created_sensor.value = 2.0
+    await sensor_repo.update_sensor(created_sensor)
+    response = test_client.get(
+        f"/sensor/{created_sensor.id}", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()["value"] == 2.0
+
+
+def test_get_sensors_conditional(test_client):
+    test_client.post("/sensors", json=[{"name": "Page", "value": 1.0}])
+    response = test_client.get("/sensors")
+    etag = response.headers["etag"]
+
+    assert (
+        test_client.get("/sensors", headers={"If-None-Match": etag}).status_code == 304
+    )
+    test_client.post("/sensors", json=[{"name": "Another", "value": 2.0}])
+    assert (
+        test_client.get("/sensors", headers={"If-None-Match": etag}).status_code == 200
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_sensors_conditional_after_delete(test_client, sensor_repo):
+    created_sensors = await sensor_repo.create_sensors(
+        [Sensor(name=f"Page {i}", value=i) for i in range(2)]
+    )
+    response = test_client.get("/sensors")
+    etag = response.headers["etag"]
+    # A delete leaves the newest updated_at as it was, so pages aren't dated
+    assert "last-modified" not in response.headers
+
+    await sensor_repo.delete_sensor(created_sensors[0].id)
+    future_date = "Fri, 01 Jan 2100 00:00:00 GMT"
+    response = test_client.get(
+        "/sensors", headers={"If-None-Match": etag, "If-Modified-Since": future_date}
+    )
+    assert response.status_code == 200
+    assert [sensor["id"] for sensor in response.json()] == [created_sensors[1].id]
+    response = test_client.get("/sensors", headers={"If-Modified-Since": future_date})
+    assert response.status_code == 200
+
+
+def test_get_sensors_formats(test_client):
+    test_client.post(
+        "/sensors", json=[{"name": f"Fleet {i}", "value": i} for i in range(3)]
+    )
+
+    columns = test_client.get(
+        "/sensors", headers={"Accept": "application/vnd.sensor-app.columns+json"}
+    ).json()
+    assert columns["name"] == ["Fleet 0", "Fleet 1", "Fleet 2"]
+
+    response = test_client.get("/sensors/stream", headers={"Accept": "text/csv"})
+    assert response.headers["content-type"].startswith("text/csv")
+    assert len(response.text.splitlines()) == 4
+
+    assert (
+        test_client.get("/sensors", headers={"Accept": "text/html"}).status_code == 406
+    )
+
+
+def test_import_sensors_file(test_client):
+    response = test_client.post(
+        "/sensors/import",
+        content=b"name,value\nA,1\nB,oops\nC,3\n",
+        headers={"Content-Type": "text/csv; charset=utf-8"},
+    )
+    assert response.status_code == 202
+    result = response.json()
+    assert result["name"] == "import_sensors"
+    assert result["result"]["loaded"] == 2
+    assert result["result"]["rejected_rows"] == [2]
+
+    assert [sensor["name"] for sensor in test_client.get("/sensors").json()] == [
+        "A",
+        "C",
+    ]
+
+
+def test_import_sensors_unknown_format(test_client):
+    response = test_client.post(
+        "/sensors/import",
+        content=b"not a csv",
+        headers={
+            "Content-Type": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        },
+    )
+    assert response.status_code == 415
+
+
+def test_import_sensors_too_large(
+    test_client, conftest_settings, sensor_files, monkeypatch
+):
+    monkeypatch.setattr(conftest_settings.web_server_settings, "max_upload_bytes", 64)
+    files = os.listdir(sensor_files.directory)
+
+    response = test_client.post(
+        "/sensors/import",
+        content=b"name,value\n" + b"A,1\n" * 100,
+        headers={"Content-Type": "text/csv"},
+    )
+    assert response.status_code == 413
+
+    def body():
+        # Chunked, without a Content-Length, refused as it goes over
+        yield b"name,value\n"
+        for _ in range(100):
+            yield b"A,1\n"
+
+    response = test_client.post(
+        "/sensors/import", params={"file_format": "csv"}, content=body()
+    )
+    assert response.status_code == 413
+    assert os.listdir(sensor_files.directory) == files
+
+
+def test_export_and_download_sensors(test_client):
+    test_client.post(
+        "/sensors",
+        json=[{"name": "Export 1", "value": 1.0}, {"name": "Export 2", "value": 2.0}],
+    )
+
+    response = test_client.post("/sensors/export", params={"file_format": "ndjson"})
+    assert response.status_code == 202
+    export = response.json()["result"]
+    assert export["exported"] == 2
+    assert export["done"]
+
+    download = test_client.get(f"/sensor_exports/{export['file_name']}")
+    assert download.status_code == 200
+    assert download.headers["content-type"] == "application/gzip"
+    lines = gzip.decompress(download.content).splitlines()
+    assert [Sensor.model_validate_json(line).name for line in lines] == [
+        "Export 1",
+        "Export 2",
+    ]
+
+    assert test_client.get("/sensor_exports/missing.ndjson.gz").status_code == 404
+
+
+def test_export_unavailable_format(test_client, sensor_files, monkeypatch):
+    # e.g. parquet on a web server without pyarrow
+    monkeypatch.setattr(sensor_files, "export_formats", lambda: ["ndjson", "csv"])
+    response = test_client.post("/sensors/export", params={"file_format": "parquet"})
+    assert response.status_code == 422
+    assert "parquet" in response.json()["detail"]
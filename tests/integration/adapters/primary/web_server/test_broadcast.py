@@ -0,0 +1,67 @@
+import asyncio
+import pytest
+from sensor_app.adapters.primary.web_server.broadcast import Broadcaster
+
+
+class Upstream:
+    def __init__(self):
+        self.opened = 0
+        self.closed = 0
+        self.items: asyncio.Queue = asyncio.Queue()
+
+    async def stream(self):
+        self.opened += 1
+        try:
+            while True:
+                yield await self.items.get()
+        finally:
+            self.closed += 1
+
+
+@pytest.mark.asyncio
+async def test_one_upstream_for_all_subscribers():
+    upstream = Upstream()
+    broadcaster = Broadcaster(upstream.stream)
+
+    subscriptions = [broadcaster.subscribe() for _ in range(3)]
+    pending = [asyncio.ensure_future(s.__anext__()) for s in subscriptions]
+    await asyncio.sleep(0)
+    upstream.items.put_nowait("change")
+
+    assert await asyncio.gather(*pending) == ["change"] * 3
+    assert upstream.opened == 1
+
+    for subscription in subscriptions:
+        await subscription.aclose()
+    await asyncio.sleep(0)
+    # The last subscriber leaving closes the upstream subscription
+    assert upstream.closed == 1
+    assert broadcaster.subscriber_count == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_is_dropped():
+    upstream = Upstream()
+    broadcaster = Broadcaster(upstream.stream, max_queue_size=2)
+
+    fast = broadcaster.subscribe()
+    slow = broadcaster.subscribe()
+    first = [
+        asyncio.ensure_future(fast.__anext__()),
+        asyncio.ensure_future(slow.__anext__()),
+    ]
+    await asyncio.sleep(0)
+    upstream.items.put_nowait(0)
+    await asyncio.gather(*first)
+
+    for i in range(1, 5):
+        upstream.items.put_nowait(i)
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert await fast.__anext__() == i
+
+    # The slow subscriber gets what was buffered, then its stream ends
+    assert [item async for item in slow] == [1, 2]
+    assert broadcaster.dropped_subscribers == 1
+    await fast.aclose()
+    await broadcaster.close()
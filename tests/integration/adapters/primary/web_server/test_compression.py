@@ -0,0 +1,104 @@
+import asyncio
+import gzip
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse, Response, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+from sensor_app.adapters.primary.web_server.middleware import CompressionMiddleware
+
+
+async def large(request):
+    return PlainTextResponse("x" * 5000)
+
+
+async def small(request):
+    return PlainTextResponse("x" * 10)
+
+
+async def streamed(request):
+    async def chunks():
+        for i in range(3):
+            yield f"line {i}\n".encode()
+
+    return StreamingResponse(chunks(), media_type="text/plain")
+
+
+async def archive(request):
+    return Response(gzip.compress(b"x" * 5000), media_type="application/gzip")
+
+
+async def events(request):
+    async def chunks():
+        yield b"data: 1\n\n"
+
+    return StreamingResponse(chunks(), media_type="text/event-stream")
+
+
+app = Starlette(
+    routes=[
+        Route("/large", large),
+        Route("/small", small),
+        Route("/streamed", streamed),
+        Route("/events", events),
+        Route("/archive", archive),
+    ]
+)
+app.add_middleware(CompressionMiddleware, minimum_size=1000)
+client = TestClient(app)
+
+
+def test_compresses_large_bodies():
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert int(response.headers["content-length"]) < 5000
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.text == "x" * 5000
+
+
+def test_small_bodies_and_event_streams_are_not_compressed():
+    response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    response = client.get("/events", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+
+def test_compressed_files_are_not_compressed_again():
+    response = client.get("/archive", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert gzip.decompress(response.content) == b"x" * 5000
+
+
+def test_pathsend_responses_pass_through():
+    start = {"type": "http.response.start", "status": 200, "headers": []}
+    pathsend = {"type": "http.response.pathsend", "path": "/tmp/export.csv.gz"}
+
+    async def file_app(scope, receive, send):
+        await send(start)
+        await send(pathsend)
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "headers": [(b"accept-encoding", b"gzip")],
+    }
+    asyncio.run(CompressionMiddleware(file_app)(scope, None, send))
+    assert sent == [start, pathsend]
+
+
+def test_streamed_bodies_are_compressed_per_chunk():
+    with client.stream(
+        "GET", "/streamed", headers={"Accept-Encoding": "gzip"}
+    ) as response:
+        assert response.headers["content-encoding"] == "gzip"
+        raw = b"".join(response.iter_raw())
+    assert gzip.decompress(raw) == b"line 0\nline 1\nline 2\n"
+
+
+def test_identity_only_is_not_compressed():
+    response = client.get("/large", headers={"Accept-Encoding": "identity, gzip;q=0"})
+    assert "content-encoding" not in response.headers
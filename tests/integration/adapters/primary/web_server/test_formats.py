@@ -0,0 +1,77 @@
+import csv
+import io
+import json
+import pytest
+from sensor_app.core.domain.entities import Sensor
+from sensor_app.adapters.primary.web_server import formats
+from sensor_app.adapters.primary.web_server.formats import (
+    COLUMNS_JSON_MEDIA_TYPE,
+    CSV_MEDIA_TYPE,
+    JSON_MEDIA_TYPE,
+    NDJSON_MEDIA_TYPE,
+    columns_json_chunks,
+    csv_chunks,
+    iterate,
+    negotiate,
+)
+
+OFFERED = [JSON_MEDIA_TYPE, NDJSON_MEDIA_TYPE, COLUMNS_JSON_MEDIA_TYPE, CSV_MEDIA_TYPE]
+
+
+@pytest.mark.parametrize(
+    "accept,expected",
+    [
+        (None, JSON_MEDIA_TYPE),
+        ("*/*", JSON_MEDIA_TYPE),
+        ("text/*", CSV_MEDIA_TYPE),
+        (
+            "text/csv;q=0.5, application/vnd.sensor-app.columns+json",
+            COLUMNS_JSON_MEDIA_TYPE,
+        ),
+        ("*/*;q=0.1, text/csv;q=0", JSON_MEDIA_TYPE),
+        ("text/html", None),
+    ],
+)
+def test_negotiate(accept, expected):
+    assert negotiate(accept, OFFERED) == expected
+
+
+async def collect(chunks) -> bytes:
+    return b"".join([chunk async for chunk in chunks])
+
+
+def fleet(count: int):
+    return [
+        Sensor(id=i, name=f"Sensor, {i}", value=i / 2, version=1) for i in range(count)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_columns_json(monkeypatch):
+    # Small spool so the columns go through files on disk
+    monkeypatch.setattr(formats, "_SPOOL_MAX_BYTES", 16)
+    sensors = fleet(25)
+    body = json.loads(await collect(columns_json_chunks(iterate(sensors), 10)))
+    assert body["id"] == list(range(25))
+    assert body["name"] == [sensor.name for sensor in sensors]
+    assert body["value"] == [sensor.value for sensor in sensors]
+    assert set(body) == set(Sensor.model_fields)
+
+    empty = json.loads(await collect(columns_json_chunks(iterate([]), 10)))
+    assert empty == {name: [] for name in Sensor.model_fields}
+
+
+@pytest.mark.asyncio
+async def test_csv():
+    sensors = fleet(3)
+    rows = list(
+        csv.reader(
+            io.StringIO((await collect(csv_chunks(iterate(sensors), 2))).decode())
+        )
+    )
+    assert rows[0] == list(Sensor.model_fields)
+    assert [row[1] for row in rows[1:]] == [sensor.name for sensor in sensors]
+
+    assert (await collect(csv_chunks(iterate([]), 2))).decode().splitlines() == [
+        ",".join(Sensor.model_fields)
+    ]
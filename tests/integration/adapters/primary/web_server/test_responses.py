@@ -0,0 +1,77 @@
+import importlib
+import json
+import sys
+from datetime import datetime, timezone
+from typing import List
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from sensor_app.core.domain.entities import Sensor
+from sensor_app.core.domain.results import AsyncResult, is_json_serializable
+from sensor_app.adapters.primary.web_server import responses
+from sensor_app.adapters.primary.web_server.responses import trusted_response
+
+
+def test_is_json_serializable():
+    assert is_json_serializable(None)
+    assert is_json_serializable([1, 2.5, "three", True, None])
+    assert is_json_serializable({"nested": [{"a": 1}, (2, 3)], 4: "int key"})
+    assert is_json_serializable([Sensor(name="Model", value=1.0)])
+
+
+def test_is_json_serializable_rejects_what_json_dumps_rejects():
+    circular: list = []
+    circular.append(circular)
+    for value in (
+        {1, 2},
+        object(),
+        datetime(2024, 1, 1),
+        {("tuple", "key"): 1},
+        [1, {"deep": {"set": {3}}}],
+        circular,
+    ):
+        assert not is_json_serializable(value)
+
+
+def test_is_json_serializable_allows_repeated_references():
+    shared = {"a": 1}
+    value = [shared, shared]
+    assert is_json_serializable(value)
+    json.dumps(value)
+
+
+def test_async_result_falls_back_to_str():
+    result = AsyncResult(status="SUCCESS", result={1, 2})
+    assert result.result == str({1, 2})
+    sensors = [Sensor(name="Kept", value=1.0)]
+    assert AsyncResult(status="SUCCESS", result=sensors).result == sensors
+
+
+def test_trusted_response():
+    sensors = [
+        Sensor(
+            id=1,
+            name="Trusted",
+            value=1.5,
+            version=2,
+            updated_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        )
+    ]
+    response = trusted_response(
+        TypeAdapter(List[Sensor]), sensors, status_code=202, headers={"ETag": "x"}
+    )
+    assert response.status_code == 202
+    assert response.media_type == "application/json"
+    assert response.headers["etag"] == "x"
+    assert [Sensor.model_validate(item) for item in json.loads(response.body)] == (
+        sensors
+    )
+
+
+def test_default_json_response_without_orjson(monkeypatch):
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    try:
+        assert importlib.reload(responses).DefaultJSONResponse is JSONResponse
+    finally:
+        monkeypatch.undo()
+        importlib.reload(responses)
+    assert responses.DefaultJSONResponse is not JSONResponse
@@ -0,0 +1,109 @@
+import asyncio
+import threading
+import time
+import pytest
+from sensor_app.core.domain.results import AsyncResult
+from sensor_app.adapters.secondary.background_jobs_celery import (
+    AsyncCeleryBackgroundJobRepo,
+    CeleryTaskEventHub,
+)
+
+
+class SlowBackgroundJobsRepo:
+    def get_task_results(self, task_id: str) -> AsyncResult:
+        # A backend round trip stuck on the network
+        time.sleep(0.2)
+        return AsyncResult(id=task_id, status="SUCCESS", result=None)
+
+
+@pytest.mark.asyncio
+async def test_send_task(background_jobs_repo):
+    async_background_jobs_repo = AsyncCeleryBackgroundJobRepo(background_jobs_repo)
+    results = await async_background_jobs_repo.send_task(
+        "make_one_thousand_sensors", count=3
+    )
+    assert results.status == "SUCCESS"
+    assert len(results.result) == 3
+    await async_background_jobs_repo.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_blocking_calls_do_not_stall_the_loop():
+    async_background_jobs_repo = AsyncCeleryBackgroundJobRepo(
+        SlowBackgroundJobsRepo(), max_workers=4
+    )
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    ticker = asyncio.ensure_future(tick())
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *[async_background_jobs_repo.get_task_results(str(i)) for i in range(4)]
+    )
+    elapsed = time.perf_counter() - start
+    ticker.cancel()
+    await async_background_jobs_repo.disconnect()
+
+    assert [result.id for result in results] == ["0", "1", "2", "3"]
+    # The four calls ran side by side and the loop kept ticking meanwhile
+    assert elapsed < 0.6
+    assert ticks >= 10
+
+
+class ProgressingBackgroundJobsRepo:
+    def __init__(self, statuses):
+        self.statuses = statuses
+
+    def get_task_results(self, task_id: str) -> AsyncResult:
+        status = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+        return AsyncResult(id=task_id, status=status, result=None)
+
+    def get_task_results_many(self, task_ids):
+        return [self.get_task_results(task_id) for task_id in task_ids]
+
+
+class ManualTaskEventHub(CeleryTaskEventHub):
+    def start(self) -> None:
+        # Events are pushed by the test instead of a receiver thread
+        return None
+
+
+@pytest.mark.asyncio
+async def test_watch_task_results_polls_without_events():
+    async_background_jobs_repo = AsyncCeleryBackgroundJobRepo(
+        ProgressingBackgroundJobsRepo(["PENDING", "PENDING", "STARTED", "SUCCESS"]),
+        poll_interval_seconds=0.01,
+    )
+    results = [
+        result async for result in async_background_jobs_repo.watch_task_results(["a"])
+    ]
+    # Only state changes are emitted
+    assert [result.status for result in results] == ["PENDING", "STARTED", "SUCCESS"]
+
+
+@pytest.mark.asyncio
+async def test_watch_task_results_from_task_events():
+    hub = ManualTaskEventHub(celery_app=None)
+    async_background_jobs_repo = AsyncCeleryBackgroundJobRepo(
+        ProgressingBackgroundJobsRepo(["PENDING", "SUCCESS"]), task_event_hub=hub
+    )
+    results = async_background_jobs_repo.watch_task_results(["a"])
+    assert (await results.__anext__()).status == "PENDING"
+
+    # Events arrive on the receiver thread
+    threading.Thread(
+        target=hub._on_event,
+        args=({"type": "task-started", "uuid": "a", "name": "task"},),
+    ).start()
+    assert (await results.__anext__()).status == "STARTED"
+    hub._on_event({"type": "task-started", "uuid": "other"})
+    hub._on_event({"type": "task-succeeded", "uuid": "a", "result": "'repr'"})
+    assert (await results.__anext__()).status == "SUCCESS"
+    with pytest.raises(StopAsyncIteration):
+        await results.__anext__()
+    assert hub._subscribers == {}
@@ -1,5 +1,10 @@
+import pytest
+from celery import Celery
 from sensor_app.core.domain.entities import Sensor
 from sensor_app.core.domain.results import AsyncResult
+from sensor_app.adapters.secondary.background_jobs_celery import (
+    CeleryBackgroundJobRepo,
+)
 
 
 def test_send_task(background_jobs_repo, test_logger):
@@ -8,3 +13,42 @@ def test_send_task(background_jobs_repo, test_logger):
     assert len(results.result) == 5
     assert isinstance(results.result[0], Sensor)
     assert results.status == "SUCCESS"
+
+
+def test_send_task_group(background_jobs_repo):
+    results = background_jobs_repo.send_task_group(
+        "make_one_thousand_sensors",
+        kwargs_list=[{"count": 2, "offset": 0}, {"count": 3, "offset": 2}],
+    )
+    assert isinstance(results, AsyncResult)
+    assert results.status == "SUCCESS"
+    assert [sensor.name for sensor in results.result] == [
+        f"Sensor {i}" for i in range(0, 5)
+    ]
+
+
+@pytest.mark.parametrize("backend", ["cache+memory://", "db+sqlite:///{tmp_path}/r.db"])
+def test_get_task_results_many(backend, tmp_path):
+    celery_app = Celery(
+        "results", broker="memory://", backend=backend.format(tmp_path=tmp_path)
+    )
+    celery_app.conf.result_extended = True
+    celery_app.backend.store_result("done", [1, 2], "SUCCESS")
+    celery_app.backend.store_result("running", None, "STARTED")
+    background_jobs_repo = CeleryBackgroundJobRepo(None, celery_app)
+
+    task_ids = ["done", "unknown", "running", "done"]
+    results = background_jobs_repo.get_task_results_many(task_ids)
+    assert [result.id for result in results] == task_ids
+    assert [result.status for result in results] == [
+        "SUCCESS",
+        "PENDING",
+        "STARTED",
+        "SUCCESS",
+    ]
+    assert results[0].result == [1, 2]
+    # Same answer as the single id lookup
+    assert [result.model_dump() for result in results] == [
+        background_jobs_repo.get_task_results(task_id).model_dump()
+        for task_id in task_ids
+    ]
@@ -0,0 +1,67 @@
+import asyncio
+import pytest
+from sensor_app.core.domain.entities import Sensor
+from sensor_app.core.domain.errors import InvalidSensorId
+from sensor_app.adapters.secondary.batching import BatchingSensorRepository
+from sensor_app.adapters.secondary.persistence_memory import InMemorySensorRepository
+
+
+@pytest.mark.asyncio
+async def test_get_sensors(sensor_repo):
+    created_sensors = await sensor_repo.create_sensors(
+        [Sensor(name=f"Batch Sensor {i}", value=i) for i in range(0, 3)]
+    )
+    fetched_sensors = await sensor_repo.get_sensors(
+        [created_sensors[0].id, created_sensors[2].id, -1]
+    )
+    assert sorted(fetched_sensors, key=lambda sensor: sensor.id) == [
+        created_sensors[0],
+        created_sensors[2],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_get_sensor_calls_are_batched(sensor_repo):
+    batching_sensor_repo = BatchingSensorRepository(sensor_repo)
+    created_sensors = await sensor_repo.create_sensors(
+        [Sensor(name=f"Batch Sensor {i}", value=i) for i in range(0, 3)]
+    )
+    sensor_ids = [sensor.id for sensor in created_sensors]
+
+    get_sensors_calls = []
+    get_sensors = sensor_repo.get_sensors
+
+    async def counting_get_sensors(ids):
+        ids = list(ids)
+        get_sensors_calls.append(ids)
+        return await get_sensors(ids)
+
+    sensor_repo.get_sensors = counting_get_sensors
+
+    fetched_sensors = await asyncio.gather(
+        *[batching_sensor_repo.get_sensor(sensor_id) for sensor_id in sensor_ids],
+        batching_sensor_repo.get_sensor(sensor_ids[0]),
+        batching_sensor_repo.get_sensor(-1),
+    )
+    assert fetched_sensors == created_sensors + [created_sensors[0], None]
+    assert len(get_sensors_calls) == 1
+    assert sorted(get_sensors_calls[0]) == sorted(sensor_ids + [-1])
+
+
+@pytest.mark.asyncio
+async def test_invalid_id_only_fails_its_own_caller():
+    memory_sensor_repo = InMemorySensorRepository()
+    batching_sensor_repo = BatchingSensorRepository(memory_sensor_repo)
+    created_sensor = await memory_sensor_repo.create_sensor(
+        Sensor(name="Batch Sensor", value=1.0)
+    )
+
+    fetched_sensor, missing_sensor, invalid = await asyncio.gather(
+        batching_sensor_repo.get_sensor(created_sensor.id),
+        batching_sensor_repo.get_sensor(-1),
+        batching_sensor_repo.get_sensor("not-an-id"),
+        return_exceptions=True,
+    )
+    assert fetched_sensor == created_sensor
+    assert missing_sensor is None
+    assert isinstance(invalid, InvalidSensorId)
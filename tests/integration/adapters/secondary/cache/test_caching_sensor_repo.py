@@ -0,0 +1,73 @@
+import pytest
+from sensor_app.core.domain.entities import Sensor
+from sensor_app.adapters.secondary.cache import CachingSensorRepository
+from sensor_app.adapters.secondary.persistence_memory import InMemorySensorRepository
+
+
+@pytest.fixture
+def caching_sensor_repo(sensor_repo):
+    return CachingSensorRepository(sensor_repo, max_entries=100, ttl_seconds=60)
+
+
+@pytest.mark.asyncio
+async def test_get_sensor_is_cached(caching_sensor_repo):
+    created_sensor = await caching_sensor_repo.create_sensor(
+        Sensor(name="Cached Sensor", value=1.0)
+    )
+    assert await caching_sensor_repo.get_sensor(created_sensor.id) == created_sensor
+    assert await caching_sensor_repo.get_sensor(created_sensor.id) == created_sensor
+    assert caching_sensor_repo.stats()["misses"] == 1
+    assert caching_sensor_repo.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_update_sensor_invalidates(caching_sensor_repo):
+    created_sensor = await caching_sensor_repo.create_sensor(
+        Sensor(name="Cached Sensor", value=1.0)
+    )
+    await caching_sensor_repo.get_sensor(created_sensor.id)
+    created_sensor.value = 2.0
+    await caching_sensor_repo.update_sensor(created_sensor)
+    fetched_sensor = await caching_sensor_repo.get_sensor(created_sensor.id)
+    assert fetched_sensor.value == 2.0
+
+
+@pytest.mark.asyncio
+async def test_delete_sensor_invalidates(caching_sensor_repo):
+    created_sensor = await caching_sensor_repo.create_sensor(
+        Sensor(name="Cached Sensor", value=1.0)
+    )
+    await caching_sensor_repo.get_sensor(created_sensor.id)
+    await caching_sensor_repo.delete_sensor(created_sensor.id)
+    assert await caching_sensor_repo.get_sensor(created_sensor.id) is None
+
+
+@pytest.mark.asyncio
+async def test_count_sensors_is_cached(caching_sensor_repo):
+    await caching_sensor_repo.create_sensors(
+        [Sensor(name=f"Counted Sensor {i}", value=i) for i in range(2)]
+    )
+    assert await caching_sensor_repo.count_sensors() == 2
+    assert await caching_sensor_repo.count_sensors() == 2
+    assert caching_sensor_repo.stats()["hits"] == 1
+    await caching_sensor_repo.create_sensor(Sensor(name="One More", value=3.0))
+    assert await caching_sensor_repo.count_sensors() == 3
+
+
+@pytest.mark.asyncio
+async def test_count_sensors_ignores_malformed_redis_value():
+    caching_sensor_repo = CachingSensorRepository(InMemorySensorRepository())
+    await caching_sensor_repo.create_sensor(Sensor(name="Counted", value=1.0))
+    written = {}
+
+    async def redis_get(key):
+        return b"<Record count=5>"
+
+    async def redis_set(key, value):
+        written[key] = value
+
+    caching_sensor_repo._redis_get = redis_get
+    caching_sensor_repo._redis_set = redis_set
+    assert await caching_sensor_repo.count_sensors() == 1
+    assert written == {CachingSensorRepository.COUNT_KEY: "1"}
+    assert caching_sensor_repo.stats()["misses"] == 1
@@ -0,0 +1,75 @@
+import asyncio
+import pytest
+from sensor_app.core.domain.entities import Sensor
+from sensor_app.adapters.secondary.counting import CountingSensorRepository
+
+
+@pytest.fixture
+def counting_sensor_repo(sensor_repo):
+    return CountingSensorRepository(sensor_repo, reconcile_seconds=60)
+
+
+@pytest.mark.asyncio
+async def test_count_follows_writes(counting_sensor_repo, sensor_repo):
+    assert await counting_sensor_repo.count_sensors() == 0
+
+    created_sensor = await counting_sensor_repo.create_sensor(
+        Sensor(name="Counted Sensor", value=1.0)
+    )
+    await counting_sensor_repo.create_sensors(
+        [Sensor(name=f"Counted {i}", value=i) for i in range(3)]
+    )
+    await counting_sensor_repo.delete_sensor(created_sensor.id)
+
+    count_sensors = sensor_repo.count_sensors
+
+    async def failing_count_sensors():
+        raise AssertionError("count_sensors should be answered from the counter")
+
+    sensor_repo.count_sensors = failing_count_sensors
+    assert await counting_sensor_repo.count_sensors() == 3
+    sensor_repo.count_sensors = count_sensors
+
+
+@pytest.mark.asyncio
+async def test_count_follows_bulk_loads(counting_sensor_repo):
+    assert await counting_sensor_repo.count_sensors() == 0
+    assert (
+        await counting_sensor_repo.load_sensors(["Loaded 1", "Loaded 2"], [1, 2]) == 2
+    )
+    assert await counting_sensor_repo.count_sensors() == 2
+
+
+@pytest.mark.asyncio
+async def test_count_reconciles_in_the_background(counting_sensor_repo, sensor_repo):
+    counting_sensor_repo.reconcile_seconds = 0.01
+    await counting_sensor_repo.connect()
+    try:
+        assert await counting_sensor_repo.count_sensors() == 0
+        # Written behind the counter's back, e.g. by another process
+        await sensor_repo.create_sensor(Sensor(name="Other Process", value=1.0))
+        for _ in range(100):
+            if await counting_sensor_repo.count_sensors() == 1:
+                break
+            await asyncio.sleep(0.01)
+        assert await counting_sensor_repo.count_sensors() == 1
+    finally:
+        await counting_sensor_repo.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_count_never_queries_once_connected(counting_sensor_repo, sensor_repo):
+    await counting_sensor_repo.connect()
+    try:
+        count_sensors = sensor_repo.count_sensors
+
+        async def failing_count_sensors():
+            raise AssertionError("count_sensors should be answered from the counter")
+
+        # Past the reconcile interval, the request still doesn't count
+        sensor_repo.count_sensors = failing_count_sensors
+        counting_sensor_repo.reconcile_seconds = 0
+        assert await counting_sensor_repo.count_sensors() == 0
+        sensor_repo.count_sensors = count_sensors
+    finally:
+        await counting_sensor_repo.disconnect()
@@ -0,0 +1,66 @@
+import pytest
+from sensor_app.core.domain.entities import Sensor
+from sensor_app.core.ports.primary import (
+    add_use_case_observer,
+    remove_use_case_observer,
+)
+from sensor_app.core.use_cases.sensor import StreamSensors
+from sensor_app.adapters.secondary.instrumentation import InstrumentedRepository
+
+
+class StreamingSensorRepository:
+    def __init__(self):
+        self.closed = False
+
+    async def stream_sensors(self, batch_size: int = 1000):
+        try:
+            for i in range(3):
+                yield Sensor(id=i + 1, name=f"Streamed {i}", value=i)
+        finally:
+            self.closed = True
+
+
+@pytest.fixture
+def use_case_calls():
+    calls = []
+
+    def observer(name, duration, error):
+        calls.append((name, error))
+
+    add_use_case_observer(observer)
+    yield calls
+    remove_use_case_observer(observer)
+
+
+@pytest.mark.asyncio
+async def test_closing_the_stream_closes_the_wrapped_stream():
+    repo = StreamingSensorRepository()
+    stream = InstrumentedRepository(repo, "sensor").stream_sensors()
+
+    assert (await stream.__anext__()).id == 1
+    await stream.aclose()
+
+    assert repo.closed
+
+
+@pytest.mark.asyncio
+async def test_streaming_use_case_is_observed_until_closed(use_case_calls):
+    repo = StreamingSensorRepository()
+    stream = StreamSensors(repo)()
+    assert use_case_calls == []
+
+    assert (await stream.__anext__()).id == 1
+    assert use_case_calls == []
+    await stream.aclose()
+
+    assert use_case_calls == [("StreamSensors", None)]
+    assert repo.closed
+
+
+@pytest.mark.asyncio
+async def test_streaming_use_case_is_observed_until_exhausted(use_case_calls):
+    stream = StreamSensors(StreamingSensorRepository())()
+
+    assert [sensor.id async for sensor in stream] == [1, 2, 3]
+
+    assert use_case_calls == [("StreamSensors", None)]
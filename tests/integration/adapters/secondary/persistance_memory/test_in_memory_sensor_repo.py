@@ -0,0 +1,206 @@
+import asyncio
+import pytest
+from datetime import datetime, timedelta, timezone
+from sensor_app.core.domain.aggregation import aggregate_readings
+from sensor_app.core.domain.entities import Sensor, SensorReading
+from sensor_app.core.domain.errors import InvalidSensorId, SensorNotFound
+from sensor_app.adapters.secondary.persistence_memory import InMemorySensorRepository
+
+
+@pytest.fixture
+def memory_sensor_repo():
+    return InMemorySensorRepository()
+
+
+@pytest.mark.asyncio
+async def test_create_get_update_delete(memory_sensor_repo):
+    created_sensor = await memory_sensor_repo.create_sensor(
+        Sensor(name="Memory Sensor", value=1.0)
+    )
+    assert await memory_sensor_repo.get_sensor(created_sensor.id) == created_sensor
+
+    assert created_sensor.version == 1
+
+    created_sensor.value = 2.0
+    updated_sensor = await memory_sensor_repo.update_sensor(created_sensor)
+    assert (await memory_sensor_repo.get_sensor(created_sensor.id)).value == 2.0
+    assert updated_sensor.version == 2
+    assert updated_sensor.updated_at >= created_sensor.updated_at
+
+    await memory_sensor_repo.delete_sensor(created_sensor.id)
+    assert await memory_sensor_repo.get_sensor(created_sensor.id) is None
+    assert await memory_sensor_repo.count_sensors() == 0
+    with pytest.raises(ValueError):
+        await memory_sensor_repo.update_sensor(created_sensor)
+
+
+@pytest.mark.asyncio
+async def test_load_sensors(memory_sensor_repo):
+    created_sensor = await memory_sensor_repo.create_sensor(
+        Sensor(name="Before", value=0.0)
+    )
+    assert await memory_sensor_repo.load_sensors([], []) == 0
+    assert await memory_sensor_repo.load_sensors(["A", "B", "C"], [1, 2.5, 3]) == 3
+
+    sensors = await memory_sensor_repo.list_sensors()
+    assert [sensor.id for sensor in sensors] == [
+        created_sensor.id + i for i in range(4)
+    ]
+    assert [(sensor.name, sensor.value) for sensor in sensors[1:]] == [
+        ("A", 1.0),
+        ("B", 2.5),
+        ("C", 3.0),
+    ]
+    assert all(sensor.version == 1 for sensor in sensors)
+    assert await memory_sensor_repo.count_sensors() == 4
+    assert [
+        sensor.name for sensor in await memory_sensor_repo.find_sensors_by_name("C")
+    ] == ["C"]
+
+
+@pytest.mark.asyncio
+async def test_pagination_skips_deleted_sensors(memory_sensor_repo):
+    created_sensors = await memory_sensor_repo.create_sensors(
+        Sensor(name=f"Sensor {i}", value=i) for i in range(10)
+    )
+    await memory_sensor_repo.delete_sensor(created_sensors[3].id)
+
+    first_page = await memory_sensor_repo.list_sensors(limit=4)
+    second_page = await memory_sensor_repo.list_sensors(
+        after_id=first_page[-1].id, limit=100
+    )
+    assert [sensor.id for sensor in first_page + second_page] == [
+        sensor.id for sensor in created_sensors if sensor.id != created_sensors[3].id
+    ]
+    streamed = [sensor async for sensor in memory_sensor_repo.stream_sensors(3)]
+    assert streamed == first_page + second_page
+
+
+@pytest.mark.asyncio
+async def test_list_sensors_invalid_cursor(memory_sensor_repo):
+    await memory_sensor_repo.create_sensor(Sensor(name="Cursor", value=1.0))
+    with pytest.raises(InvalidSensorId):
+        await memory_sensor_repo.list_sensors(after_id="not-an-id", limit=10)
+
+
+@pytest.mark.asyncio
+async def test_range_queries(memory_sensor_repo):
+    await memory_sensor_repo.create_sensors(
+        [
+            Sensor(name="boiler-1", value=70.0),
+            Sensor(name="boiler-2", value=65.0),
+            Sensor(name="chiller-1", value=6.0),
+            Sensor(name="boiler-3", value=80.0),
+        ]
+    )
+    by_value = await memory_sensor_repo.find_sensors_by_value(60.0, 70.0)
+    assert [sensor.name for sensor in by_value] == ["boiler-2", "boiler-1"]
+
+    by_name = await memory_sensor_repo.find_sensors_by_name("boiler", limit=2)
+    assert [sensor.name for sensor in by_name] == ["boiler-1", "boiler-2"]
+
+    # The indexes follow writes
+    chiller = (await memory_sensor_repo.find_sensors_by_name("chiller"))[0]
+    chiller.value = 65.0
+    await memory_sensor_repo.update_sensor(chiller)
+    by_value = await memory_sensor_repo.find_sensors_by_value(min_value=65.0)
+    assert [sensor.name for sensor in by_value] == [
+        "boiler-2",
+        "chiller-1",
+        "boiler-1",
+        "boiler-3",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_aggregate_readings_matches_fallback(memory_sensor_repo):
+    sensor = await memory_sensor_repo.create_sensor(Sensor(name="Meter", value=0.0))
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    readings = [
+        SensorReading(
+            sensor_id=sensor.id,
+            recorded_at=start + timedelta(minutes=7 * i),
+            value=float(i),
+        )
+        for i in range(100)
+    ]
+    assert await memory_sensor_repo.append_readings(readings) == 100
+
+    aggregates = await memory_sensor_repo.aggregate_readings(
+        sensor.id, start, start + timedelta(hours=5), "hour", (0.5, 0.95)
+    )
+    expected = aggregate_readings(
+        (r for r in readings if r.recorded_at < start + timedelta(hours=5)),
+        "hour",
+        (0.5, 0.95),
+    )
+    assert aggregates == expected
+
+    with pytest.raises(SensorNotFound):
+        await memory_sensor_repo.append_readings(
+            [SensorReading(sensor_id=sensor.id + 1, recorded_at=start, value=1.0)]
+        )
+    with pytest.raises(InvalidSensorId):
+        await memory_sensor_repo.append_readings(
+            [SensorReading(sensor_id="not-an-id", recorded_at=start, value=1.0)]
+        )
+
+
+@pytest.mark.asyncio
+async def test_snapshot_round_trip(tmp_path):
+    snapshot_path = str(tmp_path / "sensors.json")
+    memory_sensor_repo = InMemorySensorRepository(snapshot_path=snapshot_path)
+    await memory_sensor_repo.connect()
+    created_sensors = await memory_sensor_repo.create_sensors(
+        Sensor(name=f"Sensor {i}", value=i) for i in range(5)
+    )
+    await memory_sensor_repo.delete_sensor(created_sensors[0].id)
+    await memory_sensor_repo.append_readings(
+        [
+            SensorReading(
+                sensor_id=created_sensors[1].id,
+                recorded_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+                value=3.0,
+            )
+        ]
+    )
+    await memory_sensor_repo.disconnect()
+
+    restored_repo = InMemorySensorRepository(snapshot_path=snapshot_path)
+    await restored_repo.connect()
+    assert await restored_repo.list_sensors() == created_sensors[1:]
+    aggregates = await restored_repo.aggregate_readings(
+        created_sensors[1].id,
+        datetime(2024, 1, 1, tzinfo=timezone.utc),
+        datetime(2024, 1, 2, tzinfo=timezone.utc),
+        "day",
+    )
+    assert aggregates[0].count == 1
+    # Ids keep increasing after a restore
+    new_sensor = await restored_repo.create_sensor(Sensor(name="New", value=0.0))
+    assert new_sensor.id == created_sensors[-1].id + 1
+
+
+@pytest.mark.asyncio
+async def test_watch_sensors(memory_sensor_repo):
+    changes = memory_sensor_repo.watch_sensors()
+    first_change = asyncio.ensure_future(changes.__anext__())
+    await asyncio.sleep(0)
+
+    created_sensors = await memory_sensor_repo.create_sensors(
+        [Sensor(name=f"Watched {i}", value=i) for i in range(2)]
+    )
+    await memory_sensor_repo.delete_sensor(created_sensors[0].id)
+
+    received = [await first_change]
+    for _ in range(2):
+        received.append(await changes.__anext__())
+    await changes.aclose()
+
+    assert [(change.operation, change.sensor_id) for change in received] == [
+        ("insert", created_sensors[0].id),
+        ("insert", created_sensors[1].id),
+        ("delete", created_sensors[0].id),
+    ]
+    assert received[1].sensor == created_sensors[1]
+    assert not memory_sensor_repo._watchers
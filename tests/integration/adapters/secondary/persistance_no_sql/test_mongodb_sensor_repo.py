@@ -1,5 +1,7 @@
 import pytest
-from sensor_app.core.domain.entities import Sensor
+from datetime import datetime, timedelta, timezone
+from sensor_app.core.domain.entities import Sensor, SensorReading
+from sensor_app.core.domain.errors import InvalidSensorId, SensorNotFound
 
 
 @pytest.mark.asyncio
@@ -11,6 +13,24 @@ async def test_create_sensor(no_sql_sensor_repo, test_logger):
     assert created_sensor.value == 123.45
 
 
+@pytest.mark.asyncio
+async def test_create_sensors(no_sql_sensor_repo):
+    sensors = [Sensor(name=f"Bulk Sensor {i}", value=i) for i in range(0, 50)]
+    created_sensors = await no_sql_sensor_repo.create_sensors(sensors)
+    assert len(created_sensors) == 50
+    assert [sensor.name for sensor in created_sensors] == [
+        f"Bulk Sensor {i}" for i in range(0, 50)
+    ]
+    assert all(sensor.id is not None for sensor in created_sensors)
+    fetched_sensor = await no_sql_sensor_repo.get_sensor(created_sensors[10].id)
+    assert fetched_sensor == created_sensors[10]
+
+
+@pytest.mark.asyncio
+async def test_create_sensors_empty(no_sql_sensor_repo):
+    assert await no_sql_sensor_repo.create_sensors([]) == []
+
+
 @pytest.mark.asyncio
 async def test_get_sensor(no_sql_sensor_repo):
     sensor = Sensor(name="Test Sensor", value=123.45)
@@ -45,3 +65,88 @@ async def test_list_sensors(no_sql_sensor_repo):
     await no_sql_sensor_repo.create_sensor(sensor2)
     sensors = await no_sql_sensor_repo.list_sensors()
     assert len(sensors) >= 2
+
+
+@pytest.mark.asyncio
+async def test_list_sensors_keyset_pagination(no_sql_sensor_repo):
+    created_sensors = await no_sql_sensor_repo.create_sensors(
+        [Sensor(name=f"Page Sensor {i}", value=i) for i in range(0, 5)]
+    )
+    first_page = await no_sql_sensor_repo.list_sensors(limit=2)
+    assert first_page == created_sensors[0:2]
+    second_page = await no_sql_sensor_repo.list_sensors(
+        after_id=first_page[-1].id, limit=2
+    )
+    assert second_page == created_sensors[2:4]
+    last_page = await no_sql_sensor_repo.list_sensors(
+        after_id=second_page[-1].id, limit=2
+    )
+    assert last_page == created_sensors[4:]
+
+
+@pytest.mark.asyncio
+async def test_list_sensors_invalid_cursor(no_sql_sensor_repo):
+    with pytest.raises(InvalidSensorId):
+        await no_sql_sensor_repo.list_sensors(after_id="not-an-id", limit=2)
+
+
+@pytest.mark.asyncio
+async def test_stream_sensors(no_sql_sensor_repo):
+    created_sensors = await no_sql_sensor_repo.create_sensors(
+        [Sensor(name=f"Stream Sensor {i}", value=i) for i in range(0, 5)]
+    )
+    streamed_sensors = [
+        sensor async for sensor in no_sql_sensor_repo.stream_sensors(batch_size=2)
+    ]
+    assert streamed_sensors == created_sensors
+
+
+@pytest.mark.asyncio
+async def test_append_readings(no_sql_sensor_repo):
+    created_sensor = await no_sql_sensor_repo.create_sensor(
+        Sensor(name="Reading Sensor", value=0.0)
+    )
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    readings = [
+        SensorReading(
+            sensor_id=created_sensor.id,
+            recorded_at=start + timedelta(minutes=i),
+            value=i,
+        )
+        for i in range(0, 10)
+    ]
+    assert await no_sql_sensor_repo.append_readings(readings) == 10
+    assert (
+        await no_sql_sensor_repo.readings_collection.count_documents(
+            {"sensor_id": created_sensor.id}
+        )
+        == 10
+    )
+
+
+@pytest.mark.asyncio
+async def test_append_readings_unknown_sensor(no_sql_sensor_repo):
+    recorded_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    with pytest.raises(SensorNotFound):
+        await no_sql_sensor_repo.append_readings(
+            [
+                SensorReading(
+                    sensor_id="0123456789abcdef01234567",
+                    recorded_at=recorded_at,
+                    value=1.0,
+                )
+            ]
+        )
+    with pytest.raises(InvalidSensorId):
+        await no_sql_sensor_repo.append_readings(
+            [SensorReading(sensor_id="not-an-id", recorded_at=recorded_at, value=1.0)]
+        )
+
+
+@pytest.mark.asyncio
+async def test_connect_indexes_readings(no_sql_sensor_repo):
+    await no_sql_sensor_repo.connect()
+    indexes = await no_sql_sensor_repo.readings_collection.index_information()
+    assert [("sensor_id", 1), ("recorded_at", 1)] in [
+        index["key"] for index in indexes.values()
+    ]
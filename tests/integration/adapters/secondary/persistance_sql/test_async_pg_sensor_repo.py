@@ -1,5 +1,13 @@
+import asyncio
 import pytest
-from sensor_app.core.domain.entities import Sensor
+from datetime import datetime, timedelta, timezone
+from sensor_app.core.domain.aggregation import aggregate_readings
+from sensor_app.core.domain.entities import Sensor, SensorReading
+from sensor_app.core.domain.errors import InvalidSensorId, SensorNotFound
+from sensor_app.adapters.secondary.persistence_sql.sensor_repo import (
+    STATEMENTS,
+    AsyncpgSensorRepository,
+)
 
 
 @pytest.mark.asyncio
@@ -11,6 +19,24 @@ async def test_create_sensor(sensor_repo, test_logger):
     assert created_sensor.value == 123.45
 
 
+@pytest.mark.asyncio
+async def test_create_sensors(sensor_repo):
+    sensors = [Sensor(name=f"Bulk Sensor {i}", value=i) for i in range(0, 50)]
+    created_sensors = await sensor_repo.create_sensors(sensors)
+    assert len(created_sensors) == 50
+    assert [sensor.name for sensor in created_sensors] == [
+        f"Bulk Sensor {i}" for i in range(0, 50)
+    ]
+    assert all(sensor.id is not None for sensor in created_sensors)
+    fetched_sensor = await sensor_repo.get_sensor(created_sensors[10].id)
+    assert fetched_sensor == created_sensors[10]
+
+
+@pytest.mark.asyncio
+async def test_create_sensors_empty(sensor_repo):
+    assert await sensor_repo.create_sensors([]) == []
+
+
 @pytest.mark.asyncio
 async def test_get_sensor(sensor_repo):
     sensor = Sensor(name="Test Sensor", value=123.45)
@@ -26,6 +52,9 @@ async def test_update_sensor(sensor_repo):
     created_sensor.value = 678.90
     updated_sensor = await sensor_repo.update_sensor(created_sensor)
     assert updated_sensor.value == 678.90
+    assert created_sensor.version == 1
+    assert updated_sensor.version == 2
+    assert updated_sensor.updated_at >= created_sensor.updated_at
 
 
 @pytest.mark.asyncio
@@ -45,3 +74,226 @@ async def test_list_sensors(sensor_repo):
     await sensor_repo.create_sensor(sensor2)
     sensors = await sensor_repo.list_sensors()
     assert len(sensors) >= 2
+
+
+@pytest.mark.asyncio
+async def test_pooled_repo_round_trip(database_url):
+    pooled_repo = AsyncpgSensorRepository(
+        database_url, use_pool=True, pool_min_size=1, pool_max_size=2
+    )
+    await pooled_repo.connect()
+    try:
+        created_sensor = await pooled_repo.create_sensor(
+            Sensor(name="Pooled Sensor", value=1.5)
+        )
+        fetched_sensor = await pooled_repo.get_sensor(created_sensor.id)
+        assert fetched_sensor == created_sensor
+    finally:
+        await pooled_repo.disconnect()
+
+    # Closing twice is harmless so both the web server and worker hooks can call it
+    await pooled_repo.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_prepared_statements_fast_mode(database_url):
+    pooled_repo = AsyncpgSensorRepository(
+        database_url, use_pool=True, pool_min_size=1, pool_max_size=1, fast_mode=True
+    )
+    await pooled_repo.connect()
+    try:
+        created_sensors = await pooled_repo.create_sensors(
+            [Sensor(name="Fast 0", value=0.0), Sensor(name="Fast 1", value=1.0)]
+        )
+        assert await pooled_repo.get_sensor(created_sensors[0].id) == created_sensors[0]
+        assert await pooled_repo.list_sensors() == created_sensors
+        assert await pooled_repo.list_sensors(
+            after_id=created_sensors[0].id, limit=1
+        ) == [created_sensors[1]]
+
+        async with pooled_repo._pool.acquire() as conn:
+            # Prepared when the connection was opened, reused by every request
+            assert set(conn._prepared_statements) == set(STATEMENTS)
+    finally:
+        await pooled_repo.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_list_sensors_keyset_pagination(sensor_repo):
+    created_sensors = await sensor_repo.create_sensors(
+        [Sensor(name=f"Page Sensor {i}", value=i) for i in range(0, 5)]
+    )
+    first_page = await sensor_repo.list_sensors(limit=2)
+    assert first_page == created_sensors[0:2]
+    second_page = await sensor_repo.list_sensors(after_id=first_page[-1].id, limit=2)
+    assert second_page == created_sensors[2:4]
+    last_page = await sensor_repo.list_sensors(after_id=second_page[-1].id, limit=2)
+    assert last_page == created_sensors[4:]
+
+
+@pytest.mark.asyncio
+async def test_list_sensors_invalid_cursor(sensor_repo):
+    with pytest.raises(InvalidSensorId):
+        await sensor_repo.list_sensors(after_id="not-an-id", limit=2)
+
+
+@pytest.mark.asyncio
+async def test_stream_sensors(sensor_repo):
+    created_sensors = await sensor_repo.create_sensors(
+        [Sensor(name=f"Stream Sensor {i}", value=i) for i in range(0, 5)]
+    )
+    streamed_sensors = [
+        sensor async for sensor in sensor_repo.stream_sensors(batch_size=2)
+    ]
+    assert streamed_sensors == created_sensors
+
+
+@pytest.mark.asyncio
+async def test_load_sensors(sensor_repo):
+    assert await sensor_repo.load_sensors([], []) == 0
+    assert (
+        await sensor_repo.load_sensors([f"Loaded {i}" for i in range(5)], range(5)) == 5
+    )
+
+    sensors = await sensor_repo.list_sensors()
+    assert [sensor.name for sensor in sensors] == [f"Loaded {i}" for i in range(5)]
+    assert [sensor.value for sensor in sensors] == [float(i) for i in range(5)]
+    assert all(sensor.version == 1 for sensor in sensors)
+    assert all(sensor.updated_at is not None for sensor in sensors)
+
+
+@pytest.mark.asyncio
+async def test_append_readings(sensor_repo, db_connection):
+    created_sensor = await sensor_repo.create_sensor(
+        Sensor(name="Reading Sensor", value=0.0)
+    )
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    readings = [
+        SensorReading(
+            sensor_id=created_sensor.id,
+            recorded_at=start + timedelta(minutes=i),
+            value=i,
+        )
+        for i in range(0, 10)
+    ]
+    assert await sensor_repo.append_readings(readings) == 10
+    assert await sensor_repo.append_readings([]) == 0
+
+    row = await db_connection.fetchrow(
+        "SELECT COUNT(*), MAX(value) FROM sensor_readings WHERE sensor_id = $1",
+        created_sensor.id,
+    )
+    assert row["count"] == 10
+    assert row["max"] == 9
+    # Appending readings never rewrites the sensor row
+    assert await sensor_repo.get_sensor(created_sensor.id) == created_sensor
+
+
+@pytest.mark.asyncio
+async def test_append_readings_unknown_sensor(sensor_repo):
+    recorded_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    with pytest.raises(SensorNotFound):
+        await sensor_repo.append_readings(
+            [SensorReading(sensor_id=-1, recorded_at=recorded_at, value=1.0)]
+        )
+    with pytest.raises(InvalidSensorId):
+        await sensor_repo.append_readings(
+            [SensorReading(sensor_id="not-an-id", recorded_at=recorded_at, value=1.0)]
+        )
+
+
+@pytest.mark.asyncio
+async def test_aggregate_readings(sensor_repo):
+    created_sensor = await sensor_repo.create_sensor(
+        Sensor(name="Reading Sensor", value=0.0)
+    )
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    readings = [
+        SensorReading(
+            sensor_id=created_sensor.id,
+            recorded_at=start + timedelta(minutes=7 * i),
+            value=i % 13,
+        )
+        for i in range(0, 100)
+    ]
+    await sensor_repo.append_readings(readings)
+
+    aggregates = await sensor_repo.aggregate_readings(
+        created_sensor.id,
+        start,
+        start + timedelta(days=1),
+        "hour",
+        percentiles=(0.5, 0.9),
+    )
+    # The SQL aggregation matches the in-memory fallback bucket for bucket
+    expected = aggregate_readings(readings, "hour", percentiles=(0.5, 0.9))
+    assert [aggregate.bucket_start for aggregate in aggregates] == [
+        aggregate.bucket_start for aggregate in expected
+    ]
+    for aggregate, expected_aggregate in zip(aggregates, expected):
+        assert aggregate.count == expected_aggregate.count
+        assert aggregate.min == expected_aggregate.min
+        assert aggregate.max == expected_aggregate.max
+        assert aggregate.mean == pytest.approx(expected_aggregate.mean)
+        assert aggregate.percentiles == pytest.approx(expected_aggregate.percentiles)
+
+
+@pytest.mark.asyncio
+async def test_count_sensors(database_url, db_connection):
+    exact_repo = AsyncpgSensorRepository(database_url)
+    estimated_repo = AsyncpgSensorRepository(database_url, count_strategy="estimated")
+    await exact_repo.create_sensors(
+        [Sensor(name=f"Count {i}", value=i) for i in range(3)]
+    )
+
+    assert await exact_repo.count_sensors() == 3
+    await db_connection.execute("ANALYZE sensors")
+    # Right after ANALYZE the statistics match the table
+    assert await estimated_repo.count_sensors() == 3
+
+
+@pytest.mark.asyncio
+async def test_watch_sensors(sensor_repo):
+    changes = sensor_repo.watch_sensors()
+    first_change = asyncio.ensure_future(changes.__anext__())
+    # Let the listener connection run LISTEN before writing
+    await asyncio.sleep(0.2)
+
+    created_sensor = await sensor_repo.create_sensor(
+        Sensor(name="Watched Sensor", value=1.0)
+    )
+    created_sensor.value = 2.0
+    await sensor_repo.update_sensor(created_sensor)
+    await sensor_repo.delete_sensor(created_sensor.id)
+
+    received = [await asyncio.wait_for(first_change, 5)]
+    for _ in range(2):
+        received.append(await asyncio.wait_for(changes.__anext__(), 5))
+    await changes.aclose()
+
+    assert [change.operation for change in received] == ["insert", "update", "delete"]
+    assert {change.sensor_id for change in received} == {created_sensor.id}
+    assert received[1].sensor == created_sensor
+    assert received[2].sensor is None
+
+
+@pytest.mark.asyncio
+async def test_watch_sensors_bulk_writes(sensor_repo):
+    changes = sensor_repo.watch_sensors()
+    first_change = asyncio.ensure_future(changes.__anext__())
+    await asyncio.sleep(0.2)
+
+    # One statement, its changes arrive as notifications of ids read back
+    created_sensors = await sensor_repo.create_sensors(
+        [Sensor(name=f"Bulk Watched {i}", value=i) for i in range(1200)]
+    )
+    received = [await asyncio.wait_for(first_change, 5)]
+    for _ in range(len(created_sensors) - 1):
+        received.append(await asyncio.wait_for(changes.__anext__(), 5))
+    await changes.aclose()
+
+    assert {change.operation for change in received} == {"insert"}
+    received_sensors = sorted(
+        (change.sensor for change in received), key=lambda sensor: sensor.id
+    )
+    assert received_sensors == sorted(created_sensors, key=lambda sensor: sensor.id)
@@ -0,0 +1,238 @@
+import csv
+import gzip
+import os
+import pytest
+from sensor_app.core.domain.bulk import validate_sensor_columns
+from sensor_app.core.domain.entities import Sensor, SensorImport
+from sensor_app.core.use_cases.bulk import ExportSensors, ImportSensors, SaveSensorFile
+from sensor_app.adapters.secondary.persistence_memory import InMemorySensorRepository
+from sensor_app.adapters.secondary.sensor_files import LocalSensorFileStore
+
+
+@pytest.fixture
+def sensor_files(tmp_path):
+    return LocalSensorFileStore(str(tmp_path / "sensor_files"))
+
+
+async def chunks_of(content: bytes, size: int = 7):
+    for offset in range(0, len(content), size):
+        yield content[offset : offset + size]
+
+
+async def read_all(sensor_files, file_name, chunk_size):
+    return [
+        (list(names), list(values))
+        async for names, values in sensor_files.read_sensor_columns(
+            file_name, chunk_size
+        )
+    ]
+
+
+def test_validate_sensor_columns():
+    names, values, rejected = validate_sensor_columns(
+        ["ok", " ", None, "bad value", "nan", "nul\x00", "number"],
+        ["1.5", "2", "3", "x", "nan", "4", 5],
+    )
+    assert names == ["ok", "number"]
+    assert values == [1.5, 5.0]
+    assert rejected.tolist() == [1, 2, 3, 4, 5]
+
+
+@pytest.mark.asyncio
+async def test_save_and_read_csv_in_chunks(sensor_files):
+    file_name = await sensor_files.save(
+        chunks_of(b"\xef\xbb\xbfid,Name,value\n1,a,1.5\n2,b,2\n3,c\n4,d,4\n"), "csv"
+    )
+    assert file_name.endswith(".csv")
+    # Only the complete file is left in the directory
+    assert os.listdir(sensor_files.directory) == [file_name]
+
+    assert await read_all(sensor_files, file_name, chunk_size=3) == [
+        (["a", "b", "c"], ["1.5", "2", None]),
+        (["d"], ["4"]),
+    ]
+
+    await sensor_files.delete(file_name)
+    assert os.listdir(sensor_files.directory) == []
+
+
+@pytest.mark.asyncio
+async def test_csv_without_name_and_value_is_rejected(sensor_files):
+    file_name = await sensor_files.save(chunks_of(b"id,label\n1,a\n"), "csv")
+    with pytest.raises(ValueError):
+        await read_all(sensor_files, file_name, chunk_size=10)
+
+
+@pytest.mark.asyncio
+async def test_failed_save_leaves_no_file(sensor_files):
+    async def failing_chunks():
+        yield b"name,value\n"
+        raise RuntimeError("Upload interrupted")
+
+    with pytest.raises(RuntimeError):
+        await sensor_files.save(failing_chunks(), "csv")
+    assert os.listdir(sensor_files.directory) == []
+
+
+def test_file_names_stay_in_the_directory(sensor_files):
+    for file_name in ["", "../secrets.csv", "nested/file.csv", ".hidden.csv"]:
+        with pytest.raises(ValueError):
+            sensor_files.path(file_name)
+
+
+@pytest.mark.asyncio
+async def test_save_rejects_unsupported_formats(sensor_files):
+    with pytest.raises(ValueError):
+        await SaveSensorFile(sensor_files)(chunks_of(b"{}"), "json")
+
+
+@pytest.mark.asyncio
+async def test_import_sensors(sensor_files):
+    sensor_repo = InMemorySensorRepository()
+    rows = [f"Sensor {i},{i}" for i in range(25)]
+    rows[3] = "Broken,not a number"
+    rows[20] = ",20"
+    file_name = await SaveSensorFile(sensor_files)(
+        chunks_of(("name,value\n" + "\n".join(rows) + "\n").encode(), 64), "csv"
+    )
+
+    reports = []
+    progress = await ImportSensors(sensor_repo, sensor_files, chunk_size=10)(
+        file_name, on_progress=lambda report: reports.append(report.model_copy())
+    )
+
+    assert [report.loaded for report in reports] == [9, 19, 23]
+    assert progress.done
+    assert progress.chunks == 3
+    assert progress.loaded == 23
+    assert progress.rejected == 2
+    assert progress.rejected_rows == [4, 21]
+    assert await sensor_repo.count_sensors() == 23
+    # Imported files are removed
+    assert os.listdir(sensor_files.directory) == []
+
+
+@pytest.mark.asyncio
+async def test_import_sensors_resumes_after_a_failure(sensor_files):
+    sensor_repo = InMemorySensorRepository()
+    rows = [f"Sensor {i},{i}" for i in range(25)]
+    rows[12] = "Broken,not a number"
+    file_name = await SaveSensorFile(sensor_files)(
+        chunks_of(("name,value\n" + "\n".join(rows) + "\n").encode(), 64), "csv"
+    )
+    load_sensors = sensor_repo.load_sensors
+
+    async def failing_second_load(names, values):
+        if await sensor_repo.count_sensors():
+            raise ConnectionError("database went away")
+        return await load_sensors(names, values)
+
+    sensor_repo.load_sensors = failing_second_load
+    with pytest.raises(ConnectionError):
+        await ImportSensors(sensor_repo, sensor_files, chunk_size=10)(file_name)
+    assert await sensor_repo.count_sensors() == 10
+    # The file is kept for the retry
+    assert (await sensor_files.read_import_progress(file_name)).rows == 10
+
+    # Retried with another chunk size, the first ten rows aren't loaded again
+    sensor_repo.load_sensors = load_sensors
+    progress = await ImportSensors(sensor_repo, sensor_files, chunk_size=7)(file_name)
+    assert progress.done
+    assert progress.rows == 25
+    assert progress.loaded == 24
+    assert progress.rejected_rows == [13]
+    assert await sensor_repo.count_sensors() == 24
+    assert os.listdir(sensor_files.directory) == []
+
+
+@pytest.mark.asyncio
+async def test_expired_uploads_are_removed(tmp_path):
+    sensor_files = LocalSensorFileStore(
+        str(tmp_path / "sensor_files"), upload_retention_seconds=3600
+    )
+    failed_upload = await sensor_files.save(chunks_of(b"name,value\n"), "csv")
+    await sensor_files.save_import_progress(SensorImport(file_name=failed_upload))
+    for path in os.listdir(sensor_files.directory):
+        os.utime(os.path.join(sensor_files.directory, path), (0, 0))
+
+    upload = await sensor_files.save(chunks_of(b"name,value\n"), "csv")
+    assert os.listdir(sensor_files.directory) == [upload]
+
+
+async def batches_of(sensors, size):
+    for offset in range(0, len(sensors), size):
+        yield sensors[offset : offset + size]
+
+
+@pytest.mark.asyncio
+async def test_write_ndjson_and_csv_exports(sensor_files):
+    sensors = [Sensor(id=i, name=f"Sensor {i}", value=i, version=1) for i in range(5)]
+
+    file_name = await sensor_files.write_sensors(batches_of(sensors, 2), "ndjson")
+    assert file_name.endswith(".ndjson.gz")
+    path = await sensor_files.export_path(file_name)
+    with gzip.open(path) as stream:
+        assert [Sensor.model_validate_json(line) for line in stream] == sensors
+
+    file_name = await sensor_files.write_sensors(batches_of(sensors, 2), "csv")
+    with gzip.open(await sensor_files.export_path(file_name), "rt") as stream:
+        rows = list(csv.reader(stream))
+    assert rows[0] == ["id", "name", "value", "version", "updated_at"]
+    assert rows[1] == ["0", "Sensor 0", "0.0", "1", ""]
+    assert len(rows) == 6
+
+
+@pytest.mark.asyncio
+async def test_export_paths(sensor_files):
+    assert await sensor_files.export_path("missing.csv.gz") is None
+    assert await sensor_files.export_path("../secrets.csv") is None
+    # Uploads are not exports
+    upload = await sensor_files.save(chunks_of(b"name,value\n"), "csv")
+    assert await sensor_files.export_path(upload) is None
+
+
+@pytest.mark.asyncio
+async def test_expired_exports_are_removed(tmp_path):
+    sensor_files = LocalSensorFileStore(
+        str(tmp_path / "sensor_files"), export_retention_seconds=3600
+    )
+    sensors = [Sensor(id=1, name="Sensor", value=1.0)]
+    expired_export = await sensor_files.write_sensors(batches_of(sensors, 1), "csv")
+    os.utime(await sensor_files.export_path(expired_export), (0, 0))
+
+    export = await sensor_files.write_sensors(batches_of(sensors, 1), "csv")
+    assert await sensor_files.export_path(expired_export) is None
+    assert os.listdir(sensor_files.exports_directory) == [export]
+
+
+@pytest.mark.asyncio
+async def test_failed_export_leaves_no_file(sensor_files):
+    async def failing_batches():
+        yield [Sensor(id=1, name="Sensor", value=1.0)]
+        raise RuntimeError("Cursor lost")
+
+    with pytest.raises(RuntimeError):
+        await sensor_files.write_sensors(failing_batches(), "ndjson")
+    assert os.listdir(sensor_files.exports_directory) == []
+
+
+@pytest.mark.asyncio
+async def test_export_sensors(sensor_files):
+    sensor_repo = InMemorySensorRepository()
+    await sensor_repo.create_sensors(
+        Sensor(name=f"Sensor {i}", value=i) for i in range(25)
+    )
+
+    reports = []
+    progress = await ExportSensors(sensor_repo, sensor_files, batch_size=10)(
+        "csv", on_progress=lambda report: reports.append(report.model_copy())
+    )
+
+    assert [report.exported for report in reports] == [10, 20]
+    assert progress.done
+    assert progress.total == progress.exported == 25
+    with gzip.open(await sensor_files.export_path(progress.file_name), "rt") as stream:
+        assert len(stream.readlines()) == 26
+
+    with pytest.raises(ValueError):
+        await ExportSensors(sensor_repo, sensor_files)("xml")
@@ -0,0 +1,144 @@
+import asyncio
+import pytest
+from sensor_app.core.domain.entities import Sensor
+from sensor_app.adapters.secondary.persistence_memory import InMemorySensorRepository
+from sensor_app.adapters.secondary.write_behind import AsyncioSensorWriteBuffer
+
+
+class RecordingSensorRepository(InMemorySensorRepository):
+    def __init__(self):
+        super().__init__()
+        self.batch_sizes = []
+
+    async def create_sensors(self, sensors):
+        created_sensors = await super().create_sensors(sensors)
+        self.batch_sizes.append(len(created_sensors))
+        return created_sensors
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writes_are_batched():
+    sensor_repo = RecordingSensorRepository()
+    write_buffer = AsyncioSensorWriteBuffer(
+        sensor_repo, max_batch_size=10, flush_interval_ms=50
+    )
+    await write_buffer.start()
+
+    created_sensors = await asyncio.gather(
+        *(write_buffer.write(Sensor(name=f"Buffered {i}", value=i)) for i in range(25))
+    )
+    await write_buffer.drain()
+
+    assert [sensor.name for sensor in created_sensors] == [
+        f"Buffered {i}" for i in range(25)
+    ]
+    assert all(sensor.id is not None for sensor in created_sensors)
+    assert sensor_repo.batch_sizes == [10, 10, 5]
+
+
+@pytest.mark.asyncio
+async def test_drain_flushes_acknowledged_writes():
+    sensor_repo = RecordingSensorRepository()
+    write_buffer = AsyncioSensorWriteBuffer(sensor_repo, flush_interval_ms=1000)
+    await write_buffer.start()
+
+    for i in range(3):
+        assert (
+            await write_buffer.write(
+                Sensor(name=f"Acknowledged {i}", value=i), wait_for_durability=False
+            )
+            is None
+        )
+    await write_buffer.drain()
+
+    assert await sensor_repo.count_sensors() == 3
+    with pytest.raises(RuntimeError):
+        await write_buffer.write(Sensor(name="Too Late", value=0))
+
+
+@pytest.mark.asyncio
+async def test_full_queue_blocks_writers():
+    sensor_repo = RecordingSensorRepository()
+    write_buffer = AsyncioSensorWriteBuffer(
+        sensor_repo, max_batch_size=1, max_queue_size=2
+    )
+    await write_buffer.start()
+
+    database_ready = asyncio.Event()
+    create_sensors = sensor_repo.create_sensors
+
+    async def slow_create_sensors(sensors):
+        await database_ready.wait()
+        return await create_sensors(sensors)
+
+    sensor_repo.create_sensors = slow_create_sensors
+    # One sensor held by the stuck flush, two more fill the queue
+    for i in range(3):
+        await write_buffer.write(Sensor(name=f"Queued {i}", value=i), False)
+        await asyncio.sleep(0)
+
+    blocked_write = asyncio.ensure_future(
+        write_buffer.write(Sensor(name="Blocked", value=3), False)
+    )
+    await asyncio.sleep(0.01)
+    assert not blocked_write.done()
+
+    database_ready.set()
+    await blocked_write
+    await write_buffer.drain()
+    assert await sensor_repo.count_sensors() == 4
+
+
+@pytest.mark.asyncio
+async def test_drain_waits_for_blocked_writers():
+    sensor_repo = RecordingSensorRepository()
+    write_buffer = AsyncioSensorWriteBuffer(
+        sensor_repo, max_batch_size=1, max_queue_size=1
+    )
+    await write_buffer.start()
+
+    database_ready = asyncio.Event()
+    create_sensors = sensor_repo.create_sensors
+
+    async def slow_create_sensors(sensors):
+        await database_ready.wait()
+        return await create_sensors(sensors)
+
+    sensor_repo.create_sensors = slow_create_sensors
+    for i in range(2):
+        await write_buffer.write(Sensor(name=f"Queued {i}", value=i), False)
+        await asyncio.sleep(0)
+    blocked_writes = [
+        asyncio.ensure_future(write_buffer.write(Sensor(name=f"Blocked {i}", value=i)))
+        for i in range(3)
+    ]
+    await asyncio.sleep(0.01)
+
+    drain = asyncio.ensure_future(write_buffer.drain())
+    await asyncio.sleep(0)
+    with pytest.raises(RuntimeError):
+        await write_buffer.write(Sensor(name="Too Late", value=0))
+
+    database_ready.set()
+    await drain
+    assert all(write.done() for write in blocked_writes)
+    assert [(await write).name for write in blocked_writes] == [
+        f"Blocked {i}" for i in range(3)
+    ]
+    assert await sensor_repo.count_sensors() == 5
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_reaches_waiting_writers():
+    sensor_repo = RecordingSensorRepository()
+    write_buffer = AsyncioSensorWriteBuffer(sensor_repo)
+    await write_buffer.start()
+
+    async def failing_create_sensors(sensors):
+        raise ConnectionError("database went away")
+
+    sensor_repo.create_sensors = failing_create_sensors
+    with pytest.raises(ConnectionError):
+        await write_buffer.write(Sensor(name="Lost", value=0))
+    await write_buffer.drain()
+    assert write_buffer.failed_writes == 1